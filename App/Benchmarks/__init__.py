@@ -0,0 +1 @@
+# this file enables Benchmarks to be considered a package and can be left blank.
\ No newline at end of file
@@ -0,0 +1,49 @@
+################################################################################
+# File: __main__.py
+# Date: 18 October 2026
+# Description:
+#
+# Command line entry point for the benchmarks. Run from the App directory:
+#
+#     python -m Benchmarks --counts 100 1000 10000 --output bench.json
+#
+################################################################################
+
+# imports
+import argparse
+import json
+
+def main() -> None:
+    '''
+    Main Function
+
+    Parameters: None
+
+    Returns: None
+    '''
+    parser = argparse.ArgumentParser(description='Engine benchmarks')
+    parser.add_argument('--counts', type=int, nargs='+',
+                        default=[0, 100, 1000, 10000],
+                        help='scene sizes to benchmark')
+    parser.add_argument('--frames', type=int, default=60,
+                        help='full frames timed per scene')
+    parser.add_argument('--repeat', type=int, default=1000,
+                        help='calls per micro benchmark')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--backend', choices=('egl', 'osmesa'), default='egl')
+    parser.add_argument('--output', default='bench_output.json',
+                        help='JSON file to write the results to')
+    args = parser.parse_args()
+
+    # The offscreen platform has to be chosen before OpenGL is imported
+    from Engine.headless import select_platform
+    select_platform(args.backend)
+
+    from .runner import run
+    results = run(args.counts, args.frames, args.repeat, args.seed)
+
+    with open(args.output, 'w') as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {args.output}")
+
+if __name__ == "__main__": main()
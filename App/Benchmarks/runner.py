@@ -0,0 +1,192 @@
+################################################################################
+# File: runner.py
+# Date: 18 October 2026
+# Description:
+#
+# Times the major engine paths over a range of scene sizes and collects the
+# results in a JSON-friendly dictionary
+#
+################################################################################
+
+# imports
+import platform
+import random
+import statistics
+import time
+from typing import Callable, Dict, Sequence
+
+from OpenGL.GL import glFinish
+from Engine.engine import Engine
+from .scenes import SHAPES, populate, orbit_path
+
+def time_call(function: Callable[[], None], repeat: int) -> float:
+    '''
+    Times a function over several calls
+
+    Parameters:
+        - function: the function to time, called with no arguments
+        - repeat: integer number of calls
+
+    Returns:
+        - the average time per call in microseconds
+    '''
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def time_micro(engine: Engine, function: Callable[[], None],
+               repeat: int) -> float:
+    '''
+    Times a function like time_call, waiting for the GPU to finish the
+    draws it issued, then drops anything it left in the engine's render
+    queue. Nothing it does carries over into the timed frames.
+
+    Parameters:
+        - engine: the Engine being benchmarked
+        - function: the function to time, called with no arguments
+        - repeat: integer number of calls
+
+    Returns:
+        - the average time per call in microseconds
+    '''
+    glFinish()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    glFinish()
+    elapsed = (time.perf_counter() - start) / repeat * 1e6
+    engine.render_queue.clear()
+    return elapsed
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    '''
+    Nearest-rank percentile
+
+    Parameters:
+        - values: the samples
+        - fraction: float from 0 to 1
+
+    Returns:
+        - the percentile value
+    '''
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(fraction * len(ordered)))
+    return ordered[index]
+
+def bench_scene(engine: Engine, count: int, frames: int, repeat: int,
+                seed: int) -> Dict:
+    '''
+    Builds one procedural scene and times every path on it
+
+    Parameters:
+        - engine: a fresh headless Engine with a window
+        - count: integer number of shapes in the scene
+        - frames: integer number of full frames to time
+        - repeat: integer number of calls for the micro benchmarks
+        - seed: integer random seed for the scene and queries
+
+    Returns:
+        - a dictionary of results
+    '''
+    engine.gravity = False
+    populate(engine, count, seed)
+    rng = random.Random(seed)
+    result = {'objects': count}
+
+    # warm up: uploads buffers and compiles shaders
+    engine.run_headless(2, orbit_path(frames))
+
+    # one shape of each type, drawn on its own
+    result['shape_draw_us'] = {
+        name: time_micro(engine, shape_type(0.5).draw, repeat)
+        for name, shape_type in SHAPES.items()
+    }
+
+    # draw_room only queues the room, so flush it to time the draw too
+    room = engine.room_size
+    queue = engine.render_queue
+
+    def draw_room() -> None:
+        engine.draw_room(*room)
+        queue.flush()
+
+    result['draw_room_us'] = time_micro(engine, draw_room, repeat)
+
+    # collision queries at random points inside the room
+    points = [tuple(rng.uniform(-d / 2, d / 2) for d in room)
+              for _ in range(repeat)]
+    queries = iter(points)
+    result['check_collision_us'] = time_micro(
+        engine,
+        lambda: engine.physics.check_collision(next(queries),
+                                               engine.camera_radius),
+        repeat)
+
+    offsets = iter([(rng.uniform(-20, 20), rng.uniform(-20, 20))
+                    for _ in range(repeat)])
+    result['mouse_movement_us'] = time_micro(
+        engine, lambda: engine.handle_mouse_movement(*next(offsets)), repeat)
+
+    # full frames, one at a time so percentiles can be computed
+    camera = orbit_path(frames)
+    frame_times = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        engine.run_headless(1, lambda _, f=frame: camera(f))
+        frame_times.append((time.perf_counter() - start) * 1e3)
+
+    result['frame_ms'] = {
+        'mean': statistics.fmean(frame_times),
+        'p50': percentile(frame_times, 0.50),
+        'p95': percentile(frame_times, 0.95),
+        'max': max(frame_times)
+    }
+    result['objects_drawn'] = engine.objects_drawn
+    result['objects_culled'] = engine.objects_culled
+    return result
+
+def run(counts: Sequence[int], frames: int=60, repeat: int=1000,
+        seed: int=0, width: int=800, height: int=600) -> Dict:
+    '''
+    Runs the benchmarks for every scene size
+
+    Parameters:
+        - counts: sequence of shape counts to benchmark
+        - frames: integer number of full frames timed per scene
+        - repeat: integer number of calls for the micro benchmarks
+        - seed: integer random seed
+        - width: integer framebuffer width
+        - height: integer framebuffer height
+
+    Returns:
+        - a dictionary with run metadata and one result per count
+    '''
+    results = []
+    for count in counts:
+        # every scene gets its own offscreen window, opened at the
+        # benchmark resolution and closed once the scene is done
+        engine = Engine(headless=True)
+        engine.run_headless(1, width=width, height=height)
+
+        results.append(bench_scene(engine, count, frames, repeat, seed))
+        engine.window.close()
+        print(f"{count:>8} objects: "
+              f"{results[-1]['frame_ms']['mean']:.2f} ms/frame")
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'system': platform.platform(),
+            'seed': seed,
+            'frames': frames,
+            'repeat': repeat,
+            'resolution': [width, height]
+        },
+        'results': results
+    }
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
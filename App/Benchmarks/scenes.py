@@ -0,0 +1,75 @@
+################################################################################
+# File: scenes.py
+# Date: 18 October 2026
+# Description:
+#
+# Procedural scene generation for the benchmarks
+#
+################################################################################
+
+# imports
+import math
+import random
+from typing import Sequence
+
+from Engine.cube import Cube
+from Engine.sphere import Sphere
+from Engine.pyramid import Pyramid
+
+SHAPES = {'cube': Cube, 'sphere': Sphere, 'pyramid': Pyramid}
+
+def populate(engine, count: int, seed: int=0,
+             types: Sequence[str]=('cube', 'sphere', 'pyramid'),
+             min_size: float=0.2, max_size: float=1.0) -> None:
+    '''
+    Fills an engine's room with randomly placed static shapes. The same seed
+    always produces the same scene.
+
+    Parameters:
+        - engine: the Engine to add the shapes to
+        - count: integer number of shapes to add
+        - seed: integer random seed
+        - types: sequence of shape type names to pick from
+        - min_size: float, smallest side length, radius or base
+        - max_size: float, largest side length, radius or base
+
+    Returns: None
+    '''
+    rng = random.Random(seed)
+
+    # keep every shape fully inside the room
+    half = [dimension / 2 - max_size * 1.5 for dimension in engine.room_size]
+
+    for _ in range(count):
+        shape = SHAPES[rng.choice(types)](
+            rng.uniform(min_size, max_size),
+            (rng.random(), rng.random(), rng.random()),
+            tuple(rng.uniform(-h, h) for h in half)
+        )
+        engine.add_object(shape)
+
+def orbit_path(frames: int, radius: float=10.0, height: float=0.0):
+    '''
+    Builds a camera path that circles the middle of the room looking inward
+
+    Parameters:
+        - frames: integer number of frames in one orbit
+        - radius: float, distance from the middle of the room
+        - height: float, camera height
+
+    Returns:
+        - a function taking the frame number and returning (position, yaw,
+            pitch)
+    '''
+    def camera(frame: int):
+        angle = 2 * math.pi * frame / frames
+        position = (radius * math.cos(angle), height, radius * math.sin(angle))
+
+        # look back at the middle of the room
+        yaw = math.degrees(angle) + 180.0
+        return position, yaw, 0.0
+
+    return camera
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
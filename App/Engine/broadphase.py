@@ -0,0 +1,322 @@
+################################################################################
+# File: broadphase.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the sweep-and-prune broadphase. Keeps the bounding box end
+# points of every body sorted along each axis between frames and tracks which
+# boxes overlap as end points swap places.
+#
+################################################################################
+
+# imports
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+from .narrowphase import aabb_overlap
+
+# end point layout: [value, is_min, key]
+VALUE, IS_MIN, KEY = 0, 1, 2
+
+class SweepAndPrune():
+    def __init__(self) -> None:
+        '''
+        Constructor for SweepAndPrune class
+
+        Parameters: None
+
+        Returns: None
+        '''
+        # one list of end points per axis, kept sorted by value
+        self.axes: List[List[list]] = [[], [], []]
+
+        # key -> (object, [min end points], [max end points])
+        self.bodies: Dict[int, Tuple[Any, List[list], List[list]]] = {}
+
+        # keys of bodies whose boxes overlap, smaller key first
+        self.pairs: Set[Tuple[int, int]] = set()
+
+        # set by insert_many: the axes are unsorted and the pairs unknown
+        # until the next rebuild
+        self.stale = False
+
+        # (objects, lows, highs) batches from insert_many whose end points
+        # are only made when the broadphase is next used
+        self.pending: List[Tuple[List[Any], Any, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.bodies) + sum(len(objects)
+                                      for objects, _, _ in self.pending)
+
+    def insert(self, obj: Any, low: Sequence[float],
+               high: Sequence[float]) -> None:
+        '''
+        Adds a body. Its end points are appended and sorted into place,
+        which also finds the bodies it starts out overlapping.
+
+        Parameters:
+            - obj: the object to add
+            - low, high: the min and max corners of its bounding box
+
+        Returns: None
+        '''
+        if self.stale:
+            self.__rebuild()
+
+        key = id(obj)
+        mins = [[low[axis], True, key] for axis in range(3)]
+        maxes = [[high[axis], False, key] for axis in range(3)]
+        self.bodies[key] = (obj, mins, maxes)
+
+        for axis in range(3):
+            endpoints = self.axes[axis]
+            endpoints.append(mins[axis])
+            self.__sift(axis, len(endpoints) - 1)
+            endpoints.append(maxes[axis])
+            self.__sift(axis, len(endpoints) - 1)
+
+    def insert_many(self, objects: Sequence[Any], lows: Any,
+                    highs: Any) -> None:
+        '''
+        Adds many bodies at once. Nothing is built until the broadphase is
+        next used; then their end points are made and the axes sorted and
+        the pairs found in one pass, instead of sifting every end point into
+        place.
+
+        Parameters:
+            - objects: the objects to add
+            - lows, highs: (n, 3) arrays or sequences of the min and max
+                corners of their bounding boxes
+
+        Returns: None
+        '''
+        self.pending.append((list(objects), lows, highs))
+        self.stale = True
+
+    def __unpack(self) -> None:
+        '''
+        Makes the end points of the batches waiting from insert_many and
+        appends them to the axes unsorted
+
+        Parameters: None
+
+        Returns: None
+        '''
+        bodies = self.bodies
+        x_axis, y_axis, z_axis = self.axes
+        for objects, lows, highs in self.pending:
+            if hasattr(lows, 'tolist'):
+                lows, highs = lows.tolist(), highs.tolist()
+            for obj, low, high in zip(objects, lows, highs):
+                key = id(obj)
+                mins = [[low[0], True, key], [low[1], True, key],
+                        [low[2], True, key]]
+                maxes = [[high[0], False, key], [high[1], False, key],
+                         [high[2], False, key]]
+                bodies[key] = (obj, mins, maxes)
+                x_axis += (mins[0], maxes[0])
+                y_axis += (mins[1], maxes[1])
+                z_axis += (mins[2], maxes[2])
+        self.pending = []
+
+    def __rebuild(self) -> None:
+        '''
+        Sorts every axis from scratch and finds all overlapping pairs with a
+        single sweep along x
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.pending:
+            self.__unpack()
+
+        for endpoints in self.axes:
+            # min end points first on ties, so touching boxes count
+            endpoints.sort(key=lambda point: (point[VALUE], not point[IS_MIN]))
+
+        pairs = set()
+        active = {}
+        for point in self.axes[0]:
+            key = point[KEY]
+            if not point[IS_MIN]:
+                active.pop(key, None)
+                continue
+
+            low, high = self.__bounds(key)
+            for other, (other_low, other_high) in active.items():
+                if aabb_overlap(low, high, other_low, other_high):
+                    pairs.add((min(key, other), max(key, other)))
+            active[key] = (low, high)
+
+        self.pairs = pairs
+        self.stale = False
+
+    def remove(self, obj: Any) -> None:
+        '''
+        Removes a body and every pair it is part of
+
+        Parameters:
+            - obj: the object to remove
+
+        Returns: None
+        '''
+        if self.stale:
+            self.__rebuild()
+
+        key = id(obj)
+        _, mins, maxes = self.bodies.pop(key)
+        for axis in range(3):
+            endpoints = self.axes[axis]
+            endpoints.remove(mins[axis])
+            endpoints.remove(maxes[axis])
+        self.pairs = {pair for pair in self.pairs if key not in pair}
+
+    def move(self, obj: Any, low: Sequence[float],
+             high: Sequence[float]) -> None:
+        '''
+        Updates a body's bounding box. The end point lists are re-sorted on
+        the next call to update().
+
+        Parameters:
+            - obj: the object that moved
+            - low, high: the min and max corners of its new bounding box
+
+        Returns: None
+        '''
+        if self.pending:
+            self.__unpack()
+
+        _, mins, maxes = self.bodies[id(obj)]
+        for axis in range(3):
+            mins[axis][VALUE] = low[axis]
+            maxes[axis][VALUE] = high[axis]
+
+    def move_many(self, objects: Sequence[Any], lows: Any,
+                  highs: Any) -> None:
+        '''
+        Updates many bodies' bounding boxes, e.g. from arrays of simulated
+        bodies. As with move(), the axes are re-sorted by update().
+
+        Parameters:
+            - objects: the objects that moved
+            - lows, highs: (n, 3) NumPy arrays of the min and max corners
+                of their new boxes
+
+        Returns: None
+        '''
+        if self.pending:
+            self.__unpack()
+
+        bodies = self.bodies
+        for obj, low, high in zip(objects, lows.tolist(), highs.tolist()):
+            _, mins, maxes = bodies[id(obj)]
+            mins[0][VALUE], mins[1][VALUE], mins[2][VALUE] = low
+            maxes[0][VALUE], maxes[1][VALUE], maxes[2][VALUE] = high
+
+    def update(self) -> None:
+        '''
+        Re-sorts every axis with insertion sort. End points barely move
+        between frames, so the lists are nearly sorted and this runs in close
+        to linear time.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.stale:
+            self.__rebuild()
+            return
+
+        for axis in range(3):
+            endpoints = self.axes[axis]
+            for index in range(1, len(endpoints)):
+                if endpoints[index - 1][VALUE] > endpoints[index][VALUE]:
+                    self.__sift(axis, index)
+
+    def __sift(self, axis: int, index: int) -> None:
+        '''
+        Moves the end point at index left until its axis is sorted again,
+        updating the overlapping pairs for every end point it passes
+
+        Parameters:
+            - axis: integer axis (0 = x, 1 = y, 2 = z)
+            - index: integer position of the end point to move
+
+        Returns: None
+        '''
+        endpoints = self.axes[axis]
+        moving = endpoints[index]
+        value = moving[VALUE]
+
+        while index > 0 and endpoints[index - 1][VALUE] > value:
+            passed = endpoints[index - 1]
+
+            if moving[IS_MIN] and not passed[IS_MIN]:
+                # a min passing a max: the boxes start to overlap on this
+                # axis, so check the others
+                self.__begin_overlap(moving[KEY], passed[KEY])
+            elif not moving[IS_MIN] and passed[IS_MIN]:
+                # a max passing a min: the boxes no longer overlap
+                self.__end_overlap(moving[KEY], passed[KEY])
+
+            endpoints[index] = passed
+            index -= 1
+
+        endpoints[index] = moving
+
+    def __bounds(self, key: int) -> Tuple[List[float], List[float]]:
+        '''
+        Reads a body's current bounding box from its end points
+
+        Parameters:
+            - key: the body's key
+
+        Returns:
+            - a tuple of the (min, max) corners
+        '''
+        _, mins, maxes = self.bodies[key]
+        return ([point[VALUE] for point in mins],
+                [point[VALUE] for point in maxes])
+
+    def __begin_overlap(self, key_a: int, key_b: int) -> None:
+        '''
+        Records a pair if the two boxes overlap on every axis
+
+        Parameters:
+            - key_a, key_b: the keys of the two bodies
+
+        Returns: None
+        '''
+        if key_a == key_b:
+            return
+        if aabb_overlap(*self.__bounds(key_a), *self.__bounds(key_b)):
+            self.pairs.add((min(key_a, key_b), max(key_a, key_b)))
+
+    def __end_overlap(self, key_a: int, key_b: int) -> None:
+        '''
+        Forgets a pair
+
+        Parameters:
+            - key_a, key_b: the keys of the two bodies
+
+        Returns: None
+        '''
+        self.pairs.discard((min(key_a, key_b), max(key_a, key_b)))
+
+    def overlapping_pairs(self) -> List[Tuple[Any, Any]]:
+        '''
+        Lists every pair of bodies whose boxes overlap
+
+        Parameters: None
+
+        Returns:
+            - a list of (object, object) tuples
+        '''
+        if self.stale:
+            self.__rebuild()
+
+        bodies = self.bodies
+        return [(bodies[a][0], bodies[b][0]) for a, b in self.pairs]
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
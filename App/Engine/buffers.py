@@ -0,0 +1,171 @@
+################################################################################
+# File: buffers.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for GPU-resident geometry buffers
+#
+################################################################################
+
+# imports
+import numpy as np
+from OpenGL.GL import *
+from typing import Callable, Dict, Hashable, Tuple
+
+from .gl_state import state
+
+class GeometryBuffer():
+    def __init__(self, vertices: np.ndarray, indices: np.ndarray,
+                 mode: int=GL_TRIANGLES) -> None:
+        '''
+        Constructor for GeometryBuffer class. Nothing is sent to the GPU until
+        the first draw, so buffers can be created before a context exists.
+
+        Parameters:
+            - vertices: (n, 3) array of vertex positions, or (n, k) array of
+                interleaved vertices that start with the position
+            - indices: flat array of indices into vertices
+            - mode: the OpenGL primitive type used to draw the indices
+
+        Returns: None
+        '''
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float32)
+        self.indices = np.ascontiguousarray(indices, dtype=np.uint32)
+        self.mode = mode
+        self.count = len(self.indices)
+
+        # bytes from one vertex to the next
+        self.stride = self.vertices.strides[0]
+
+        self.vbo = None
+        self.ibo = None
+        self.vao = None
+
+    def upload(self) -> None:
+        '''
+        Copies the vertex and index arrays into buffer objects on the GPU
+
+        Parameters: None
+
+        Returns: None
+        '''
+        # the element buffer binding belongs to the bound vertex array
+        state.bind_vertex_array(0)
+
+        self.vbo = glGenBuffers(1)
+        state.bind_buffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices,
+                     GL_STATIC_DRAW)
+
+        self.ibo = glGenBuffers(1)
+        state.bind_buffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.indices.nbytes, self.indices,
+                     GL_STATIC_DRAW)
+
+        # record the vertex layout once if vertex array objects are supported
+        if bool(glGenVertexArrays):
+            self.vao = glGenVertexArrays(1)
+            state.bind_vertex_array(self.vao)
+            self.__bind_arrays()
+            state.bind_vertex_array(0)
+
+    def __bind_arrays(self) -> None:
+        '''
+        Points the fixed function vertex array at the buffers
+
+        Parameters: None
+
+        Returns: None
+        '''
+        state.bind_buffer(GL_ARRAY_BUFFER, self.vbo)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, self.stride, None)
+        state.bind_buffer(GL_ELEMENT_ARRAY_BUFFER, self.ibo)
+
+    def draw(self) -> None:
+        '''
+        Draws the whole buffer with a single draw call
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.vbo is None:
+            self.upload()
+
+        # the vertex array stays bound, so drawing the same buffer again
+        # doesn't rebind anything
+        if self.vao is not None:
+            state.bind_vertex_array(self.vao)
+            glDrawElements(self.mode, self.count, GL_UNSIGNED_INT, None)
+            return
+
+        self.__bind_arrays()
+        glDrawElements(self.mode, self.count, GL_UNSIGNED_INT, None)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def release(self) -> None:
+        '''
+        Frees the GPU buffers. The arrays are kept, so the next draw uploads
+        them again.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.vao is not None:
+            if state.vertex_array == self.vao:
+                state.bind_vertex_array(0)
+            glDeleteVertexArrays(1, [self.vao])
+        if self.vbo is not None:
+            state.forget_buffer(self.vbo)
+            state.forget_buffer(self.ibo)
+            glDeleteBuffers(2, [self.vbo, self.ibo])
+        self.vbo = self.ibo = self.vao = None
+
+# buffers shared between every instance of a shape type
+_shared: Dict[Hashable, GeometryBuffer] = {}
+
+def shared_buffer(key: Hashable,
+                  build: Callable[[], Tuple]) -> GeometryBuffer:
+    '''
+    Returns the shared buffer for key, building it on first use
+
+    Parameters:
+        - key: any hashable identifying the geometry
+        - build: a function returning (vertices, indices) or (vertices,
+            indices, mode) for the geometry
+
+    Returns:
+        - the GeometryBuffer for key
+    '''
+    buffer = _shared.get(key)
+    if buffer is None:
+        buffer = _shared[key] = GeometryBuffer(*build())
+    return buffer
+
+def release_shared() -> None:
+    '''
+    Frees every shared buffer, e.g. before the GL context is destroyed
+
+    Parameters: None
+
+    Returns: None
+    '''
+    for buffer in _shared.values():
+        buffer.release()
+    _shared.clear()
+
+def forget_shared() -> None:
+    '''
+    Drops every shared buffer without freeing it, for when its context is
+    already gone and the names may be reused by the current one
+
+    Parameters: None
+
+    Returns: None
+    '''
+    _shared.clear()
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,429 @@
+################################################################################
+# File: bvh.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the bounding volume hierarchy used to cast rays into the
+# scene. The tree is a binary tree of boxes stored as flat NumPy arrays, so
+# building it, refitting it after objects move and walking it one level at
+# a time are all whole-array operations.
+#
+################################################################################
+
+# imports
+import math
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# exact test run on the objects whose boxes a ray hits:
+# (object, origin, direction, max distance) -> distance or None
+RayTest = Callable[[Any, Sequence[float], Sequence[float], float],
+                   Optional[float]]
+
+def ray_boxes(lows: np.ndarray, highs: np.ndarray, origin: np.ndarray,
+              inverse: np.ndarray, max_distance: float) -> np.ndarray:
+    '''
+    Slab test of one ray against many boxes at once. Boxes with NaN corners
+    are never hit.
+
+    Parameters:
+        - lows, highs: (n, 3) arrays of the min and max box corners
+        - origin: (3,) array, the start of the ray
+        - inverse: (3,) array, 1 / the direction of the ray
+        - max_distance: float, how far along the ray to look
+
+    Returns:
+        - (n,) array of distances to the boxes, inf where a box is missed
+    '''
+    t0 = (lows - origin) * inverse
+    t1 = (highs - origin) * inverse
+    near = np.minimum(t0, t1).max(axis=1)
+    far = np.maximum(t0, t1).min(axis=1)
+    np.maximum(near, 0.0, out=near)
+    np.minimum(far, max_distance, out=far)
+    with np.errstate(invalid='ignore'):
+        return np.where(near <= far, near, np.inf)
+
+class BVH():
+    def __init__(self, leaf_size: int=4, capacity: int=1024) -> None:
+        '''
+        Constructor for BVH class. Objects added after the last build are
+        kept in a short list that is tested directly, and removed objects
+        leave empty slots, until there are enough of either to rebuild.
+        Moved objects only refit the boxes of the existing tree.
+
+        Parameters:
+            - leaf_size: integer most objects in a leaf
+            - capacity: integer number of objects to allocate room for
+
+        Returns: None
+        '''
+        self.leaf_size = leaf_size
+
+        # objects by slot, None for removed ones, and their bounds. Removed
+        # slots get NaN bounds, which no ray hits and the refit ignores.
+        self.objects: List[Any] = []
+        self.slots: Dict[int, int] = {}
+        self.lows = np.full((capacity, 3), np.nan)
+        self.highs = np.full((capacity, 3), np.nan)
+        self.removed = 0
+
+        # slots below built are in the tree, the rest are tested directly
+        self.built = 0
+
+        # the tree: nodes in build order, the root first. Leaves have no
+        # children and own the slots order[start:end].
+        self.order = np.zeros(0, dtype=np.int64)
+        self.node_low = np.zeros((0, 3))
+        self.node_high = np.zeros((0, 3))
+        self.node_left = np.zeros(0, dtype=np.int64)
+        self.node_right = np.zeros(0, dtype=np.int64)
+        self.node_start = np.zeros(0, dtype=np.int64)
+        self.node_end = np.zeros(0, dtype=np.int64)
+
+        # inner nodes grouped by depth, deepest first, and the leaves
+        # sorted by where their slots start, for refitting
+        self.levels: List[np.ndarray] = []
+        self.leaves = np.zeros(0, dtype=np.int64)
+        self.leaf_starts = np.zeros(0, dtype=np.int64)
+
+        # set when an object in the tree moves
+        self.dirty = False
+
+        # total surface area of the boxes just after the last build. Once
+        # refitting has spread the boxes to twice that, the tree is rebuilt.
+        self.built_area = 0.0
+        self.rebuild_ratio = 2.0
+
+    def __len__(self) -> int:
+        return len(self.objects) - self.removed
+
+    def __contains__(self, obj: Any) -> bool:
+        return id(obj) in self.slots
+
+    def __grow(self, needed: int) -> None:
+        '''
+        Doubles the bounds arrays until needed slots fit
+
+        Parameters:
+            - needed: integer number of slots that must fit
+
+        Returns: None
+        '''
+        capacity = len(self.lows)
+        while capacity < needed:
+            capacity *= 2
+        for name in ('lows', 'highs'):
+            array = getattr(self, name)
+            grown = np.full((capacity, 3), np.nan)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def insert(self, obj: Any, low: Sequence[float],
+               high: Sequence[float]) -> None:
+        '''
+        Adds an object
+
+        Parameters:
+            - obj: the object to add
+            - low, high: the min and max corners of the object's bounds
+
+        Returns: None
+        '''
+        slot = len(self.objects)
+        if slot == len(self.lows):
+            self.__grow(slot + 1)
+
+        self.objects.append(obj)
+        self.slots[id(obj)] = slot
+        self.lows[slot] = low
+        self.highs[slot] = high
+
+    def insert_many(self, objects: Sequence[Any], lows: Sequence,
+                    highs: Sequence) -> None:
+        '''
+        Adds many objects with whole-array writes
+
+        Parameters:
+            - objects: the objects to add
+            - lows, highs: (n, 3) min and max corners of their bounds
+
+        Returns: None
+        '''
+        start = len(self.objects)
+        end = start + len(objects)
+        if end > len(self.lows):
+            self.__grow(end)
+
+        self.objects.extend(objects)
+        self.slots.update(zip(map(id, objects), range(start, end)))
+        self.lows[start:end] = lows
+        self.highs[start:end] = highs
+
+    def remove(self, obj: Any) -> None:
+        '''
+        Removes an object, leaving its slot empty until the next build
+
+        Parameters:
+            - obj: the object to remove
+
+        Returns: None
+        '''
+        slot = self.slots.pop(id(obj))
+        self.objects[slot] = None
+        self.lows[slot] = np.nan
+        self.highs[slot] = np.nan
+        self.removed += 1
+        self.dirty = True
+
+    def move(self, obj: Any, low: Sequence[float],
+             high: Sequence[float]) -> None:
+        '''
+        Updates an object's bounds. The tree's boxes catch up at the next
+        query.
+
+        Parameters:
+            - obj: the object that moved
+            - low, high: the new min and max corners of its bounds
+
+        Returns: None
+        '''
+        slot = self.slots[id(obj)]
+        self.lows[slot] = low
+        self.highs[slot] = high
+        self.dirty = True
+
+    def move_many(self, objects: Sequence[Any], lows: Sequence,
+                  highs: Sequence) -> None:
+        '''
+        Updates the bounds of many objects with whole-array writes. The
+        tree's boxes are refit once at the next query.
+
+        Parameters:
+            - objects: the objects that moved
+            - lows, highs: (n, 3) new min and max corners of their bounds
+
+        Returns: None
+        '''
+        if not len(objects):
+            return
+        slots = self.slots
+        moved = np.fromiter((slots[id(obj)] for obj in objects),
+                            dtype=np.int64, count=len(objects))
+        self.lows[moved] = lows
+        self.highs[moved] = highs
+        self.dirty = True
+
+    def build(self) -> None:
+        '''
+        Drops empty slots and builds the tree from scratch, splitting every
+        node at the median object center along its widest axis
+
+        Parameters: None
+
+        Returns: None
+        '''
+        # compact the slots
+        if self.removed:
+            keep = [slot for slot, obj in enumerate(self.objects)
+                    if obj is not None]
+            self.objects = [self.objects[slot] for slot in keep]
+            self.slots = {id(obj): slot
+                          for slot, obj in enumerate(self.objects)}
+            n = len(keep)
+            self.lows[:n] = self.lows[keep]
+            self.highs[:n] = self.highs[keep]
+            self.lows[n:] = np.nan
+            self.highs[n:] = np.nan
+            self.removed = 0
+
+        n = len(self.objects)
+        centers = (self.lows[:n] + self.highs[:n]) / 2
+        order = np.arange(n)
+
+        lefts, rights, starts, ends, depths = [], [], [], [], []
+
+        def add_node(start: int, end: int, depth: int) -> int:
+            lefts.append(-1)
+            rights.append(-1)
+            starts.append(start)
+            ends.append(end)
+            depths.append(depth)
+            return len(starts) - 1
+
+        stack = [add_node(0, n, 0)] if n else []
+        while stack:
+            node = stack.pop()
+            start, end = starts[node], ends[node]
+            if end - start <= self.leaf_size:
+                continue
+
+            part = centers[order[start:end]]
+            axis = int(np.argmax(part.max(axis=0) - part.min(axis=0)))
+            middle = (start + end) // 2
+            split = np.argpartition(part[:, axis], middle - start)
+            order[start:end] = order[start:end][split]
+
+            depth = depths[node] + 1
+            lefts[node] = add_node(start, middle, depth)
+            rights[node] = add_node(middle, end, depth)
+            stack.extend((lefts[node], rights[node]))
+
+        count = len(starts)
+        self.order = order
+        self.node_left = np.array(lefts, dtype=np.int64)
+        self.node_right = np.array(rights, dtype=np.int64)
+        self.node_start = np.array(starts, dtype=np.int64)
+        self.node_end = np.array(ends, dtype=np.int64)
+        self.node_low = np.empty((count, 3))
+        self.node_high = np.empty((count, 3))
+
+        depths = np.array(depths, dtype=np.int64)
+        inner = self.node_left >= 0
+        self.levels = []
+        for depth in range(int(depths.max()) if count else -1, -1, -1):
+            nodes = np.flatnonzero(inner & (depths == depth))
+            if len(nodes):
+                self.levels.append(nodes)
+
+        leaves = np.flatnonzero(~inner)
+        self.leaves = leaves[np.argsort(self.node_start[leaves])]
+        self.leaf_starts = self.node_start[self.leaves]
+
+        self.built = n
+        self.refit()
+        self.built_area = self.area()
+
+    def refit(self) -> None:
+        '''
+        Recomputes every box of the tree from the objects' current bounds,
+        the leaves first and then one level at a time towards the root
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.dirty = False
+        if not len(self.leaves):
+            return
+
+        # fmin and fmax skip the NaN bounds of empty slots
+        lows = self.lows[self.order]
+        highs = self.highs[self.order]
+        self.node_low[self.leaves] = np.fmin.reduceat(lows, self.leaf_starts)
+        self.node_high[self.leaves] = np.fmax.reduceat(highs,
+                                                       self.leaf_starts)
+
+        low, high = self.node_low, self.node_high
+        left, right = self.node_left, self.node_right
+        for nodes in self.levels:
+            low[nodes] = np.fmin(low[left[nodes]], low[right[nodes]])
+            high[nodes] = np.fmax(high[left[nodes]], high[right[nodes]])
+
+    def area(self) -> float:
+        '''
+        Total surface area of the tree's boxes. The more the boxes overlap,
+        the bigger it gets and the more of the tree a ray visits.
+
+        Parameters: None
+
+        Returns:
+            - the float area
+        '''
+        size = self.node_high - self.node_low
+        x, y, z = size[:, 0], size[:, 1], size[:, 2]
+        return float(np.nansum(2 * (x * y + y * z + z * x)))
+
+    def update(self) -> None:
+        '''
+        Brings the tree up to date before a query: rebuilds it if many
+        objects were added or removed, or refitting has made it much worse
+        than a fresh build; otherwise refits it if anything moved
+
+        Parameters: None
+
+        Returns: None
+        '''
+        pending = len(self.objects) - self.built
+        if (pending > max(4 * self.leaf_size, self.built // 4)
+            or self.removed > self.built // 2):
+            self.build()
+            return
+
+        if self.dirty:
+            self.refit()
+            if self.area() > self.rebuild_ratio * self.built_area:
+                self.build()
+
+    def raycast(self, origin: Sequence[float], direction: Sequence[float],
+                max_distance: float=math.inf,
+                test: RayTest=None) -> Optional[Tuple[Any, float]]:
+        '''
+        Finds the first object along a ray. The tree is walked one level at
+        a time, keeping only the nodes whose boxes the ray passes through,
+        and the objects in the leaves reached are tested nearest box first.
+
+        Parameters:
+            - origin: the start of the ray
+            - direction: the direction of the ray; distances are in units of
+                its length
+            - max_distance: float, how far along the ray to look
+            - test: exact ray test for an object, by default the object's
+                bounding box is taken to be exact
+
+        Returns:
+            - a tuple of (object, distance), or None if nothing was hit
+        '''
+        self.update()
+
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+
+        # a tiny step instead of zero keeps the slab test free of inf * 0
+        step = np.where(direction == 0.0, 1e-30, direction)
+        inverse = 1.0 / step
+
+        # walk the tree
+        found = []
+        frontier = np.zeros(1 if len(self.node_left) else 0, dtype=np.int64)
+        while len(frontier):
+            near = ray_boxes(self.node_low[frontier], self.node_high[frontier],
+                             origin, inverse, max_distance)
+            frontier = frontier[near < np.inf]
+
+            children = self.node_left[frontier]
+            for leaf in frontier[children < 0].tolist():
+                found.append(self.order[self.node_start[leaf]:
+                                        self.node_end[leaf]])
+
+            inner = frontier[children >= 0]
+            frontier = np.concatenate((self.node_left[inner],
+                                       self.node_right[inner]))
+
+        # objects added since the last build
+        found.append(np.arange(self.built, len(self.objects)))
+
+        slots = np.concatenate(found)
+        near = ray_boxes(self.lows[slots], self.highs[slots], origin,
+                         inverse, max_distance)
+        hit = near < np.inf
+        slots, near = slots[hit], near[hit]
+        nearest = np.argsort(near)
+
+        origin = tuple(origin.tolist())
+        direction = tuple(direction.tolist())
+        best, best_distance = None, max_distance
+        for slot, box_distance in zip(slots[nearest].tolist(),
+                                      near[nearest].tolist()):
+            if box_distance > best_distance:
+                break
+            obj = self.objects[slot]
+            distance = (box_distance if test is None
+                        else test(obj, origin, direction, best_distance))
+            if distance is not None and distance <= best_distance:
+                best, best_distance = obj, distance
+
+        return None if best is None else (best, best_distance)
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
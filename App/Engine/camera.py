@@ -0,0 +1,230 @@
+################################################################################
+# File: camera.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the camera. The direction vectors and the view and
+# projection matrices are cached and only recomputed after the position,
+# angles or aspect ratio actually change.
+#
+################################################################################
+
+# imports
+import math
+import numpy as np
+from OpenGL.GL import glLoadMatrixf
+from typing import Tuple
+
+from .transforms import perspective, look_at
+
+Vector = Tuple[float, float, float]
+
+class Camera():
+    def __init__(self, position: Vector=(0.0, 0.0, 5.0), yaw: float=-90.0,
+                 pitch: float=0.0, up: Vector=(0.0, 1.0, 0.0),
+                 fovy: float=45.0, aspect: float=4 / 3, near: float=0.1,
+                 far: float=100.0) -> None:
+        '''
+        Constructor for Camera class
+
+        Parameters:
+            - position: tuple of three floats, where the camera is
+            - yaw: float, rotation about the up axis in degrees
+            - pitch: float, rotation above the horizon in degrees
+            - up: tuple of three floats, the camera's up direction
+            - fovy: float, vertical field of view in degrees
+            - aspect: float, width / height of the viewport
+            - near: float, distance to the near clipping plane
+            - far: float, distance to the far clipping plane
+
+        Returns: None
+        '''
+        self._position = tuple(position)
+        self._yaw = yaw
+        self._pitch = max(-89.0, min(89.0, pitch))
+        self.up = tuple(up)
+        self.fovy = fovy
+        self._aspect = aspect
+        self.near = near
+        self.far = far
+
+        # what has to be recomputed before the cached values can be used
+        self.angles_dirty = True
+        self.view_dirty = True
+        self.projection_dirty = True
+
+        self._front = (0.0, 0.0, -1.0)
+        self._right = (1.0, 0.0, 0.0)
+        self._ground_front = (0.0, 0.0, -1.0)
+        self._view = None
+        self._projection = None
+        self._matrix = None
+        self._gl_matrix = None
+
+        # bumped every time the combined matrix changes, so anything derived
+        # from it (e.g. the view frustum) can be cached too
+        self.version = 0
+
+    @property
+    def position(self) -> Vector:
+        return self._position
+
+    @position.setter
+    def position(self, position: Vector) -> None:
+        position = tuple(position)
+        if position != self._position:
+            self._position = position
+            self.view_dirty = True
+
+    @property
+    def yaw(self) -> float:
+        return self._yaw
+
+    @yaw.setter
+    def yaw(self, yaw: float) -> None:
+        if yaw != self._yaw:
+            self._yaw = yaw
+            self.angles_dirty = True
+
+    @property
+    def pitch(self) -> float:
+        return self._pitch
+
+    @pitch.setter
+    def pitch(self, pitch: float) -> None:
+        pitch = max(-89.0, min(89.0, pitch))
+        if pitch != self._pitch:
+            self._pitch = pitch
+            self.angles_dirty = True
+
+    @property
+    def aspect(self) -> float:
+        return self._aspect
+
+    @aspect.setter
+    def aspect(self, aspect: float) -> None:
+        if aspect != self._aspect:
+            self._aspect = aspect
+            self.projection_dirty = True
+
+    def rotate(self, xoffset: float, yoffset: float,
+               sensitivity: float=0.05) -> None:
+        '''
+        Turns the camera by a relative mouse motion. Pass the motion of a
+        whole frame at once: only the angles change here, the trigonometry
+        runs once when the direction is next needed.
+
+        Parameters:
+            - xoffset: float, horizontal mouse motion
+            - yoffset: float, vertical mouse motion (down is positive)
+            - sensitivity: float, degrees per unit of motion
+
+        Returns: None
+        '''
+        self.yaw = self._yaw + xoffset * sensitivity
+        self.pitch = self._pitch - yoffset * sensitivity
+
+    def __update_angles(self) -> None:
+        '''
+        Recomputes the direction vectors from yaw and pitch
+
+        Parameters: None
+
+        Returns: None
+        '''
+        yaw = math.radians(self._yaw)
+        pitch = math.radians(self._pitch)
+        cos_pitch = math.cos(pitch)
+        front = (math.cos(yaw) * cos_pitch, math.sin(pitch),
+                 math.sin(yaw) * cos_pitch)
+        norm = math.sqrt(sum(i * i for i in front))
+        self._front = tuple(i / norm for i in front)
+
+        # right = front x up, normalized
+        fx, fy, fz = self._front
+        ux, uy, uz = self.up
+        right = (fy * uz - fz * uy, fz * ux - fx * uz, fx * uy - fy * ux)
+        norm = math.sqrt(sum(i * i for i in right))
+        self._right = tuple(i / norm for i in right) if norm else (
+            0.0, 0.0, 0.0)
+
+        # front flattened onto the floor, for walking
+        norm = math.hypot(fx, fz)
+        self._ground_front = (fx / norm, 0.0, fz / norm) if norm else (
+            0.0, 0.0, 0.0)
+
+        self.angles_dirty = False
+        self.view_dirty = True
+
+    @property
+    def front(self) -> Vector:
+        if self.angles_dirty:
+            self.__update_angles()
+        return self._front
+
+    @property
+    def right(self) -> Vector:
+        if self.angles_dirty:
+            self.__update_angles()
+        return self._right
+
+    @property
+    def ground_front(self) -> Vector:
+        if self.angles_dirty:
+            self.__update_angles()
+        return self._ground_front
+
+    @property
+    def view(self) -> np.ndarray:
+        '''
+        The view (look-at) matrix, recomputed only if the camera moved or
+        turned
+        '''
+        front = self.front
+        if self.view_dirty:
+            eye = self._position
+            target = tuple(eye[i] + front[i] for i in range(3))
+            self._view = look_at(eye, target, self.up)
+            self.view_dirty = False
+            self._matrix = None
+        return self._view
+
+    @property
+    def projection(self) -> np.ndarray:
+        '''
+        The perspective matrix, recomputed only if the aspect ratio or
+        clipping planes changed
+        '''
+        if self.projection_dirty:
+            self._projection = perspective(self.fovy, self._aspect, self.near,
+                                           self.far)
+            self.projection_dirty = False
+            self._matrix = None
+        return self._projection
+
+    @property
+    def matrix(self) -> np.ndarray:
+        '''
+        projection @ view, plus its transposed copy for OpenGL
+        '''
+        view = self.view
+        projection = self.projection
+        if self._matrix is None:
+            self._matrix = projection @ view
+            self._gl_matrix = np.ascontiguousarray(self._matrix.T)
+            self.version += 1
+        return self._matrix
+
+    def load(self) -> None:
+        '''
+        Replaces the current OpenGL matrix with projection @ view
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.matrix
+        glLoadMatrixf(self._gl_matrix)
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
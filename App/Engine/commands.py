@@ -0,0 +1,57 @@
+################################################################################
+# File: commands.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the command queue. Other threads (e.g. the object prompt)
+# post commands here instead of touching the engine, and the main loop runs
+# them once per frame.
+#
+################################################################################
+
+# imports
+import queue
+from typing import Any, Callable
+
+class CommandQueue():
+    def __init__(self) -> None:
+        '''
+        Constructor for CommandQueue class
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.queue = queue.SimpleQueue()
+
+    def put(self, command: Callable[..., Any], *args: Any) -> None:
+        '''
+        Queues a call to run on the main thread. Safe to call from any
+        thread.
+
+        Parameters:
+            - command: the function to call
+            - args: the arguments to call it with
+
+        Returns: None
+        '''
+        self.queue.put((command, args))
+
+    def drain(self) -> int:
+        '''
+        Runs every queued command, in the order they were queued. Commands
+        queued while draining run on the next call.
+
+        Parameters: None
+
+        Returns:
+            - the integer number of commands run
+        '''
+        count = self.queue.qsize()
+        for _ in range(count):
+            command, args = self.queue.get_nowait()
+            command(*args)
+        return count
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
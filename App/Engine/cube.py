@@ -9,10 +9,21 @@
 
 # imports
 from .shape import Shape
+from .scene_store import Dimension
+from .geometry import cube_geometry
 from OpenGL.GL import glBegin, glEnd, glVertex3f, GL_QUADS
 from typing import Tuple
+import numpy as np
 
 class Cube(Shape):
+    __slots__ = ()
+    type_code = 0
+
+    # drawn from the shared GPU buffer built by geometry()
+    buffered = True
+
+    side_length = Dimension(0)
+
     def __init__(self, side_length: float,
                  color: Tuple[float, float, float]=(1.0, 1.0, 1.0),
                  position: Tuple[float, float, float]=(0.0, 0.0, 0.0)) -> None:
@@ -40,7 +51,8 @@ class Cube(Shape):
 
         Returns: None
         '''
-        # Manually draw cube using immediate mode
+        # Manually draw cube using immediate mode (the fallback path, see
+        # Shape.immediate_mode)
         side = self.side_length / 2
 
         glBegin(GL_QUADS)
@@ -83,5 +95,68 @@ class Cube(Shape):
 
         glEnd()
 
+    @classmethod
+    def geometry(cls):
+        '''
+        Unit cube geometry shared by every Cube
+
+        Parameters: None
+
+        Returns:
+            - a tuple of (vertices, indices) arrays
+        '''
+        return cube_geometry()
+
+    def scale(self) -> float:
+        '''
+        Scale applied to the unit cube geometry
+
+        Parameters: None
+
+        Returns:
+            - the side length
+        '''
+        return self.side_length
+
+    @classmethod
+    def local_spheres(cls, dimensions: np.ndarray):
+        '''
+        Bounding spheres of many cubes from their side lengths
+
+        Parameters:
+            - dimensions: (n, 2) array of store dimensions
+
+        Returns:
+            - a tuple of (n, 3) center offsets and (n,) radii
+        '''
+        sides = dimensions[:, 0]
+        return np.zeros((len(sides), 3)), sides * (np.sqrt(3.0) / 2)
+
+    @classmethod
+    def local_boxes(cls, dimensions: np.ndarray):
+        '''
+        Bounding boxes of many cubes from their side lengths
+
+        Parameters:
+            - dimensions: (n, 2) array of store dimensions
+
+        Returns:
+            - a tuple of (n, 3) min and max corner offsets
+        '''
+        high = np.repeat(dimensions[:, 0:1] / 2, 3, axis=1)
+        return -high, high
+
+    def local_bounds(self):
+        '''
+        Bounding box relative to the cube's position
+
+        Parameters: None
+
+        Returns:
+            - a tuple of the (min, max) corners
+        '''
+        side = self.side_length / 2
+        return (-side, -side, -side), (side, side, side)
+
 if __name__ == '__main__':
     assert False, 'This is a class file. Import its contents into another file.'
@@ -10,12 +10,10 @@
 # module imports
 import pygame
 import math
+import time
 from pygame.locals import *
 from OpenGL.GL import *
-from OpenGL.GLU import *
-from OpenGL.GLUT import *
-import tkinter as tk
-from tkinter import simpledialog
+import numpy as np
 
 # class imports
 from .window import Window
@@ -23,50 +21,189 @@ from .physics import Physics
 from .cube import Cube
 from .sphere import Sphere
 from .pyramid import Pyramid
+from .shape import Shape
+from .instancing import InstancedRenderer
+from .frustum import Frustum
+from .camera import Camera
+from .timestep import FixedTimestep
+from .frame_pacer import FramePacer
+from .input_stream import (KeyState, InputFrame, InputRecorder, InputReplayer,
+                           SHAPE_TYPES)
+from .profiler import FrameProfiler
+from .hud import ProfilerOverlay
+from .room import Room
+from .render_queue import RenderQueue, BACKGROUND
+from .scene_store import SceneStore
+from .scene_graph import SceneGraph
+from .world import ChunkedWorld
+from .gl_state import state
+from .scene_io import (SceneData, save_scene, shape_columns, FLAG_DYNAMIC,
+                       SHAPE_CLASSES)
+from .commands import CommandQueue
+from .prompt import ObjectPrompt
 
 
 class Engine():
-    def __init__(self) -> None:
+    def __init__(self, headless: bool=False,
+                 physics_process: bool=False) -> None:
         '''
         Constructor for Engine class
 
-        Parameters: None
+        Parameters:
+            - headless: a boolean defaulting to False. When True the engine
+                renders offscreen without a display or live input. Call
+                headless.select_platform() before importing this module.
+            - physics_process: a boolean defaulting to False. When True the
+                dynamic bodies are simulated in a worker process, on their
+                own clock, instead of in the fixed ticks of the game loop.
 
         Returns: None
         '''
-        pygame.init()
-        display = (800, 600)
-        pygame.display.set_mode(display, DOUBLEBUF|OPENGL)
+        self.headless = headless
+
+        # The window and its GL context are created by run(), once the size
+        # is known. Window sets up the depth test.
         self.window = None
 
-        # This is where you enable depth testing
-        glEnable(GL_DEPTH_TEST)
-        glDepthFunc(GL_LESS)
+        # Rendered frames kept by a headless run
+        self.frames = []
+
+        # Initialize the camera position and angles. The Camera caches its
+        # direction vectors and matrices between changes.
+        self.camera = Camera(position=(0.0, 0.0, 5.0), yaw=-90.0, pitch=0.0)
+        self.camera_pos = self.camera.position
+
+        # Camera position at the previous simulation tick. The position
+        # interpolated between the two is the one the Camera renders from.
+        self.previous_camera_pos = self.camera_pos
 
-        # Initialize camera position, front direction, and up direction
-        self.camera_pos = (0.0, 0.0, 5.0)
-        self.camera_front = (0.0, 0.0, -1.0)
-        self.camera_up = (0.0, 1.0, 0.0)
+        # View frustum, rebuilt when the camera matrix changes
+        self.frustum = None
+        self.frustum_version = -1
 
-        # Initialize camera angles and mouse position
-        self.yaw = -90.0
-        self.pitch = 0.0
+        # Initialize mouse position
         self.lastX = 400
         self.lastY = 300
         self.first_mouse = True
 
-        # Hide the mouse cursor
-        pygame.mouse.set_visible(False)
-        
+        # Keys held during the current frame, and the optional recorder and
+        # replayer of the per-frame input stream
+        self.keys = KeyState()
+        self.recorder = None
+        self.replay = None
+
+        # Simulation and input run at a fixed tick rate, independent of how
+        # fast frames are rendered
+        self.timestep = FixedTimestep(tick_rate=120.0)
+
+        # Live frames are paced to a target rate, and throttled while the
+        # window is in the background or nothing happens. Set vsync before
+        # run() to ask for swaps synced to the display.
+        self.pacer = FramePacer(target_fps=60.0)
+        self.vsync = False
+
         # Initialize physics
         self.room_size = (50, 10, 50)
-        self.physics = Physics(self.room_size)
+        self.physics = Physics(self.room_size, worker=physics_process,
+                               tick_rate=self.timestep.tick_rate)
+
+        # Room geometry, kept in a GPU buffer between frames
+        self.room = Room(self.room_size)
+
+        # Camera movement speed in units per second
+        self.camera_speed = 5.0
+
+        # Radius of the camera's collision sphere
+        self.camera_radius = 0.25
+
+        # Let the camera fall and walk on the floor. Set to False to fly.
+        self.gravity = True
+        self.camera_velocity = 0.0
+        self.on_ground = False
+        self.jump_speed = 4.0
         
-        # Initialize objects
-        self.objects = []
+        # Initialize objects. The store keeps their colors, positions and
+        # sizes in arrays and can be used like a list of the shapes.
+        self.objects = SceneStore()
+
+        # Nodes with local transforms for building compound objects out of
+        # shapes. Moved nodes place their shapes once per frame.
+        self.graph = SceneGraph()
+
+        # Optional world streamed in chunks around the camera, replacing
+        # the single room (see stream_world)
+        self.world = None
+
+        # Draw objects of the same type with one instanced draw call. Set to
+        # False to draw every object with its own draw call instead.
+        self.instanced = True
+        self.renderer = InstancedRenderer()
+
+        # Shapes moved by the physics are handed to the renderer in bulk
+        self.physics.add_listener(self.renderer.move_rows)
+
+        # Draws collected during the frame and submitted sorted by GL state,
+        # color and distance
+        self.render_queue = RenderQueue()
+
+        # Skip objects that are fully outside the view frustum, and count how
+        # many were drawn and culled in the last frame
+        self.frustum_culling = True
+        self.objects_drawn = 0
+        self.objects_culled = 0
+
+        # Draw distant shapes with coarser geometry (see Shape.lod_thresholds)
+        self.lod = True
+
+        # Work queued by other threads, run at the start of every frame. The
+        # object prompt (Ctrl+O) runs on its own thread and queues the
+        # objects it creates for the next frame's input.
+        self.commands = CommandQueue()
+        self.prompt = ObjectPrompt(self.__queue_spawn)
+        self.pending_spawns = []
+
+        # Per-phase frame timings. F3 toggles the overlay, F4 starts and
+        # stops a Chrome trace capture.
+        self.profiler = FrameProfiler()
+        self.overlay = ProfilerOverlay()
+        self.show_profiler = False
+
+    @property
+    def camera_front(self) -> tuple:
+        return self.camera.front
+
+    @property
+    def camera_up(self) -> tuple:
+        return self.camera.up
+
+    @property
+    def yaw(self) -> float:
+        return self.camera.yaw
+
+    @yaw.setter
+    def yaw(self, yaw: float) -> None:
+        self.camera.yaw = yaw
+
+    @property
+    def pitch(self) -> float:
+        return self.camera.pitch
+
+    @pitch.setter
+    def pitch(self, pitch: float) -> None:
+        self.camera.pitch = pitch
+
+    @property
+    def render_camera_pos(self) -> tuple:
+        return self.camera.position
+
+    @render_camera_pos.setter
+    def render_camera_pos(self, position: tuple) -> None:
+        self.camera.position = position
 
     def run(self, width: int=800, height: int=600, 
-            caption: str="New Pygame Application") -> None:
+            caption: str="New Pygame Application", frames: int=None,
+            camera_path=None, keep_frames: bool=False, record: str=None,
+            replay: str=None) -> None:
         '''
         Runs the engine.
 
@@ -77,67 +214,425 @@ class Engine():
                 height
             - caption: a string with the default value of 'New Pygame
                 Application', holds the title of the window
+            - frames: the integer number of frames to render before
+                returning. Live runs go on until the game is closed if None;
+                headless runs need a count.
+            - camera_path: headless only, either a list of (position, yaw,
+                pitch) tuples that is looped over, or a function taking the
+                frame number and returning one. The camera stays put if None.
+            - keep_frames: headless only, a boolean. When True every frame is
+                kept in self.frames, otherwise only the last one is.
+            - record: optional string path to record the input stream to
+            - replay: optional string path of a recording to play back
+                instead of live input. The engine exits when it ends.
 
         Returns: None
         '''
+        if record is not None:
+            self.start_recording(record)
+        if replay is not None:
+            self.load_replay(replay)
+
+        if self.headless:
+            self.run_headless(frames, camera_path, width, height, keep_frames)
+            self.stop_recording()
+            return
+
         # Create a window
-        self.window = Window(width=width, height=height, caption=caption)
-        
+        self.window = Window(width=width, height=height, caption=caption,
+                             vsync=self.vsync)
+        self.camera.aspect = width / height
+
+        # Hide the mouse cursor
+        pygame.mouse.set_visible(False)
+
         # Set the mouse position to the center of the window
         pygame.mouse.set_pos((self.lastX, self.lastY))
 
         # Lock the mouse to the window
         pygame.event.set_grab(True)
 
-        # Set the camera position to the center of the room
-        room_width, room_height, room_length = self.room_size
-        
         # Main game loop
-        while True:
-            
-            # Clear buffers
-            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        profiler = self.profiler
+        pacer = self.pacer
+        last_time = time.perf_counter()
+        last_camera = None
+        rendered = 0
+        while frames is None or rendered < frames:
+            profiler.begin_frame()
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.close_game()
-                if event.type == pygame.KEYDOWN:
-                    # Check if ESC key is pressed
-                    if event.key == pygame.K_ESCAPE:
-                        # Call close_game to exit
+            # Time since the last frame
+            now = time.perf_counter()
+            frame_time = now - last_time
+            last_time = now
+
+            # Read this frame's input, from the user or the recording
+            with profiler.phase('events'):
+                self.commands.drain()
+                frame = self.poll_input(frame_time)
+                if self.replay is not None:
+                    frame = self.replay.next_frame()
+                    if frame is None:
                         self.close_game()
-                    if ((event.key == pygame.K_o)
-                        and (event.mod & pygame.KMOD_CTRL)):
-                        self.create_object()
-
-                # Check for mouse movement
-                if event.type == pygame.MOUSEMOTION:
-                    self.handle_mouse_movement(*event.rel)
-             
-            # Handle keyboard input
-            self.handle_keyboard_inp()
-            
-            # Enable depth testing
-            glEnable(GL_DEPTH_TEST)
-            glDepthFunc(GL_LESS)
-            
-            # Disable depth mask and backface culling
-            glDepthMask(GL_FALSE)
-            glDisable(GL_CULL_FACE)
-            
-            # Draw the room
-            self.draw_room(room_width, room_height, room_length)
-            
-            # Draw the objects
-            for obj in self.objects:
-                obj.draw()
-            
-            # Re-enable depth mask and backface culling
-            glDepthMask(GL_TRUE)
-            glEnable(GL_CULL_FACE)
-            
+                self.apply_input(frame)
+
+            # Run as many fixed simulation ticks as the elapsed time allows
+            moved = self.simulate(frame.frame_time)
+
+            # Draw the room and objects
+            self.render_frame()
+
             # Update the display
-            pygame.display.flip()
+            with profiler.phase('flip'):
+                self.window.flip()
+
+            # Wait for the next frame's turn. Input, spawns, a moving camera
+            # or moving shapes keep the full frame rate.
+            camera = (self.render_camera_pos, self.yaw, self.pitch)
+            active = (frame.keys.bits or frame.mouse != (0, 0)
+                      or bool(frame.spawns) or moved or camera != last_camera)
+            last_camera = camera
+            with profiler.phase('pace'):
+                jitter = pacer.wait(active, self.window.focused(),
+                                    pygame.event.peek)
+            if jitter is not None:
+                profiler.sample('jitter', jitter)
+
+            profiler.end_frame()
+            rendered += 1
+
+    def run_headless(self, frames: int, camera_path=None, width: int=800,
+                     height: int=600, keep_frames: bool=False) -> tuple:
+        '''
+        Renders a fixed number of frames offscreen, with the camera following
+        a scripted path instead of live input. Every frame advances the
+        simulation by one fixed tick, so runs are repeatable.
+
+        Parameters:
+            - frames: the integer number of frames to render
+            - camera_path: a list of (position, yaw, pitch) tuples that is
+                looped over, or a function taking the frame number and
+                returning one. The camera stays put if None.
+            - width: an integer, the framebuffer width
+            - height: an integer, the framebuffer height
+            - keep_frames: a boolean. When True every frame is kept in
+                self.frames, otherwise only the last one is.
+
+        Returns:
+            - a tuple of the float number of seconds it took and the integer
+                number of frames rendered, fewer than frames if a replay
+                ran out
+        '''
+        # A loaded replay drives the input and sets the default length
+        if frames is None and self.replay is not None:
+            frames = len(self.replay) - self.replay.position
+        if frames is None:
+            raise ValueError('A headless run needs a frame count')
+
+        if self.window is None:
+            self.window = Window(width=width, height=height, headless=True)
+        self.camera.aspect = self.window.width / self.window.height
+
+        self.frames = []
+        rendered = 0
+        start = time.perf_counter()
+        for frame in range(frames):
+            if camera_path is not None:
+                if callable(camera_path):
+                    position, yaw, pitch = camera_path(frame)
+                else:
+                    position, yaw, pitch = camera_path[frame % len(camera_path)]
+                self.set_camera(position, yaw, pitch)
+
+            frame_time = self.timestep.dt
+            if self.replay is not None:
+                recorded = self.replay.next_frame()
+                if recorded is None:
+                    break
+                self.apply_input(recorded)
+                frame_time = recorded.frame_time
+
+            self.profiler.begin_frame()
+            self.commands.drain()
+            self.simulate(frame_time)
+            self.render_frame()
+            with self.profiler.phase('flip'):
+                self.window.flip()
+            self.profiler.end_frame()
+
+            pixels = self.window.read_pixels()
+            if keep_frames:
+                self.frames.append(pixels)
+            else:
+                self.frames = [pixels]
+            rendered += 1
+
+        return time.perf_counter() - start, rendered
+
+    def poll_input(self, frame_time: float) -> InputFrame:
+        '''
+        Reads the live events and keyboard for one frame. Quitting is handled
+        here; everything else is returned so it can be recorded and applied.
+
+        Parameters:
+            - frame_time: a float, seconds since the previous frame
+
+        Returns:
+            - the InputFrame for this frame
+        '''
+        mouse_x, mouse_y = 0, 0
+
+        # Objects finished in the prompt since the last frame
+        spawns = self.pending_spawns
+        self.pending_spawns = []
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.close_game()
+            if event.type == pygame.KEYDOWN:
+                # Check if ESC key is pressed
+                if event.key == pygame.K_ESCAPE:
+                    # Call close_game to exit
+                    self.close_game()
+                if ((event.key == pygame.K_o)
+                    and (event.mod & pygame.KMOD_CTRL)):
+                    self.create_object()
+
+                # Profiler overlay and trace capture
+                if event.key == pygame.K_F3:
+                    self.show_profiler = not self.show_profiler
+                if event.key == pygame.K_F4:
+                    self.toggle_trace_capture()
+
+            # Sum up the mouse movement
+            if event.type == pygame.MOUSEMOTION:
+                mouse_x += event.rel[0]
+                mouse_y += event.rel[1]
+
+        return InputFrame(frame_time, KeyState.from_pygame(),
+                          (mouse_x, mouse_y), spawns)
+
+    def apply_input(self, frame: InputFrame) -> None:
+        '''
+        Applies one frame of input, recording it first if a recording is
+        running
+
+        Parameters:
+            - frame: the InputFrame to apply
+
+        Returns: None
+        '''
+        if self.recorder is not None:
+            self.recorder.record(frame)
+
+        self.keys = frame.keys
+        if frame.mouse != (0, 0):
+            self.handle_mouse_movement(*frame.mouse)
+        for shape_type, size, color in frame.spawns:
+            self.spawn_object(shape_type, size, color)
+
+    def start_recording(self, path: str) -> None:
+        '''
+        Starts writing every frame's input to a file
+
+        Parameters:
+            - path: a string, the file to write
+
+        Returns: None
+        '''
+        self.stop_recording()
+        self.recorder = InputRecorder(path, self.timestep.tick_rate)
+
+    def stop_recording(self) -> None:
+        '''
+        Finishes the current recording, if any
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def load_replay(self, path: str) -> None:
+        '''
+        Plays back a recorded input stream instead of live input. The tick
+        rate is switched to the recording's so the simulation repeats
+        exactly.
+
+        Parameters:
+            - path: a string, the recording to play
+
+        Returns: None
+        '''
+        self.replay = InputReplayer(path)
+        self.timestep.tick_rate = self.replay.tick_rate
+
+    def toggle_trace_capture(self) -> None:
+        '''
+        Starts a profiler trace capture, or stops the running one and writes
+        it to trace-<time>.json in the working directory
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if not self.profiler.capturing:
+            self.profiler.start_capture()
+            print("Trace capture started")
+            return
+
+        self.profiler.stop_capture()
+        path = time.strftime('trace-%Y%m%d-%H%M%S.json')
+        self.profiler.export_chrome_trace(path)
+        print(f"Trace written to {path}")
+
+    def render_frame(self) -> None:
+        '''
+        Draws one frame: the room, then every visible object
+
+        Parameters: None
+
+        Returns: None
+        '''
+        room_width, room_height, room_length = self.room_size
+
+        # Clear buffers
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+
+        # Enable depth testing. The state tracker skips the calls that
+        # don't change anything since the last frame.
+        state.enable(GL_DEPTH_TEST)
+        state.set_depth_func(GL_LESS)
+        
+        # Disable backface culling. The render queue sets the depth mask per
+        # draw: the room doesn't write depth, the objects do.
+        state.disable(GL_CULL_FACE)
+        
+        # Draw the room. It is on the background layer, so flushing it
+        # on its own keeps the draw order and lets the phase time the draw
+        # rather than the queueing.
+        with self.profiler.phase('draw_room'):
+            rooms = self.draw_room(room_width, room_height, room_length)
+            self.render_queue.flush()
+        self.profiler.count_draw(len(rooms),
+                                 sum(len(room.vertices) for room in rooms))
+        
+        # Queue the objects and draw everything in the queue
+        with self.profiler.phase('draw_objects'):
+            self.draw_objects()
+        
+        # Re-enable depth mask and backface culling
+        state.set_depth_mask(True)
+        state.enable(GL_CULL_FACE)
+
+        # Draw the profiler overlay on top
+        if self.show_profiler:
+            with self.profiler.phase('overlay'):
+                self.overlay.draw(self.profiler, self.window.height)
+
+    def draw_objects(self) -> None:
+        '''
+        Queues every object that is at least partly inside the view frustum,
+        then draws the queue: grouped by pipeline state and color, nearest
+        first within a group
+
+        Parameters: None
+
+        Returns: None
+        '''
+        frustum = self.view_frustum() if self.frustum_culling else None
+        queue = self.render_queue
+        camera = self.render_camera_pos
+
+        # Levels of detail are picked by distance from the rendered camera
+        eye = camera if self.lod else None
+        Shape.lod_eye = eye
+
+        instanced = self.instanced and not Shape.immediate_mode
+        if instanced:
+            # The instanced groups are a single queue entry; shapes without
+            # shared geometry are queued one by one like in the loop below
+            renderer = self.renderer
+            queue.push(lambda: renderer.draw(frustum, eye, loose=False),
+                       'instanced')
+            shapes = renderer.visible_loose(frustum)
+        else:
+            shapes = self.objects.visible(frustum)
+
+        for obj in shapes:
+            queue.push(obj.draw, obj.pipeline(), obj.color, obj.position,
+                       camera)
+        queue.flush()
+
+        # Levels of detail are known once the shapes have been drawn
+        drawn = len(shapes)
+        vertices = sum(obj.vertex_count() for obj in shapes)
+        if instanced:
+            self.profiler.count_draw(self.renderer.draw_calls,
+                                     self.renderer.vertices)
+            drawn += self.renderer.drawn
+        self.objects_drawn = drawn
+        self.objects_culled = len(self.objects) - drawn
+        self.profiler.count_draw(len(shapes), vertices)
+
+    def view_frustum(self) -> Frustum:
+        '''
+        Returns the view frustum for the camera, built from the same matrices
+        that draw_room and the window load into OpenGL. It is only rebuilt
+        when the camera matrix changed.
+
+        Parameters: None
+
+        Returns:
+            - the current Frustum
+        '''
+        matrix = self.camera.matrix
+        if self.frustum_version != self.camera.version:
+            self.frustum = Frustum(self.window.projection @ matrix)
+            self.frustum_version = self.camera.version
+        return self.frustum
+
+    def simulate(self, frame_time: float) -> int:
+        '''
+        Advances keyboard movement and physics by whole fixed ticks, then
+        interpolates the rendered state between the last two ticks
+
+        Parameters:
+            - frame_time: a float, seconds since the previous frame
+
+        Returns:
+            - the integer number of shapes the physics moved
+        '''
+        dt = self.timestep.dt
+        keyboard = self.profiler.phase('keyboard')
+        physics = self.profiler.phase('physics')
+        for _ in range(self.timestep.advance(frame_time)):
+            self.previous_camera_pos = self.camera_pos
+
+            # Handle keyboard input
+            with keyboard:
+                self.handle_keyboard_inp(dt)
+
+            # Step the physics simulation
+            with physics:
+                self.step_physics(dt)
+
+        # Load, activate and evict world chunks around the camera
+        if self.world is not None:
+            with self.profiler.phase('streaming'):
+                self.world.update(self, self.camera_pos)
+
+        # Place the shapes of scene graph nodes that changed
+        self.graph.update()
+
+        alpha = self.timestep.alpha
+        self.render_camera_pos = tuple(
+            prev + (curr - prev) * alpha
+            for prev, curr in zip(self.previous_camera_pos, self.camera_pos)
+        )
+        return self.physics.sync(alpha)
 
     def close_game(self) -> None:
         '''
@@ -147,44 +642,53 @@ class Engine():
 
         Returns: None
         '''
+        self.stop_recording()
+        self.prompt.close()
+        self.physics.close()
+        if self.world is not None:
+            self.world.close()
         pygame.quit()
         exit()
 
-    def handle_keyboard_inp(self) -> None:
+    def handle_keyboard_inp(self, dt: float) -> None:
         '''
         Handles certain input from the keyboard -> WASD for movement
 
-        Parameters: None
+        Parameters:
+            - dt: a float, the length of the simulation tick in seconds
 
         Returns: None
         '''
-        # Get the keys that are currently pressed
-        keys = pygame.key.get_pressed()
+        # Get the keys held down this frame
+        keys = self.keys
         
-        # Set the camera speed
-        camera_speed = 0.005
+        # Distance to move this tick
+        camera_speed = self.camera_speed * dt
 
         # Copy of the camera position for testing potential movement
         new_pos = list(self.camera_pos)
 
+        # Walk along the floor when gravity is on, otherwise fly where the
+        # camera is looking
+        front = self.camera.front
+        if self.gravity:
+            front = self.camera.ground_front
+
+            # Jump if standing on something
+            if keys[pygame.K_SPACE] and self.on_ground:
+                self.camera_velocity = self.jump_speed
+                self.on_ground = False
+
         # Calculate potential new position based on input
         if keys[pygame.K_w]:
             for i in range(3):
-                new_pos[i] += self.camera_front[i] * camera_speed
+                new_pos[i] += front[i] * camera_speed
         if keys[pygame.K_s]:
             for i in range(3):
-                new_pos[i] -= self.camera_front[i] * camera_speed
+                new_pos[i] -= front[i] * camera_speed
         if keys[pygame.K_a] or keys[pygame.K_d]:
-            # Calculate right vector
-            cross_product = (
-                self.camera_front[1] * self.camera_up[2] - self.camera_front[2] * self.camera_up[1],
-                self.camera_front[2] * self.camera_up[0] - self.camera_front[0] * self.camera_up[2],
-                self.camera_front[0] * self.camera_up[1] - self.camera_front[1] * self.camera_up[0]
-            )
-
-            # Normalize the right vector
-            norm = math.sqrt(sum(i * i for i in cross_product))
-            right = tuple(i / norm for i in cross_product)
+            # Right vector, cached by the camera until it turns
+            right = self.camera.right
 
             # Apply movement
             if keys[pygame.K_a]:
@@ -195,9 +699,26 @@ class Engine():
                     new_pos[i] += right[i] * camera_speed
 
         # Check for collision with the new position before applying
-        if not self.physics.check_collision(new_pos):
+        if not self.physics.check_collision(new_pos, self.camera_radius):
             self.camera_pos = tuple(new_pos)
 
+    def step_physics(self, dt: float) -> None:
+        '''
+        Advances the physics simulation, including the camera's fall when
+        gravity is on
+
+        Parameters:
+            - dt: a float, the time step in seconds
+
+        Returns: None
+        '''
+        self.physics.step(dt)
+
+        if self.gravity:
+            self.camera_pos, self.camera_velocity, self.on_ground = (
+                self.physics.step_camera(self.camera_pos, self.camera_velocity,
+                                         dt, self.camera_radius))
+
     def handle_mouse_movement(self, xoffset: float, yoffset: float,
                               sensitivity: float = 0.05) -> None:
         '''
@@ -217,32 +738,31 @@ class Engine():
             self.lastX, self.lastY = pygame.mouse.get_pos()
             self.first_mouse = False
 
-        # Calculate the offset of the mouse position
-        xoffset *= sensitivity
-        yoffset *= sensitivity * -1
-
-        # Update the last position
-        self.yaw += xoffset
-        self.pitch += yoffset
-
-        # Constrain the pitch
-        if self.pitch > 89.0:
-            self.pitch = 89.0
-        elif self.pitch < -89.0:
-            self.pitch = -89.0
-
-        # Update the camera front direction
-        direction = (
-            math.cos(math.radians(self.yaw)) * math.cos(math.radians(self.pitch)),
-            math.sin(math.radians(self.pitch)),
-            math.sin(math.radians(self.yaw)) * math.cos(math.radians(self.pitch))
-        )
+        # Turn the camera; the pitch is constrained by the camera. The
+        # direction is recomputed once, when it is next used.
+        self.camera.rotate(xoffset, yoffset, sensitivity)
+
+    def set_camera(self, position: tuple, yaw: float, pitch: float) -> None:
+        '''
+        Moves the camera directly, without interpolation, e.g. for scripted
+        camera paths
+
+        Parameters:
+            - position: a tuple of three floats, the new camera position
+            - yaw: a float, the new yaw in degrees
+            - pitch: a float, the new pitch in degrees
 
-        # Normalize the direction
-        norm = math.sqrt(sum(i * i for i in direction))
-        self.camera_front = tuple(i / norm for i in direction)
+        Returns: None
+        '''
+        self.camera_pos = tuple(position)
+        self.previous_camera_pos = self.camera_pos
+        self.render_camera_pos = self.camera_pos
+        self.camera_velocity = 0.0
+        self.yaw = yaw
+        self.pitch = pitch
 
-    def draw_room(self, width: float, height: float, length: float) -> None:
+    def draw_room(self, width: float, height: float,
+                  length: float) -> list:
         '''
         Draws a room on the screen
 
@@ -251,111 +771,330 @@ class Engine():
         - height: float, the height of the room
         - length: float, the length of the room
 
-        Returns: None
+        Returns:
+        - the list of Rooms queued
         '''
 
-        # Clear the screen
-        glLoadIdentity()
-
-        # Set perspective
-        gluPerspective(45, (self.window.width / self.window.height), 0.1, 100.0)
-
-        # Set the camera position and direction
-        eye = tuple(self.camera_pos[i] + self.camera_front[i] for i in range(3))
-        gluLookAt(self.camera_pos[0], self.camera_pos[1], self.camera_pos[2],
-                  eye[0], eye[1], eye[2],
-                  self.camera_up[0], self.camera_up[1], self.camera_up[2])
-
-        # Draw the room
-        glBegin(GL_QUADS)
-
-        # Floor
-        glColor3f(0.5, 0.5, 0.5)
-        glVertex3f(-width/2, -height/2, -length/2)
-        glVertex3f(width/2, -height/2, -length/2)
-        glVertex3f(width/2, -height/2, length/2)
-        glVertex3f(-width/2, -height/2, length/2)
-
-        # Ceiling
-        glColor3f(0.5, 0.5, 0.5)
-        glVertex3f(-width/2, height/2, -length/2)
-        glVertex3f(width/2, height/2, -length/2)
-        glVertex3f(width/2, height/2, length/2)
-        glVertex3f(-width/2, height/2, length/2)
-
-        # Walls
-        glColor3f(0.5, 0.0, 0.0)
-        glVertex3f(-width/2, -height/2, -length/2)
-        glVertex3f(-width/2, height/2, -length/2)
-        glVertex3f(-width/2, height/2, length/2)
-        glVertex3f(-width/2, -height/2, length/2)
-
-        glColor3f(0.0, 0.5, 0.0)
-        glVertex3f(width/2, -height/2, -length/2)
-        glVertex3f(width/2, height/2, -length/2)
-        glVertex3f(width/2, height/2, length/2)
-        glVertex3f(width/2, -height/2, length/2)
-
-        glColor3f(0.0, 0.0, 0.5)
-        glVertex3f(-width/2, -height/2, -length/2)
-        glVertex3f(width/2, -height/2, -length/2)
-        glVertex3f(width/2, height/2, -length/2)
-        glVertex3f(-width/2, height/2, -length/2)
-
-        glColor3f(0.5, 0.5, 0.0)
-        glVertex3f(-width/2, -height/2, length/2)
-        glVertex3f(width/2, -height/2, length/2)
-        glVertex3f(width/2, height/2, length/2)
-        glVertex3f(-width/2, height/2, length/2)
-        glEnd()
+        # Set the perspective and camera, from the camera's cached matrix
+        self.camera.load()
+
+        # A streamed world draws the rooms of its active chunks in view
+        # instead, back to front
+        if self.world is not None:
+            eye = self.render_camera_pos
+            frustum = self.view_frustum() if self.frustum_culling else None
+            rooms = self.world.rooms(frustum)
+            for room in rooms:
+                self.render_queue.push(room.draw, 'room', center=room.origin,
+                                       eye=eye, layer=BACKGROUND,
+                                       depth_write=False)
+            return rooms
+
+        # Queue the room behind everything else, rebuilding its buffer only
+        # if the size changed
+        self.room.resize((width, height, length))
+        self.render_queue.push(self.room.draw, 'room', layer=BACKGROUND,
+                               depth_write=False)
+        return [self.room]
         
         
     def create_object(self) -> None:
         '''
-        Opens a Tkinter dialog to create a new object with user-defined
-        properties.
+        Opens the Tkinter prompt to create a new object with user-defined
+        properties. The game keeps running while it is open; the object
+        is created on the first frame after the prompt is finished.
 
         Parameters: None
 
         Returns: None
         '''
-        # initialize root window
-        root = tk.Tk()
+        self.prompt.open()
 
-        # We don't want a full GUI, so keep the root window from appearing
-        root.withdraw()
+    def __queue_spawn(self, spawn: tuple) -> None:
+        '''
+        Prompt callback, runs on the prompt thread. Hands the new object to
+        the main thread, where it becomes part of the next frame's input.
 
-        # Simple dialog to get the shape type
-        shape_type = simpledialog.askstring(
-            "Input", "Shape Type (Cube/Sphere/Pyramid):", parent=root
-        )
+        Parameters:
+            - spawn: a tuple of (shape type, size, color)
 
-        # Ask for size, color, and position
-        size = simpledialog.askfloat("Input", "Size:", parent=root)
-        color = simpledialog.askstring("Input", "Color (R,G,B):", parent=root)
-        # Calculate the position in front of the camera
-        position = (
-            self.camera_pos[0] + self.camera_front[0] * (size + 1),
-            self.camera_pos[1] + self.camera_front[1] * (size + 1),
-            self.camera_pos[2] + self.camera_front[2] * (size + 1)
-        )
+        Returns: None
+        '''
+        self.commands.put(self.pending_spawns.append, spawn)
 
-        # Process color and position inputs
-        color = tuple(map(float, color.split(',')))
+    def spawn_object(self, shape_type: str, size: float,
+                     color: tuple) -> Shape:
+        '''
+        Creates a new object in front of the camera
 
+        Parameters:
+            - shape_type: a string, 'cube', 'sphere' or 'pyramid'
+            - size: a float, the side length, radius or base
+            - color: a tuple of three floats, the color
+
+        Returns:
+            - the new shape
+        '''
         # Create the object based on the shape type
-        if shape_type.lower() == 'cube':
-            new_object = Cube(size, color, position)
-        elif shape_type.lower() == 'sphere':
-            new_object = Sphere(size, color, position)
-        elif shape_type.lower() == 'pyramid':
-            new_object = Pyramid(size, color, position)
+        if shape_type == 'cube':
+            new_object = Cube(size, color)
+        elif shape_type == 'sphere':
+            new_object = Sphere(size, color)
         else:
-            print("Unknown shape type.")
-            return
+            new_object = Pyramid(size, color)
+
+        # Place it in front of the camera, pulled back towards the camera if
+        # that would push it into the first surface the camera looks at
+        new_object.position = self.placement(new_object, size + 1)
 
-        self.objects.append(new_object)
+        self.add_object(new_object, dynamic=self.gravity)
         print(f"New {shape_type} created!")
+        return new_object
+
+    def pick_object(self, max_distance: float=math.inf) -> tuple:
+        '''
+        Finds the object the camera is looking at
+
+        Parameters:
+            - max_distance: a float, how far to look
+
+        Returns:
+            - a tuple of (shape, distance), or None if the camera isn't
+                looking at an object
+        '''
+        return self.physics.raycast(self.camera_pos, self.camera_front,
+                                    max_distance)
+
+    def placement(self, obj: Shape, distance: float) -> tuple:
+        '''
+        Finds where to put a new shape in front of the camera: at the given
+        distance, or closer if the shape would reach past the first surface
+        along the camera's line of sight
+
+        Parameters:
+            - obj: the shape to place, at the origin
+            - distance: a float, how far in front of the camera to put it
+
+        Returns:
+            - a tuple of three floats, the position for the shape
+        '''
+        front = self.camera_front
+
+        # The shape's bounds are centered off its position (e.g. a pyramid
+        # stands on its base), so measure from the center of its bounds
+        center, radius = obj.bounding_sphere()
+        ahead = sum(center[i] * front[i] for i in range(3))
+
+        hit = self.pick_object(distance + ahead + radius)
+        if hit is not None:
+            distance = max(0.0, min(distance, hit[1] - ahead - radius))
+
+        return tuple(self.camera_pos[i] + front[i] * distance
+                     for i in range(3))
+
+    def spawn_many(self, types, sizes, colors, positions,
+                   dynamic: bool=False) -> list:
+        '''
+        Creates a batch of objects from arrays in one call. The renderer and
+        physics take the whole batch at once instead of one object at a
+        time.
+
+        Parameters:
+            - types: n shape type names ('cube', 'sphere', 'pyramid') or
+                indices into SHAPE_TYPES
+            - sizes: n floats, the side lengths, radii or bases
+            - colors: (n, 3) array of colors
+            - positions: (n, 3) array of positions
+            - dynamic: a boolean, True if the objects should fall under
+                gravity
+
+        Returns:
+            - the list of new shapes
+        '''
+        shapes = self.__create_shapes(types, sizes, colors, positions)
+        self.physics.add_bodies(shapes, dynamic)
+        return shapes
+
+    def __create_shapes(self, types, sizes, colors, positions) -> list:
+        '''
+        Creates a batch of shapes from arrays in the scene store and the
+        renderer, but not the physics
+
+        Parameters:
+            - types: as in spawn_many
+            - sizes: n floats, the side lengths, radii or bases
+            - colors: (n, 3) array of colors
+            - positions: (n, 3) array of positions
+
+        Returns:
+            - the list of new shapes
+        '''
+        types = np.asarray(types)
+        if types.dtype.kind in 'US':
+            types = np.array([SHAPE_TYPES.index(name.lower())
+                              for name in types.tolist()], dtype=np.uint8)
+        sizes = np.asarray(sizes, dtype=np.float32)
+        colors = np.asarray(colors, dtype=np.float32).reshape(-1, 3)
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+
+        # the rows go straight into the scene store, and the shapes are
+        # made as views of them
+        dimensions = np.zeros((len(types), 2))
+        for code in np.unique(types).tolist():
+            mask = types == code
+            dimensions[mask] = SHAPE_CLASSES[code].size_dimensions(
+                sizes[mask])
+        shapes = self.objects.create(SHAPE_CLASSES, types, dimensions,
+                                     colors, positions)
+
+        # the instance data is the arrays we already have
+        data = np.column_stack((positions, sizes, colors))
+
+        self.renderer.add_many(shapes, data)
+        return shapes
+
+    def stream_world(self, world: ChunkedWorld) -> None:
+        '''
+        Replaces the single room with a world streamed in chunks around the
+        camera. The camera's chunk is loaded right away; the rest load in
+        the background. Dynamic bodies bounce off the floor and ceiling of
+        the chunks and off the sides of the ones not loaded.
+
+        Parameters:
+            - world: the ChunkedWorld to stream
+
+        Returns: None
+        '''
+        if self.world is not None:
+            self.world.clear(self)
+            self.world.close()
+        self.world = world
+        self.physics.world = world
+        world.prime(self, self.camera_pos)
+
+    def add_chunk(self, coord: tuple, low: tuple, high: tuple, types, sizes,
+                  colors, positions) -> list:
+        '''
+        Adds the shapes of a world chunk. They are drawn like any other
+        object but collide through a physics region of their own, so the
+        chunk can be dropped in one go.
+
+        Parameters:
+            - coord: the chunk's grid coordinate, names the region
+            - low, high: corners of the chunk
+            - types, sizes, colors, positions: the shapes, as in spawn_many
+
+        Returns:
+            - the list of new shapes
+        '''
+        shapes = self.__create_shapes(types, sizes, colors, positions)
+        self.physics.add_region(coord, low, high, shapes)
+        return shapes
+
+    def remove_chunk(self, coord: tuple, shapes: list) -> None:
+        '''
+        Removes the shapes of a world chunk and its physics region
+
+        Parameters:
+            - coord: the chunk's grid coordinate
+            - shapes: the chunk's shapes
+
+        Returns: None
+        '''
+        if coord in self.physics.regions:
+            self.physics.remove_region(coord)
+        for shape in shapes:
+            if shape in self.objects:
+                self.objects.remove(shape)
+                self.renderer.remove(shape)
+
+    def add_object(self, obj: Shape, dynamic: bool=False,
+                   mass: float=1.0) -> None:
+        '''
+        Adds a shape to the scene
+
+        Parameters:
+            - obj: the shape to add
+            - dynamic: a boolean, True if the shape should fall under gravity
+            - mass: a float, the shape's mass if it is dynamic
+
+        Returns: None
+        '''
+        self.objects.append(obj)
+        self.renderer.add(obj)
+        if dynamic:
+            self.physics.add_dynamic_body(obj, mass)
+        else:
+            self.physics.add_body(obj)
+
+    def remove_object(self, obj: Shape) -> None:
+        '''
+        Removes a shape from the scene
+
+        Parameters:
+            - obj: the shape to remove
+
+        Returns: None
+        '''
+        self.objects.remove(obj)
+        self.renderer.remove(obj)
+        self.physics.remove_body(obj)
+
+    def clear_objects(self) -> None:
+        '''
+        Removes every shape from the scene at once
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.world is not None:
+            self.world.clear(self)
+        self.physics.clear()
+        self.renderer.clear()
+        self.objects.clear()
+        self.graph = SceneGraph()
+
+    def save_scene(self, path: str) -> None:
+        '''
+        Writes the room size, camera and every shape to a scene file
+
+        Parameters:
+            - path: a string, the file to write
+
+        Returns: None
+        '''
+        columns = shape_columns(self.objects, self.physics.bodies.shapes)
+        save_scene(path, self.room_size,
+                   (self.camera_pos, self.yaw, self.pitch), *columns)
+
+    def load_scene(self, path: str) -> SceneData:
+        '''
+        Replaces the current scene with the one in a scene file. The file
+        is memory-mapped and its shapes are added with spawn_many.
+
+        Parameters:
+            - path: a string, the file to read
+
+        Returns:
+            - the SceneData, e.g. to inspect the shape table
+        '''
+        scene = SceneData(path)
+        self.clear_objects()
+
+        self.room_size = scene.room_size
+        self.physics.room_size = scene.room_size
+        self.physics.bodies.room_size = scene.room_size
+        self.set_camera(scene.camera_position, scene.yaw, scene.pitch)
+
+        # static and dynamic shapes go in as one batch each
+        dynamic = (scene.flags & FLAG_DYNAMIC) != 0
+        for mask, is_dynamic in ((~dynamic, False), (dynamic, True)):
+            if mask.any():
+                self.spawn_many(scene.types[mask], scene.sizes[mask],
+                                scene.colors[mask], scene.positions[mask],
+                                dynamic=is_dynamic)
+        return scene
 
 if __name__ == '__main__':
     assert False, 'This is a class file. Import its contents into another file.'
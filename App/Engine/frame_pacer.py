@@ -0,0 +1,243 @@
+################################################################################
+# File: frame_pacer.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the frame pacer. Holds the live game loop to a target frame
+# rate by sleeping most of the way to each frame's deadline and spinning the
+# last stretch, drops to a low rate while the window is in the background or
+# nothing is happening, and keeps rolling jitter statistics.
+#
+################################################################################
+
+# imports
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+# pacing modes
+ACTIVE, IDLE, BACKGROUND = 'active', 'idle', 'background'
+
+class FramePacer():
+    def __init__(self, target_fps: Optional[float]=60.0,
+                 idle_fps: float=15.0, background_fps: float=5.0,
+                 idle_after: float=2.0, max_spin: float=0.002,
+                 wake_interval: float=0.01, window: int=240) -> None:
+        '''
+        Constructor for FramePacer class
+
+        Parameters:
+            - target_fps: float frames per second while active, None or 0 to
+                run as fast as possible
+            - idle_fps: float frame rate once nothing has happened for
+                idle_after seconds
+            - background_fps: float frame rate while the window doesn't have
+                focus
+            - idle_after: float seconds without activity before idling
+            - max_spin: float, longest stretch in seconds spent spinning
+                instead of sleeping before a deadline
+            - wake_interval: float, how often in seconds a throttled wait
+                checks whether it should wake up early
+            - window: integer number of recent frames the statistics cover
+
+        Returns: None
+        '''
+        self.target_fps = target_fps
+        self.idle_fps = idle_fps
+        self.background_fps = background_fps
+        self.idle_after = idle_after
+        self.max_spin = max_spin
+        self.wake_interval = wake_interval
+
+        self.mode = ACTIVE
+        self.last_active = time.perf_counter()
+
+        # when the current frame is due, None until the first wait
+        self.deadline: Optional[float] = None
+        self.last_frame: Optional[float] = None
+
+        # seconds late per paced frame, seconds between frames and how far
+        # recent sleeps overshot what was asked for
+        self.jitter: Deque[float] = deque(maxlen=window)
+        self.intervals: Deque[float] = deque(maxlen=window)
+        self.overshoot: Deque[float] = deque(maxlen=32)
+
+        # frames that finished after their deadline
+        self.missed = 0
+
+    def frame_rate(self) -> Optional[float]:
+        '''
+        Frame rate for the current mode
+
+        Parameters: None
+
+        Returns:
+            - the float frames per second, None for no limit
+        '''
+        if self.mode == BACKGROUND:
+            return self.background_fps
+        if self.mode == IDLE:
+            return self.idle_fps
+        return self.target_fps or None
+
+    def spin_margin(self) -> float:
+        '''
+        How long before a deadline to stop sleeping and start spinning:
+        a little more than the worst recent sleep overshoot
+
+        Parameters: None
+
+        Returns:
+            - the float margin in seconds
+        '''
+        worst = max(self.overshoot, default=0.001)
+        return min(self.max_spin, worst + 0.0001)
+
+    def __update_mode(self, active: bool, focused: bool, now: float) -> None:
+        '''
+        Picks the pacing mode from the frame's activity and focus
+
+        Parameters:
+            - active: boolean, True if anything happened this frame
+            - focused: boolean, True if the window has focus
+            - now: float perf_counter time
+
+        Returns: None
+        '''
+        if active:
+            self.last_active = now
+        if not focused:
+            self.mode = BACKGROUND
+        elif now - self.last_active >= self.idle_after:
+            self.mode = IDLE
+        else:
+            self.mode = ACTIVE
+
+    def __sleep_until(self, deadline: float,
+                      wake: Optional[Callable[[], bool]]) -> Tuple[float, bool]:
+        '''
+        Waits until the deadline. Active frames sleep until just before it
+        and spin the rest; throttled frames sleep in short slices so that
+        wake() can end the wait early.
+
+        Parameters:
+            - deadline: float perf_counter time to wait for
+            - wake: optional function returning True to stop waiting
+
+        Returns:
+            - a tuple of the float time the wait ended and a boolean, True
+                if wake() ended it
+        '''
+        precise = self.mode == ACTIVE
+        while True:
+            now = time.perf_counter()
+            remaining = deadline - now
+            if remaining <= 0:
+                return now, False
+            if not precise and wake is not None and wake():
+                return now, True
+
+            if precise:
+                margin = self.spin_margin()
+                if remaining <= margin:
+                    while time.perf_counter() < deadline:
+                        time.sleep(0)
+                    return time.perf_counter(), False
+                request = remaining - margin
+            else:
+                request = min(remaining, self.wake_interval)
+
+            time.sleep(request)
+            self.overshoot.append(max(0.0, time.perf_counter() - now - request))
+
+    def wait(self, active: bool=True, focused: bool=True,
+             wake: Optional[Callable[[], bool]]=None) -> Optional[float]:
+        '''
+        Waits for the next frame's turn. Call once per frame, after the
+        frame has been shown.
+
+        Parameters:
+            - active: boolean, True if there was input or anything moved
+                this frame. Frames without activity for idle_after seconds
+                run at idle_fps.
+            - focused: boolean, False while the window is in the background
+            - wake: optional function returning True when a throttled wait
+                should end early, e.g. pygame.event.peek
+
+        Returns:
+            - the float seconds this frame was late waking up, or None if
+                it didn't wait (no limit, or the frame ran past its deadline)
+        '''
+        now = time.perf_counter()
+        self.__update_mode(active, focused, now)
+        fps = self.frame_rate()
+
+        jitter = None
+        if not fps:
+            self.deadline = None
+        else:
+            if self.deadline is None:
+                self.deadline = now
+            deadline = self.deadline + 1.0 / fps
+
+            if deadline <= now:
+                # the frame took too long: start the schedule again from
+                # here instead of rushing the next frames to catch up
+                self.missed += 1
+                self.deadline = now
+            else:
+                woke, early = self.__sleep_until(deadline, wake)
+                if early:
+                    self.deadline = woke
+                else:
+                    jitter = woke - deadline
+                    self.jitter.append(jitter)
+                    self.deadline = deadline
+
+        end = time.perf_counter()
+        if self.last_frame is not None:
+            self.intervals.append(end - self.last_frame)
+        self.last_frame = end
+        return jitter
+
+    def stats(self) -> Dict:
+        '''
+        Rolling pacing statistics over the recent frames
+
+        Parameters: None
+
+        Returns:
+            - a dictionary with the mode, the target and measured frame
+                rates, jitter percentiles in milliseconds, the frame time
+                standard deviation in milliseconds, missed deadlines and the
+                current spin margin in milliseconds
+        '''
+        jitter = sorted(self.jitter)
+        if jitter:
+            last = len(jitter) - 1
+            p50, p95, p99 = (jitter[min(last, int(fraction * len(jitter)))]
+                             * 1e3 for fraction in (0.50, 0.95, 0.99))
+        else:
+            p50 = p95 = p99 = 0.0
+
+        intervals = self.intervals
+        fps = deviation = 0.0
+        if intervals:
+            mean = sum(intervals) / len(intervals)
+            fps = 1.0 / mean if mean > 0 else 0.0
+            deviation = (sum((i - mean) ** 2 for i in intervals)
+                         / len(intervals)) ** 0.5 * 1e3
+
+        return {
+            'mode': self.mode,
+            'target_fps': self.frame_rate(),
+            'fps': fps,
+            'jitter_ms': {'p50': p50, 'p95': p95, 'p99': p99,
+                          'max': max(jitter, default=0.0) * 1e3},
+            'frame_time_stdev_ms': deviation,
+            'missed': self.missed,
+            'spin_ms': self.spin_margin() * 1e3
+        }
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
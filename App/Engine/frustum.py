@@ -0,0 +1,75 @@
+################################################################################
+# File: frustum.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the view frustum used to cull shapes before drawing
+#
+################################################################################
+
+# imports
+import numpy as np
+from typing import Sequence
+
+class Frustum():
+    def __init__(self, clip: np.ndarray) -> None:
+        '''
+        Constructor for Frustum class. Extracts the six clipping planes from a
+        combined projection * view matrix (Gribb/Hartmann method).
+
+        Parameters:
+            - clip: a 4x4 row-major matrix mapping world space to clip space
+
+        Returns: None
+        '''
+        clip = np.asarray(clip, dtype=np.float64)
+        planes = np.array([
+            clip[3] + clip[0],  # left
+            clip[3] - clip[0],  # right
+            clip[3] + clip[1],  # bottom
+            clip[3] - clip[1],  # top
+            clip[3] + clip[2],  # near
+            clip[3] - clip[2]   # far
+        ])
+
+        # normalize so plane distances are in world units
+        planes /= np.linalg.norm(planes[:, :3], axis=1)[:, None]
+
+        self.planes = planes
+        # plain tuples are faster than NumPy for one sphere at a time
+        self.plane_tuples = [tuple(plane) for plane in planes.tolist()]
+
+    def sphere_visible(self, center: Sequence[float], radius: float) -> bool:
+        '''
+        Tests whether a sphere is at least partly inside the frustum
+
+        Parameters:
+            - center: the sphere center
+            - radius: float, the sphere radius
+
+        Returns:
+            - False if the sphere is fully outside one of the planes
+        '''
+        x, y, z = center
+        for a, b, c, d in self.plane_tuples:
+            if a * x + b * y + c * z + d < -radius:
+                return False
+        return True
+
+    def spheres_visible(self, centers: np.ndarray,
+                        radii: np.ndarray) -> np.ndarray:
+        '''
+        Tests many spheres at once
+
+        Parameters:
+            - centers: (n, 3) array of sphere centers
+            - radii: (n,) array of radii, or a single float
+
+        Returns:
+            - a boolean (n,) array, True where the sphere is visible
+        '''
+        distances = centers @ self.planes[:, :3].T + self.planes[:, 3]
+        return np.all(distances >= -np.reshape(radii, (-1, 1)), axis=1)
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,124 @@
+################################################################################
+# File: geometry.py
+# Date: 18 October 2026
+# Description:
+#
+# Unit-sized vertex and index arrays for the built-in primitives. Each shape
+# scales these in its draw call, so one copy of the geometry is shared by every
+# instance of that shape type.
+#
+################################################################################
+
+# imports
+import math
+import numpy as np
+from OpenGL.GL import GL_POINTS
+from typing import Tuple
+
+def cube_geometry() -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Builds a cube with a side length of 1 centered on the origin
+
+    Parameters: None
+
+    Returns:
+        - a tuple of (vertices, indices), float32 (8, 3) and uint32 (36,)
+    '''
+    vertices = np.array([
+        (-0.5, -0.5, -0.5), (0.5, -0.5, -0.5), (0.5, 0.5, -0.5),
+        (-0.5, 0.5, -0.5), (-0.5, -0.5, 0.5), (0.5, -0.5, 0.5),
+        (0.5, 0.5, 0.5), (-0.5, 0.5, 0.5)
+    ], dtype=np.float32)
+
+    # two triangles per face: front, back, top, bottom, left, right
+    indices = np.array([
+        4, 5, 6, 4, 6, 7,
+        0, 2, 1, 0, 3, 2,
+        3, 7, 6, 3, 6, 2,
+        0, 1, 5, 0, 5, 4,
+        0, 4, 7, 0, 7, 3,
+        1, 2, 6, 1, 6, 5
+    ], dtype=np.uint32)
+
+    return vertices, indices
+
+def pyramid_geometry() -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Builds a square pyramid with a base of 1, matching the immediate mode
+    pyramid: the base spans -1..1 in x and y at z = 0 and the apex sits at
+    z = 1.5
+
+    Parameters: None
+
+    Returns:
+        - a tuple of (vertices, indices), float32 (5, 3) and uint32 (18,)
+    '''
+    vertices = np.array([
+        (-1.0, -1.0, 0.0), (1.0, -1.0, 0.0), (1.0, 1.0, 0.0),
+        (-1.0, 1.0, 0.0), (0.0, 0.0, 1.5)
+    ], dtype=np.float32)
+
+    indices = np.array([
+        # base
+        0, 2, 1, 0, 3, 2,
+        # sides
+        4, 0, 1,
+        4, 1, 2,
+        4, 2, 3,
+        4, 3, 0
+    ], dtype=np.uint32)
+
+    return vertices, indices
+
+def sphere_geometry(slices: int=32,
+                    stacks: int=32) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Builds a unit sphere with the same layout as gluSphere (z is the polar
+    axis)
+
+    Parameters:
+        - slices: integer number of subdivisions around the z axis
+        - stacks: integer number of subdivisions along the z axis
+
+    Returns:
+        - a tuple of (vertices, indices), float32 and uint32 arrays
+    '''
+    # polar angle goes from the +z pole to the -z pole
+    theta = np.linspace(0.0, math.pi, stacks + 1, dtype=np.float32)
+    phi = np.linspace(0.0, 2.0 * math.pi, slices + 1, dtype=np.float32)
+    theta, phi = np.meshgrid(theta, phi, indexing='ij')
+
+    vertices = np.stack((
+        np.sin(theta) * np.cos(phi),
+        np.sin(theta) * np.sin(phi),
+        np.cos(theta)
+    ), axis=-1).reshape(-1, 3).astype(np.float32)
+
+    # two triangles for every quad in the (stacks x slices) grid
+    row = np.arange(stacks, dtype=np.uint32)[:, None] * (slices + 1)
+    col = np.arange(slices, dtype=np.uint32)[None, :]
+    a = (row + col).ravel()
+    b = a + slices + 1
+    indices = np.stack((a, b, a + 1, a + 1, b, b + 1),
+                       axis=-1).ravel().astype(np.uint32)
+
+    return vertices, indices
+
+def point_geometry(center: Tuple[float, float, float]=(0.0, 0.0, 0.0)
+                   ) -> Tuple[np.ndarray, np.ndarray, int]:
+    '''
+    Builds a single point, used in place of a mesh for shapes so far away
+    they cover about a pixel
+
+    Parameters:
+        - center: where to put the point in the unit geometry's space
+
+    Returns:
+        - a tuple of (vertices, indices, GL_POINTS)
+    '''
+    vertices = np.array([center], dtype=np.float32)
+    indices = np.zeros(1, dtype=np.uint32)
+    return vertices, indices, GL_POINTS
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
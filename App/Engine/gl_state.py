@@ -0,0 +1,204 @@
+################################################################################
+# File: gl_state.py
+# Date: 18 October 2026
+# Description:
+#
+# Thin OpenGL state tracking layer. Rendering code changes state through the
+# shared `state` object, which remembers what is currently set and skips calls
+# that wouldn't change anything.
+#
+################################################################################
+
+# imports
+from OpenGL.GL import *
+from typing import Dict
+
+# marks state the tracker can't vouch for, so the next call always goes through
+UNKNOWN = object()
+
+class GLState():
+    def __init__(self) -> None:
+        '''
+        Constructor for GLState class
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.reset()
+
+    def reset(self) -> None:
+        '''
+        Forgets all tracked state. Call after creating a new context or
+        after code outside the tracker changed state.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.capabilities: Dict[int, bool] = {}
+        self.depth_func = UNKNOWN
+        self.depth_mask = UNKNOWN
+        self.color = UNKNOWN
+        self.program = UNKNOWN
+        self.vertex_array = UNKNOWN
+        self.buffers: Dict[int, object] = {}
+
+        # calls made and skipped since the last reset
+        self.calls = 0
+        self.skipped = 0
+
+    def __set(self, changed: bool) -> bool:
+        '''
+        Updates the call counters
+
+        Parameters:
+            - changed: boolean, whether the call has to go through
+
+        Returns:
+            - changed
+        '''
+        if changed:
+            self.calls += 1
+        else:
+            self.skipped += 1
+        return changed
+
+    def enable(self, capability: int) -> None:
+        '''
+        glEnable, skipped if the capability is already enabled
+
+        Parameters:
+            - capability: the GL capability, e.g. GL_DEPTH_TEST
+
+        Returns: None
+        '''
+        if self.__set(self.capabilities.get(capability) is not True):
+            glEnable(capability)
+            self.capabilities[capability] = True
+
+    def disable(self, capability: int) -> None:
+        '''
+        glDisable, skipped if the capability is already disabled
+
+        Parameters:
+            - capability: the GL capability, e.g. GL_CULL_FACE
+
+        Returns: None
+        '''
+        if self.__set(self.capabilities.get(capability) is not False):
+            glDisable(capability)
+            self.capabilities[capability] = False
+
+    def set_depth_func(self, func: int) -> None:
+        '''
+        glDepthFunc, skipped if unchanged
+
+        Parameters:
+            - func: the comparison, e.g. GL_LESS
+
+        Returns: None
+        '''
+        if self.__set(self.depth_func != func):
+            glDepthFunc(func)
+            self.depth_func = func
+
+    def set_depth_mask(self, flag: bool) -> None:
+        '''
+        glDepthMask, skipped if unchanged
+
+        Parameters:
+            - flag: boolean, whether depth writes are enabled
+
+        Returns: None
+        '''
+        flag = bool(flag)
+        if self.__set(self.depth_mask != flag):
+            glDepthMask(GL_TRUE if flag else GL_FALSE)
+            self.depth_mask = flag
+
+    def set_color(self, r: float, g: float, b: float) -> None:
+        '''
+        glColor3f, skipped if unchanged
+
+        Parameters:
+            - r, g, b: floats, the color
+
+        Returns: None
+        '''
+        color = (r, g, b)
+        if self.__set(self.color != color):
+            glColor3f(r, g, b)
+            self.color = color
+
+    def invalidate_color(self) -> None:
+        '''
+        Forgets the current color, e.g. after drawing with a color array,
+        which leaves it undefined
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.color = UNKNOWN
+
+    def use_program(self, program: int) -> None:
+        '''
+        glUseProgram, skipped if the program is already in use
+
+        Parameters:
+            - program: the program id, 0 for fixed function
+
+        Returns: None
+        '''
+        if self.__set(self.program != program):
+            glUseProgram(program)
+            self.program = program
+
+    def bind_buffer(self, target: int, buffer: int) -> None:
+        '''
+        glBindBuffer, skipped if the buffer is already bound to target
+
+        Parameters:
+            - target: e.g. GL_ARRAY_BUFFER
+            - buffer: the buffer id, 0 to unbind
+
+        Returns: None
+        '''
+        if self.__set(self.buffers.get(target, UNKNOWN) != buffer):
+            glBindBuffer(target, buffer)
+            self.buffers[target] = buffer
+
+    def bind_vertex_array(self, vertex_array: int) -> None:
+        '''
+        glBindVertexArray, skipped if already bound. The element buffer
+        binding belongs to the vertex array, so it is forgotten on a switch.
+
+        Parameters:
+            - vertex_array: the vertex array id, 0 to unbind
+
+        Returns: None
+        '''
+        if self.__set(self.vertex_array != vertex_array):
+            glBindVertexArray(vertex_array)
+            self.vertex_array = vertex_array
+            self.buffers[GL_ELEMENT_ARRAY_BUFFER] = UNKNOWN
+
+    def forget_buffer(self, buffer: int) -> None:
+        '''
+        Call before deleting a buffer: deleting a bound buffer unbinds it
+
+        Parameters:
+            - buffer: the buffer id being deleted
+
+        Returns: None
+        '''
+        for target, bound in list(self.buffers.items()):
+            if bound == buffer:
+                self.buffers[target] = UNKNOWN
+
+# the tracker for the current context
+state = GLState()
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,253 @@
+################################################################################
+# File: headless.py
+# Date: 18 October 2026
+# Description:
+#
+# Offscreen OpenGL contexts for running the engine without a display, e.g. on
+# render or CI machines. EGL is used where a driver provides it, OSMesa gives
+# a pure software rasterizer everywhere else.
+#
+# PyOpenGL picks its platform when OpenGL is first imported, so
+# select_platform() has to run before anything imports Engine.engine.
+#
+################################################################################
+
+# imports
+import ctypes
+import os
+import sys
+import numpy as np
+
+BACKENDS = ('egl', 'osmesa')
+
+def select_platform(backend: str='egl') -> None:
+    '''
+    Tells PyOpenGL to load the given offscreen platform
+
+    Parameters:
+        - backend: string, 'egl' or 'osmesa'
+
+    Returns: None
+
+    Raises:
+        - ValueError if backend is unknown
+        - RuntimeError if OpenGL was already imported with another platform
+    '''
+    if backend not in BACKENDS:
+        raise ValueError(f'Unknown headless backend: {backend}')
+
+    if 'OpenGL.GL' in sys.modules:
+        if os.environ.get('PYOPENGL_PLATFORM') != backend:
+            raise RuntimeError('select_platform() must be called before '
+                               'OpenGL is imported')
+        return
+
+    os.environ['PYOPENGL_PLATFORM'] = backend
+
+    # without a display server, Mesa's EGL needs to be told to run without
+    # one too
+    if backend == 'egl' and not os.environ.get('DISPLAY'):
+        os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+
+    # pygame still needs a video driver for its event and key functions
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+def current_platform() -> str:
+    '''
+    Returns the offscreen platform selected with select_platform()
+
+    Parameters: None
+
+    Returns:
+        - 'egl' or 'osmesa'
+
+    Raises:
+        - RuntimeError if no offscreen platform was selected
+    '''
+    backend = os.environ.get('PYOPENGL_PLATFORM')
+    if backend not in BACKENDS:
+        raise RuntimeError('Headless mode needs select_platform() to be '
+                           'called before OpenGL is imported')
+    return backend
+
+class OffscreenContext():
+    def __init__(self, width: int, height: int) -> None:
+        '''
+        Constructor for OffscreenContext class. Creates a GL context with no
+        window and makes it current.
+
+        Parameters:
+            - width: integer width of the default surface
+            - height: integer height of the default surface
+
+        Returns: None
+        '''
+        self.width = width
+        self.height = height
+        self.backend = current_platform()
+
+        if self.backend == 'egl':
+            self.__create_egl()
+        else:
+            self.__create_osmesa()
+
+    def __create_egl(self) -> None:
+        '''
+        Creates an EGL pbuffer surface and desktop OpenGL context
+
+        Parameters: None
+
+        Returns: None
+        '''
+        from OpenGL import EGL
+
+        self.display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(self.display, ctypes.pointer(major),
+                                 ctypes.pointer(minor)):
+            raise RuntimeError('Could not initialize EGL')
+
+        config_attributes = (EGL.EGLint * 13)(
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+            EGL.EGL_DEPTH_SIZE, 24,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_NONE
+        )
+        config = EGL.EGLConfig()
+        count = EGL.EGLint()
+        if not EGL.eglChooseConfig(self.display, config_attributes,
+                                   ctypes.pointer(config), 1,
+                                   ctypes.pointer(count)) or not count.value:
+            raise RuntimeError('No EGL config supports offscreen OpenGL')
+
+        surface_attributes = (EGL.EGLint * 5)(
+            EGL.EGL_WIDTH, self.width, EGL.EGL_HEIGHT, self.height,
+            EGL.EGL_NONE
+        )
+        self.surface = EGL.eglCreatePbufferSurface(self.display, config,
+                                                   surface_attributes)
+
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        self.context = EGL.eglCreateContext(self.display, config,
+                                            EGL.EGL_NO_CONTEXT, None)
+        if not EGL.eglMakeCurrent(self.display, self.surface, self.surface,
+                                  self.context):
+            raise RuntimeError('Could not make the EGL context current')
+
+    def __create_osmesa(self) -> None:
+        '''
+        Creates an OSMesa software context rendering into a NumPy buffer
+
+        Parameters: None
+
+        Returns: None
+        '''
+        from OpenGL import osmesa
+        from OpenGL.GL import GL_UNSIGNED_BYTE
+
+        self.context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24,
+                                                     0, 0, None)
+        if not self.context:
+            raise RuntimeError('Could not create an OSMesa context')
+
+        self.buffer = np.zeros((self.height, self.width, 4), dtype=np.uint8)
+        if not osmesa.OSMesaMakeCurrent(self.context, self.buffer,
+                                        GL_UNSIGNED_BYTE, self.width,
+                                        self.height):
+            raise RuntimeError('Could not make the OSMesa context current')
+
+    def destroy(self) -> None:
+        '''
+        Releases the context
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.backend == 'egl':
+            from OpenGL import EGL
+            EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE,
+                               EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+            EGL.eglDestroySurface(self.display, self.surface)
+            EGL.eglDestroyContext(self.display, self.context)
+            EGL.eglTerminate(self.display)
+        else:
+            from OpenGL import osmesa
+            osmesa.OSMesaDestroyContext(self.context)
+
+class Framebuffer():
+    def __init__(self, width: int, height: int) -> None:
+        '''
+        Constructor for Framebuffer class. Creates a framebuffer object with
+        color and depth attachments to render frames into.
+
+        Parameters:
+            - width: integer width in pixels
+            - height: integer height in pixels
+
+        Returns: None
+        '''
+        from OpenGL.GL import (glGenFramebuffers, glGenRenderbuffers,
+                               glBindRenderbuffer, glRenderbufferStorage,
+                               glFramebufferRenderbuffer, glViewport,
+                               glCheckFramebufferStatus, GL_FRAMEBUFFER,
+                               GL_RENDERBUFFER, GL_RGBA8,
+                               GL_DEPTH_COMPONENT24, GL_COLOR_ATTACHMENT0,
+                               GL_DEPTH_ATTACHMENT, GL_FRAMEBUFFER_COMPLETE)
+
+        self.width = width
+        self.height = height
+
+        self.fbo = glGenFramebuffers(1)
+        self.bind()
+
+        self.color, self.depth = glGenRenderbuffers(2)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.color)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, width, height)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0,
+                                  GL_RENDERBUFFER, self.color)
+
+        glBindRenderbuffer(GL_RENDERBUFFER, self.depth)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, width,
+                              height)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT,
+                                  GL_RENDERBUFFER, self.depth)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+
+        if glCheckFramebufferStatus(GL_FRAMEBUFFER) != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError('Offscreen framebuffer is incomplete')
+
+        glViewport(0, 0, width, height)
+
+    def bind(self) -> None:
+        '''
+        Makes this framebuffer the render target
+
+        Parameters: None
+
+        Returns: None
+        '''
+        from OpenGL.GL import glBindFramebuffer, GL_FRAMEBUFFER
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+
+    def read_pixels(self) -> np.ndarray:
+        '''
+        Copies the rendered frame into memory
+
+        Parameters: None
+
+        Returns:
+            - a (height, width, 3) uint8 array, top row first
+        '''
+        from OpenGL.GL import (glReadPixels, glPixelStorei, GL_RGB,
+                               GL_UNSIGNED_BYTE, GL_PACK_ALIGNMENT)
+
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        data = glReadPixels(0, 0, self.width, self.height, GL_RGB,
+                            GL_UNSIGNED_BYTE)
+        pixels = np.frombuffer(data, dtype=np.uint8)
+        return pixels.reshape(self.height, self.width, 3)[::-1]
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,91 @@
+################################################################################
+# File: hud.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the on-screen profiler overlay
+#
+################################################################################
+
+# imports
+import pygame
+from OpenGL.GL import *
+
+from .gl_state import state
+from .profiler import FrameProfiler
+
+class ProfilerOverlay():
+    def __init__(self, font_size: int=18, refresh: int=15) -> None:
+        '''
+        Constructor for ProfilerOverlay class
+
+        Parameters:
+            - font_size: integer font size in pixels
+            - refresh: integer number of frames between text updates, so
+                rendering the text doesn't show up in the numbers
+
+        Returns: None
+        '''
+        self.font_size = font_size
+        self.refresh = refresh
+        self.font = None
+
+        # pixels of the last rendered text
+        self.pixels = None
+        self.size = (0, 0)
+        self.rendered_frame = -refresh
+
+    def __render_text(self, profiler: FrameProfiler) -> None:
+        '''
+        Renders the profiler summary into an RGBA pixel buffer
+
+        Parameters:
+            - profiler: the FrameProfiler to show
+
+        Returns: None
+        '''
+        if self.font is None:
+            pygame.font.init()
+            self.font = pygame.font.Font(None, self.font_size)
+
+        lines = profiler.summary()
+        line_height = self.font.get_linesize()
+        width = max(self.font.size(line)[0] for line in lines) + 8
+        height = line_height * len(lines) + 8
+
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 160))
+        for row, line in enumerate(lines):
+            text = self.font.render(line, True, (255, 255, 255))
+            surface.blit(text, (4, 4 + row * line_height))
+
+        # flipped, since glDrawPixels starts at the bottom row
+        self.pixels = pygame.image.tostring(surface, 'RGBA', True)
+        self.size = (width, height)
+        self.rendered_frame = profiler.frame_count
+
+    def draw(self, profiler: FrameProfiler, window_height: int) -> None:
+        '''
+        Draws the overlay in the top left corner of the window
+
+        Parameters:
+            - profiler: the FrameProfiler to show
+            - window_height: integer height of the window in pixels
+
+        Returns: None
+        '''
+        if profiler.frame_count - self.rendered_frame >= self.refresh:
+            self.__render_text(profiler)
+
+        width, height = self.size
+        state.use_program(0)
+        glPushAttrib(GL_ENABLE_BIT | GL_COLOR_BUFFER_BIT)
+        glDisable(GL_DEPTH_TEST)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glWindowPos2i(8, window_height - 8 - height)
+        glDrawPixels(width, height, GL_RGBA, GL_UNSIGNED_BYTE, self.pixels)
+        glPopAttrib()
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,188 @@
+################################################################################
+# File: input_stream.py
+# Date: 18 October 2026
+# Description:
+#
+# Per-frame input snapshots and the recorder/replayer that write them to and
+# read them from a compact binary file, so a play session can be reproduced
+# exactly, e.g. to drive benchmarks
+#
+################################################################################
+
+# imports
+import struct
+import pygame
+from typing import BinaryIO, List, Optional, Tuple
+
+# keys the engine reacts to, in bit order
+TRACKED_KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d, pygame.K_SPACE)
+
+SHAPE_TYPES = ('cube', 'sphere', 'pyramid')
+
+# file layout
+MAGIC = b'AREINPUT'
+VERSION = 2
+HEADER = struct.Struct('<8sHd')       # magic, version, tick rate
+FRAME = struct.Struct('<dBhhB')       # frame time, keys, mouse dx, dy, spawns
+SPAWN = struct.Struct('<Bdddd')       # shape type, size, r, g, b
+
+Spawn = Tuple[str, float, Tuple[float, float, float]]
+
+class KeyState():
+    def __init__(self, bits: int=0) -> None:
+        '''
+        Constructor for KeyState class. Looks like the sequence returned by
+        pygame.key.get_pressed() for the tracked keys.
+
+        Parameters:
+            - bits: integer bit mask, one bit per key in TRACKED_KEYS
+
+        Returns: None
+        '''
+        self.bits = bits
+
+    @classmethod
+    def from_pygame(cls) -> 'KeyState':
+        '''
+        Samples the live keyboard
+
+        Parameters: None
+
+        Returns:
+            - a KeyState for the keys currently held down
+        '''
+        pressed = pygame.key.get_pressed()
+        bits = 0
+        for bit, key in enumerate(TRACKED_KEYS):
+            if pressed[key]:
+                bits |= 1 << bit
+        return cls(bits)
+
+    def __getitem__(self, key: int) -> bool:
+        if key not in TRACKED_KEYS:
+            return False
+        return bool(self.bits & (1 << TRACKED_KEYS.index(key)))
+
+class InputFrame():
+    def __init__(self, frame_time: float, keys: KeyState,
+                 mouse: Tuple[int, int]=(0, 0),
+                 spawns: Optional[List[Spawn]]=None) -> None:
+        '''
+        Constructor for InputFrame class. Holds everything the engine reads
+        from the user during one frame.
+
+        Parameters:
+            - frame_time: float, seconds since the previous frame
+            - keys: the KeyState for the frame
+            - mouse: tuple of the summed relative mouse motion
+            - spawns: list of (shape type, size, color) objects created this
+                frame
+
+        Returns: None
+        '''
+        self.frame_time = frame_time
+        self.keys = keys
+        self.mouse = mouse
+        self.spawns = spawns if spawns is not None else []
+
+class InputRecorder():
+    def __init__(self, path: str, tick_rate: float) -> None:
+        '''
+        Constructor for InputRecorder class. Opens the file and writes the
+        header.
+
+        Parameters:
+            - path: string path of the file to write
+            - tick_rate: float, the simulation tick rate of the session
+
+        Returns: None
+        '''
+        self.file: BinaryIO = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, tick_rate))
+        self.frames = 0
+
+    def record(self, frame: InputFrame) -> None:
+        '''
+        Appends a frame to the file
+
+        Parameters:
+            - frame: the InputFrame to write
+
+        Returns: None
+        '''
+        dx, dy = frame.mouse
+        self.file.write(FRAME.pack(frame.frame_time, frame.keys.bits, dx, dy,
+                                   len(frame.spawns)))
+        for shape_type, size, color in frame.spawns:
+            self.file.write(SPAWN.pack(SHAPE_TYPES.index(shape_type.lower()),
+                                       size, *color))
+        self.frames += 1
+
+    def close(self) -> None:
+        '''
+        Closes the file
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.file.close()
+
+class InputReplayer():
+    def __init__(self, path: str) -> None:
+        '''
+        Constructor for InputReplayer class. Reads a file written by
+        InputRecorder.
+
+        Parameters:
+            - path: string path of the file to read
+
+        Returns: None
+
+        Raises:
+            - ValueError if the file isn't a recording this version can read
+        '''
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        magic, version, self.tick_rate = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a version {VERSION} recording')
+
+        # the whole file is small, so decode it up front
+        self.frames: List[InputFrame] = []
+        offset = HEADER.size
+        while offset < len(data):
+            frame_time, bits, dx, dy, count = FRAME.unpack_from(data, offset)
+            offset += FRAME.size
+
+            spawns = []
+            for _ in range(count):
+                code, size, r, g, b = SPAWN.unpack_from(data, offset)
+                offset += SPAWN.size
+                spawns.append((SHAPE_TYPES[code], size, (r, g, b)))
+
+            self.frames.append(InputFrame(frame_time, KeyState(bits),
+                                          (dx, dy), spawns))
+        self.position = 0
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def next_frame(self) -> Optional[InputFrame]:
+        '''
+        Returns the next recorded frame
+
+        Parameters: None
+
+        Returns:
+            - the next InputFrame, or None at the end of the recording
+        '''
+        if self.position >= len(self.frames):
+            return None
+        frame = self.frames[self.position]
+        self.position += 1
+        return frame
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
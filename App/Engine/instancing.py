@@ -0,0 +1,712 @@
+################################################################################
+# File: instancing.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the instanced renderer. Shapes of the same type are drawn
+# together with one instanced draw call, reading their position, size and
+# color from a per-instance attribute buffer.
+#
+################################################################################
+
+# imports
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+from typing import Dict, List, Optional, Sequence
+
+from .frustum import Frustum
+from .gl_state import state
+from .lod import select_levels
+from .shaders import build_program
+from .scene_store import SceneStore, stores_of
+from .shape import Shape
+
+# attribute locations shared by the shader and the buffer setup
+VERTEX_LOCATION = 0
+OFFSET_SCALE_LOCATION = 1
+COLOR_LOCATION = 2
+
+VERTEX_SHADER = '''
+#version 120
+attribute vec3 vertex;
+attribute vec4 offset_scale;
+attribute vec3 color;
+varying vec3 frag_color;
+
+void main() {
+    frag_color = color;
+    vec3 world = vertex * offset_scale.w + offset_scale.xyz;
+    gl_Position = gl_ModelViewProjectionMatrix * vec4(world, 1.0);
+}
+'''
+
+FRAGMENT_SHADER = '''
+#version 120
+varying vec3 frag_color;
+
+void main() {
+    gl_FragColor = vec4(frag_color, 1.0);
+}
+'''
+
+# x, y, z, scale, r, g, b
+INSTANCE_FLOATS = 7
+INSTANCE_STRIDE = INSTANCE_FLOATS * 4
+
+class InstanceGroup():
+    def __init__(self, shape_type: type, capacity: int=64) -> None:
+        '''
+        Constructor for InstanceGroup class. Holds the packed instance data for
+        every shape of one type.
+
+        Parameters:
+            - shape_type: the Shape child class stored in this group
+            - capacity: integer number of instances to allocate room for
+
+        Returns: None
+        '''
+        self.shape_type = shape_type
+        self.shapes: List[Shape] = []
+        self.slots: Dict[int, int] = {}
+        self.data = np.zeros((capacity, INSTANCE_FLOATS), dtype=np.float32)
+
+        # range of slots that changed since the last upload
+        self.dirty_start = 0
+        self.dirty_end = 0
+
+        self.vbo = None
+        self.gpu_capacity = 0
+
+        # bounding sphere of the unit geometry, scaled per instance for
+        # culling and level of detail
+        geometry = shape_type.lod_buffer(0)
+        vertices = geometry.vertices
+        low, high = vertices.min(axis=0), vertices.max(axis=0)
+        self.center = (low + high) / 2
+        self.radius = float(np.linalg.norm(vertices - self.center,
+                                           axis=1).max())
+
+        # level of detail of every slot, kept between frames for hysteresis
+        self.levels = np.zeros(capacity, dtype=np.int8)
+
+        # store handle of every slot and slot of every handle (-1 for none),
+        # for moving rows of the store the shapes share in bulk. store is
+        # None if the shapes are in different stores.
+        self.handles = np.zeros(capacity, dtype=np.int64)
+        self.handle_slots = np.full(capacity, -1, dtype=np.int64)
+        self.store = None
+
+        # set while the GPU buffer holds a subset or reordering of the
+        # instances, and the slots it holds
+        self.compacted = False
+        self.last_order = None
+
+        # draw calls and vertices submitted by the last draw
+        self.draw_calls = 0
+        self.vertices = 0
+
+    def __len__(self) -> int:
+        return len(self.shapes)
+
+    def __mark_dirty(self, slot: int) -> None:
+        '''
+        Grows the range of slots that need to be uploaded
+
+        Parameters:
+            - slot: integer slot that changed
+
+        Returns: None
+        '''
+        if self.dirty_start == self.dirty_end:
+            self.dirty_start, self.dirty_end = slot, slot + 1
+        else:
+            self.dirty_start = min(self.dirty_start, slot)
+            self.dirty_end = max(self.dirty_end, slot + 1)
+
+    def __track(self, start: int, shapes: List[Shape]) -> None:
+        '''
+        Records the store handles of shapes added from slot start
+
+        Parameters:
+            - start: integer slot of the first shape
+            - shapes: the shapes added
+
+        Returns: None
+        '''
+        if not shapes:
+            return
+        end = start + len(shapes)
+        if end > len(self.handles):
+            handles = np.zeros(len(self.data), dtype=np.int64)
+            handles[:start] = self.handles[:start]
+            self.handles = handles
+
+        handles = np.fromiter((shape._handle for shape in shapes),
+                              dtype=np.int64, count=len(shapes))
+        self.handles[start:end] = handles
+        needed = int(handles.max()) + 1
+        if needed > len(self.handle_slots):
+            grown = np.full(max(needed, 2 * len(self.handle_slots)), -1,
+                            dtype=np.int64)
+            grown[:len(self.handle_slots)] = self.handle_slots
+            self.handle_slots = grown
+        self.handle_slots[handles] = np.arange(start, end)
+
+        store = shapes[0]._store
+        if start == 0:
+            self.store = store
+        if store is not self.store or any(shape._store is not store
+                                          for shape in shapes):
+            self.store = None
+
+    def add(self, shape: Shape) -> None:
+        '''
+        Appends a shape to the group
+
+        Parameters:
+            - shape: the shape to add
+
+        Returns: None
+        '''
+        slot = len(self.shapes)
+        if slot == len(self.data):
+            self.data = np.concatenate((self.data, np.zeros_like(self.data)))
+            self.levels = np.concatenate((self.levels,
+                                          np.zeros_like(self.levels)))
+
+        self.shapes.append(shape)
+        self.slots[id(shape)] = slot
+        self.__track(slot, [shape])
+        self.update(shape)
+
+    def add_many(self, shapes: List[Shape], data: np.ndarray) -> None:
+        '''
+        Appends many shapes with their packed instance data in one copy
+
+        Parameters:
+            - shapes: the shapes to add
+            - data: (n, INSTANCE_FLOATS) array of x, y, z, scale, r, g, b
+
+        Returns: None
+        '''
+        start = len(self.shapes)
+        end = start + len(shapes)
+        if end > len(self.data):
+            capacity = len(self.data)
+            while capacity < end:
+                capacity *= 2
+            grown = np.zeros((capacity, INSTANCE_FLOATS), dtype=np.float32)
+            grown[:start] = self.data[:start]
+            self.data = grown
+            levels = np.zeros(capacity, dtype=np.int8)
+            levels[:start] = self.levels[:start]
+            self.levels = levels
+
+        self.data[start:end] = data
+        self.levels[start:end] = 0
+        self.shapes.extend(shapes)
+        slots = self.slots
+        for slot, shape in enumerate(shapes, start):
+            slots[id(shape)] = slot
+        self.__track(start, shapes)
+
+        if end > start:
+            self.__mark_dirty(start)
+            self.__mark_dirty(end - 1)
+
+    def remove(self, shape: Shape) -> None:
+        '''
+        Removes a shape from the group by moving the last instance into its
+        slot, so the data stays packed
+
+        Parameters:
+            - shape: the shape to remove
+
+        Returns: None
+        '''
+        slot = self.slots.pop(id(shape))
+        last = self.shapes.pop()
+        end = len(self.shapes)
+        self.handle_slots[self.handles[slot]] = -1
+
+        if last is not shape:
+            self.shapes[slot] = last
+            self.slots[id(last)] = slot
+            self.data[slot] = self.data[end]
+            self.levels[slot] = self.levels[end]
+            self.handles[slot] = self.handles[end]
+            self.handle_slots[self.handles[slot]] = slot
+            self.__mark_dirty(slot)
+
+    def update(self, shape: Shape) -> None:
+        '''
+        Re-packs the instance data of a shape that changed
+
+        Parameters:
+            - shape: the shape that changed
+
+        Returns: None
+        '''
+        slot = self.slots[id(shape)]
+        self.data[slot, 0:3] = shape.position
+        self.data[slot, 3] = shape.scale()
+        self.data[slot, 4:7] = shape.color
+        self.__mark_dirty(slot)
+
+    def move_rows(self, store: SceneStore, rows: np.ndarray) -> None:
+        '''
+        Re-reads the positions of the group's shapes among some rows of a
+        store, all at once. Rows of other shapes are skipped.
+
+        Parameters:
+            - store: the SceneStore the rows are in
+            - rows: integer array of rows that moved
+
+        Returns: None
+        '''
+        if store is not self.store:
+            # the handles are of another store; go shape by shape
+            for row in rows.tolist():
+                shape = store.proxies[row]
+                if id(shape) in self.slots:
+                    self.update(shape)
+            return
+
+        handles = store.handles_of(rows)
+        slot_of = self.handle_slots
+        known = handles < len(slot_of)
+        slots = np.full(len(rows), -1, dtype=np.int64)
+        slots[known] = slot_of[handles[known]]
+        mine = slots >= 0
+        if not mine.any():
+            return
+
+        slots = slots[mine]
+        self.data[slots, 0:3] = store.positions[rows[mine]]
+        self.__mark_dirty(int(slots.min()))
+        self.__mark_dirty(int(slots.max()))
+
+    def upload(self) -> None:
+        '''
+        Sends changed instance data to the GPU. Only the changed range is
+        copied unless the buffer has to grow.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.vbo is None:
+            self.vbo = glGenBuffers(1)
+
+        state.bind_buffer(GL_ARRAY_BUFFER, self.vbo)
+        if self.gpu_capacity < len(self.data):
+            glBufferData(GL_ARRAY_BUFFER, self.data.nbytes, self.data,
+                         GL_DYNAMIC_DRAW)
+            self.gpu_capacity = len(self.data)
+        elif self.dirty_start != self.dirty_end:
+            changed = self.data[self.dirty_start:self.dirty_end]
+            glBufferSubData(GL_ARRAY_BUFFER,
+                            self.dirty_start * INSTANCE_STRIDE,
+                            changed.nbytes, changed)
+
+        self.dirty_start = self.dirty_end = 0
+
+    def upload_visible(self, order: np.ndarray) -> None:
+        '''
+        Replaces the GPU buffer contents with only the given instances, in
+        the given order. The copy is skipped if neither the slots nor the
+        instance data changed since the last call.
+
+        Parameters:
+            - order: integer array of the slots to upload
+
+        Returns: None
+        '''
+        unchanged = (self.compacted and self.dirty_start == self.dirty_end
+                     and np.array_equal(order, self.last_order))
+        if unchanged:
+            return
+
+        # make sure the buffer is allocated at full capacity first
+        self.upload()
+        visible = self.data[order]
+        glBufferSubData(GL_ARRAY_BUFFER, 0, visible.nbytes, visible)
+
+        self.compacted = True
+        self.last_order = order
+
+    def cull(self, frustum: Frustum) -> np.ndarray:
+        '''
+        Tests every instance's bounding sphere against the frustum
+
+        Parameters:
+            - frustum: the current view frustum
+
+        Returns:
+            - a boolean array, True for each visible slot
+        '''
+        rows = self.data[:len(self.shapes)]
+        scale = rows[:, 3]
+        centers = rows[:, 0:3] + np.outer(scale, self.center)
+        return frustum.spheres_visible(centers, scale * self.radius)
+
+    def lod_levels(self, eye: Sequence[float]) -> np.ndarray:
+        '''
+        Picks the level of detail of every instance from its screen size
+
+        Parameters:
+            - eye: the camera position
+
+        Returns:
+            - an int8 array with the level of each slot
+        '''
+        count = len(self.shapes)
+        rows = self.data[:count]
+        scale = rows[:, 3]
+        centers = rows[:, 0:3] + np.outer(scale, self.center)
+        distances = np.linalg.norm(centers - np.asarray(eye, np.float32),
+                                   axis=1)
+        radii = scale * self.radius
+
+        # the camera is inside spheres closer than their radius
+        sizes = np.full(count, np.inf, dtype=np.float32)
+        outside = distances > radii
+        sizes[outside] = radii[outside] / distances[outside]
+
+        levels = select_levels(self.shape_type.lod_thresholds, sizes,
+                               self.levels[:count],
+                               self.shape_type.lod_hysteresis)
+        self.levels[:count] = levels
+        return levels
+
+    def draw(self, frustum: Optional[Frustum]=None,
+             eye: Optional[Sequence[float]]=None) -> int:
+        '''
+        Draws every instance in the group with one instanced draw call per
+        level of detail in use
+
+        Parameters:
+            - frustum: optional view frustum, instances fully outside it are
+                skipped
+            - eye: optional camera position. If given and the shape type has
+                lod_thresholds, distant instances use coarser geometry.
+
+        Returns:
+            - the number of instances drawn
+        '''
+        self.draw_calls = 0
+        self.vertices = 0
+
+        count = len(self.shapes)
+        mask = None if frustum is None or not count else self.cull(frustum)
+        visible = count if mask is None else int(np.count_nonzero(mask))
+        if not visible:
+            return 0
+
+        # number of instances per level, in level order, and the slots to
+        # upload if not all of them in slot order
+        batches = [(0, visible)]
+        order = None
+        if eye is not None and self.shape_type.lod_thresholds:
+            levels = self.lod_levels(eye)
+            slots = np.arange(count) if mask is None else np.flatnonzero(mask)
+            slot_levels = levels[slots]
+            if slot_levels.any():
+                # group the visible instances by level
+                order = slots[np.argsort(slot_levels, kind='stable')]
+                counts = np.bincount(slot_levels, minlength=1)
+                batches = [(level, int(n)) for level, n in enumerate(counts)
+                           if n]
+
+        if order is None and visible < count:
+            order = np.flatnonzero(mask)
+
+        if order is not None:
+            self.upload_visible(order)
+        else:
+            # the buffer holds a compacted subset, so refill it completely
+            if self.compacted:
+                self.dirty_start, self.dirty_end = 0, count
+                self.compacted = False
+            self.upload()
+
+        # the attribute setup below must not touch a shape's vertex array
+        state.bind_vertex_array(0)
+        glEnableVertexAttribArray(VERTEX_LOCATION)
+        glEnableVertexAttribArray(OFFSET_SCALE_LOCATION)
+        glVertexAttribDivisor(OFFSET_SCALE_LOCATION, 1)
+        glEnableVertexAttribArray(COLOR_LOCATION)
+        glVertexAttribDivisor(COLOR_LOCATION, 1)
+
+        start = 0
+        for level, instances in batches:
+            geometry = self.shape_type.lod_buffer(level)
+            if geometry.vbo is None:
+                geometry.upload()
+
+            # per-vertex positions from the shared geometry buffer
+            state.bind_buffer(GL_ARRAY_BUFFER, geometry.vbo)
+            glVertexAttribPointer(VERTEX_LOCATION, 3, GL_FLOAT, GL_FALSE,
+                                  geometry.stride, None)
+
+            # per-instance offset, scale and color, starting at this
+            # level's first instance
+            offset = start * INSTANCE_STRIDE
+            state.bind_buffer(GL_ARRAY_BUFFER, self.vbo)
+            glVertexAttribPointer(OFFSET_SCALE_LOCATION, 4, GL_FLOAT,
+                                  GL_FALSE, INSTANCE_STRIDE,
+                                  ctypes.c_void_p(offset))
+            glVertexAttribPointer(COLOR_LOCATION, 3, GL_FLOAT, GL_FALSE,
+                                  INSTANCE_STRIDE,
+                                  ctypes.c_void_p(offset + 16))
+
+            state.bind_buffer(GL_ELEMENT_ARRAY_BUFFER, geometry.ibo)
+            glDrawElementsInstanced(geometry.mode, geometry.count,
+                                    GL_UNSIGNED_INT, None, instances)
+
+            self.draw_calls += 1
+            self.vertices += instances * geometry.count
+            start += instances
+
+        glVertexAttribDivisor(OFFSET_SCALE_LOCATION, 0)
+        glVertexAttribDivisor(COLOR_LOCATION, 0)
+        for location in (VERTEX_LOCATION, OFFSET_SCALE_LOCATION,
+                         COLOR_LOCATION):
+            glDisableVertexAttribArray(location)
+
+        return visible
+
+    def release(self) -> None:
+        '''
+        Frees the instance buffer on the GPU
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.vbo is not None:
+            state.forget_buffer(self.vbo)
+            glDeleteBuffers(1, [self.vbo])
+        self.vbo = None
+        self.gpu_capacity = 0
+
+class InstancedRenderer():
+    # one shader program for every renderer, built on first use in the
+    # current context
+    program = None
+
+    def __init__(self) -> None:
+        '''
+        Constructor for InstancedRenderer class
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.groups: Dict[type, InstanceGroup] = {}
+
+        # shapes without shared geometry are drawn one at a time
+        self.loose: List[Shape] = []
+
+        # stores whose listener follows the instanced shapes
+        self.stores: List[SceneStore] = []
+
+        # counters from the last draw
+        self.drawn = 0
+        self.culled = 0
+        self.draw_calls = 0
+        self.vertices = 0
+
+    def add(self, shape: Shape) -> None:
+        '''
+        Starts tracking a shape. Its instance data is updated automatically
+        whenever its color or position changes.
+
+        Parameters:
+            - shape: the shape to add
+
+        Returns: None
+        '''
+        if not shape.buffered:
+            self.loose.append(shape)
+            return
+
+        group = self.groups.get(type(shape))
+        if group is None:
+            group = self.groups[type(shape)] = InstanceGroup(type(shape))
+        group.add(shape)
+        self.__watch((shape,))
+
+    def add_many(self, shapes: List[Shape],
+                 data: Optional[np.ndarray]=None) -> None:
+        '''
+        Starts tracking many shapes at once
+
+        Parameters:
+            - shapes: the shapes to add
+            - data: optional (n, INSTANCE_FLOATS) array of the shapes' packed
+                instance data, if the caller already has it
+
+        Returns: None
+        '''
+        if data is None:
+            data = np.array([(*shape.position, shape.scale(), *shape.color)
+                             for shape in shapes], dtype=np.float32)
+            data = data.reshape(len(shapes), INSTANCE_FLOATS)
+
+        # split the batch by shape type
+        batches: Dict[type, List[int]] = {}
+        for index, shape in enumerate(shapes):
+            batches.setdefault(type(shape), []).append(index)
+
+        for shape_type, indices in batches.items():
+            batch = [shapes[index] for index in indices]
+            if not shape_type.buffered:
+                self.loose.extend(batch)
+                continue
+
+            group = self.groups.get(shape_type)
+            if group is None:
+                group = self.groups[shape_type] = InstanceGroup(shape_type)
+            group.add_many(batch, data[indices])
+            self.__watch(batch)
+
+    def __watch(self, shapes: Sequence[Shape]) -> None:
+        '''
+        Follows shapes through a listener on each of their stores, added
+        once per store rather than once per shape
+
+        Parameters:
+            - shapes: the shapes to follow
+
+        Returns: None
+        '''
+        for store in stores_of(shapes):
+            if not any(store is watched for watched in self.stores):
+                store.add_listener(self.__on_change)
+                self.stores.append(store)
+
+    def remove(self, shape: Shape) -> None:
+        '''
+        Stops tracking a shape
+
+        Parameters:
+            - shape: the shape to remove
+
+        Returns: None
+        '''
+        if not shape.buffered:
+            self.loose.remove(shape)
+            return
+
+        self.groups[type(shape)].remove(shape)
+
+    def clear(self) -> None:
+        '''
+        Stops tracking every shape and frees the instance buffers
+
+        Parameters: None
+
+        Returns: None
+        '''
+        for store in self.stores:
+            store.remove_listener(self.__on_change)
+        self.stores = []
+        for group in self.groups.values():
+            group.release()
+        self.groups = {}
+        self.loose = []
+
+    def __on_change(self, shape: Shape) -> None:
+        '''
+        Store listener, re-packs the instance data of the changed shape if
+        it is drawn here
+
+        Parameters:
+            - shape: the shape that changed
+
+        Returns: None
+        '''
+        group = self.groups.get(type(shape))
+        if group is not None and id(shape) in group.slots:
+            group.update(shape)
+
+    def move_rows(self, store: SceneStore, rows: np.ndarray) -> None:
+        '''
+        Updates the instance data of shapes whose rows were moved without
+        notifying their listeners, e.g. by Physics.sync (see
+        Physics.add_listener). Shapes without shared geometry are drawn
+        from their own positions and need nothing.
+
+        Parameters:
+            - store: the SceneStore the rows are in
+            - rows: integer array of rows that moved
+
+        Returns: None
+        '''
+        for group in self.groups.values():
+            group.move_rows(store, rows)
+
+    def visible_loose(self, frustum: Optional[Frustum]=None) -> List[Shape]:
+        '''
+        The shapes without shared geometry that are at least partly inside
+        the view frustum
+
+        Parameters:
+            - frustum: optional view frustum, None keeps every shape
+
+        Returns:
+            - a list of shapes
+        '''
+        if frustum is None:
+            return list(self.loose)
+        return [shape for shape in self.loose
+                if frustum.sphere_visible(*shape.bounding_sphere())]
+
+    def draw(self, frustum: Optional[Frustum]=None,
+             eye: Optional[Sequence[float]]=None, loose: bool=True) -> None:
+        '''
+        Draws every tracked shape, one draw call per shape type and level
+        of detail. Updates the drawn and culled counters.
+
+        Parameters:
+            - frustum: optional view frustum, shapes fully outside it are
+                skipped
+            - eye: optional camera position for level of detail selection
+            - loose: boolean, False to leave the shapes without shared
+                geometry to the caller (see visible_loose) and only count
+                the instanced ones
+
+        Returns: None
+        '''
+        total = sum(len(g) for g in self.groups.values())
+        if loose:
+            total += len(self.loose)
+        self.drawn = 0
+        self.draw_calls = 0
+        self.vertices = 0
+
+        if InstancedRenderer.program is None:
+            InstancedRenderer.program = build_program(VERTEX_SHADER, FRAGMENT_SHADER, {
+                'vertex': VERTEX_LOCATION,
+                'offset_scale': OFFSET_SCALE_LOCATION,
+                'color': COLOR_LOCATION
+            })
+
+        state.use_program(InstancedRenderer.program)
+        for group in self.groups.values():
+            self.drawn += group.draw(frustum, eye)
+            self.draw_calls += group.draw_calls
+            self.vertices += group.vertices
+
+        for shape in (self.visible_loose(frustum) if loose else ()):
+            shape.draw()
+            self.drawn += 1
+            self.draw_calls += 1
+            self.vertices += shape.vertex_count()
+
+        self.culled = total - self.drawn
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
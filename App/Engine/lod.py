@@ -0,0 +1,90 @@
+################################################################################
+# File: lod.py
+# Date: 18 October 2026
+# Description:
+#
+# Level-of-detail selection. A shape's screen size is approximated by its
+# bounding radius divided by its distance from the camera. Level 0 is the
+# finest mesh; each threshold the size falls below moves one level coarser.
+# Thresholds are widened by a hysteresis band around the current level so
+# shapes near a threshold don't flicker between meshes.
+#
+################################################################################
+
+# imports
+import math
+import numpy as np
+from typing import Sequence
+
+def screen_size(center: Sequence[float], radius: float,
+                eye: Sequence[float]) -> float:
+    '''
+    Approximate screen size of a bounding sphere
+
+    Parameters:
+        - center: the sphere's center
+        - radius: float, the sphere's radius
+        - eye: the camera position
+
+    Returns:
+        - radius / distance, or infinity if the camera is inside the sphere
+    '''
+    distance = math.dist(center, eye)
+    if distance <= radius:
+        return math.inf
+    return radius / distance
+
+def select_level(thresholds: Sequence[float], size: float, current: int,
+                 hysteresis: float) -> int:
+    '''
+    Picks the level for one shape
+
+    Parameters:
+        - thresholds: screen sizes in decreasing order; level i + 1 starts
+            below thresholds[i]
+        - size: float screen size from screen_size()
+        - current: integer level the shape is drawn at now
+        - hysteresis: float fraction each threshold must be passed by
+            before the level changes
+
+    Returns:
+        - the integer level to draw at
+    '''
+    level = 0
+    for boundary, threshold in enumerate(thresholds):
+        if size < threshold * (1 - hysteresis):
+            level = boundary + 1
+        elif size <= threshold * (1 + hysteresis) and current > boundary:
+            level = boundary + 1
+        else:
+            break
+    return level
+
+def select_levels(thresholds: Sequence[float], sizes: np.ndarray,
+                  current: np.ndarray, hysteresis: float) -> np.ndarray:
+    '''
+    Picks the levels for many shapes at once, like select_level
+
+    Parameters:
+        - thresholds: screen sizes in decreasing order
+        - sizes: array of screen sizes
+        - current: integer array of the levels the shapes are drawn at now
+        - hysteresis: float fraction each threshold must be passed by
+            before the level changes
+
+    Returns:
+        - an int8 array of the levels to draw at
+    '''
+    thresholds = np.asarray(thresholds, dtype=np.float32)[None, :]
+    sizes = sizes[:, None]
+    boundaries = np.arange(thresholds.shape[1])[None, :]
+
+    coarser = ((sizes < thresholds * (1 - hysteresis))
+               | ((sizes <= thresholds * (1 + hysteresis))
+                  & (current[:, None] > boundaries)))
+
+    # a level only counts while every finer boundary was crossed too
+    return np.cumprod(coarser, axis=1).sum(axis=1).astype(np.int8)
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
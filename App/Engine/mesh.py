@@ -0,0 +1,126 @@
+################################################################################
+# File: mesh.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the Mesh child class, a shape drawn from a loaded model
+# (see obj_loader.py)
+#
+################################################################################
+
+# imports
+from .shape import Shape
+from .scene_store import Dimension
+from .obj_loader import MeshData, load_obj
+from OpenGL.GL import glScalef
+from typing import Tuple
+
+class Mesh(Shape):
+    __slots__ = ('model',)
+    type_code = 3
+
+    # every model has its own geometry, so meshes are drawn one at a time
+    # through draw_shape() rather than instanced by type
+    buffered = False
+
+    size = Dimension(0)
+
+    def __init__(self, model: MeshData, size: float=1.0,
+                 color: Tuple[float, float, float]=(1.0, 1.0, 1.0),
+                 position: Tuple[float, float, float]=(0.0, 0.0, 0.0)) -> None:
+        '''
+        Constructor
+
+        Parameters:
+            - model: the MeshData to draw, can be shared by many meshes
+            - size: float, uniform scale applied to the model
+            - color: tuple of floats representing the color
+            - position: tuple of floats representing the position
+
+        Returns: None
+        '''
+        # call parent constructor
+        super().__init__(color, position)
+
+        self.model = model
+        self.size = size
+
+    @classmethod
+    def from_file(cls, path: str, size: float=1.0,
+                  color: Tuple[float, float, float]=(1.0, 1.0, 1.0),
+                  position: Tuple[float, float, float]=(0.0, 0.0, 0.0)
+                  ) -> 'Mesh':
+        '''
+        Loads an OBJ model and makes a mesh of it
+
+        Parameters:
+            - path: string path of the .obj file
+            - size: float, uniform scale applied to the model
+            - color: tuple of floats representing the color
+            - position: tuple of floats representing the position
+
+        Returns:
+            - the new Mesh
+        '''
+        return cls(load_obj(path), size, color, position)
+
+    def draw_shape(self) -> None:
+        '''
+        Overridden draw_shape function to draw the model's GPU buffer
+
+        Parameters: None
+
+        Returns: None
+        '''
+        size = self.size
+        glScalef(size, size, size)
+        self.model.buffer().draw()
+
+    def pipeline(self):
+        '''
+        Overridden so meshes of the same model share a pipeline state
+
+        Parameters: None
+
+        Returns:
+            - a hashable naming the model's buffer
+        '''
+        return ('mesh', self.model.digest)
+
+    def vertex_count(self) -> int:
+        '''
+        Number of vertices one draw of this mesh submits
+
+        Parameters: None
+
+        Returns:
+            - the integer index count of the model
+        '''
+        return len(self.model.indices)
+
+    def scale(self) -> float:
+        '''
+        Scale applied to the model
+
+        Parameters: None
+
+        Returns:
+            - the size
+        '''
+        return self.size
+
+    def local_bounds(self):
+        '''
+        Bounding box relative to the mesh's position
+
+        Parameters: None
+
+        Returns:
+            - a tuple of the (min, max) corners
+        '''
+        size = self.size
+        low, high = self.model.low, self.model.high
+        return (tuple(i * size for i in low), tuple(i * size for i in high))
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,96 @@
+################################################################################
+# File: narrowphase.py
+# Date: 18 October 2026
+# Description:
+#
+# Exact overlap tests between pairs of shapes. Spheres are tested as spheres,
+# cubes and pyramids as their axis-aligned bounding boxes.
+#
+################################################################################
+
+# imports
+from typing import Any, Sequence
+
+from .sphere import Sphere
+
+def aabb_overlap(low_a: Sequence[float], high_a: Sequence[float],
+                 low_b: Sequence[float], high_b: Sequence[float]) -> bool:
+    '''
+    Tests two axis-aligned boxes for overlap
+
+    Parameters:
+        - low_a, high_a: the min and max corners of the first box
+        - low_b, high_b: the min and max corners of the second box
+
+    Returns:
+        - True if the boxes overlap or touch
+    '''
+    return (low_a[0] <= high_b[0] and low_b[0] <= high_a[0]
+            and low_a[1] <= high_b[1] and low_b[1] <= high_a[1]
+            and low_a[2] <= high_b[2] and low_b[2] <= high_a[2])
+
+def sphere_sphere(center_a: Sequence[float], radius_a: float,
+                  center_b: Sequence[float], radius_b: float) -> bool:
+    '''
+    Tests two spheres for overlap
+
+    Parameters:
+        - center_a, radius_a: the first sphere
+        - center_b, radius_b: the second sphere
+
+    Returns:
+        - True if the spheres overlap or touch
+    '''
+    dx = center_a[0] - center_b[0]
+    dy = center_a[1] - center_b[1]
+    dz = center_a[2] - center_b[2]
+    reach = radius_a + radius_b
+    return dx * dx + dy * dy + dz * dz <= reach * reach
+
+def sphere_aabb(center: Sequence[float], radius: float,
+                low: Sequence[float], high: Sequence[float]) -> bool:
+    '''
+    Tests a sphere against an axis-aligned box
+
+    Parameters:
+        - center, radius: the sphere
+        - low, high: the min and max corners of the box
+
+    Returns:
+        - True if the sphere and box overlap or touch
+    '''
+    # squared distance from the center to the closest point on the box
+    distance = 0.0
+    for axis in range(3):
+        value = center[axis]
+        if value < low[axis]:
+            distance += (low[axis] - value) ** 2
+        elif value > high[axis]:
+            distance += (value - high[axis]) ** 2
+    return distance <= radius * radius
+
+def shapes_collide(shape_a: Any, shape_b: Any) -> bool:
+    '''
+    Picks the right test for a pair of shapes
+
+    Parameters:
+        - shape_a: the first shape
+        - shape_b: the second shape
+
+    Returns:
+        - True if the shapes overlap
+    '''
+    a_is_sphere = isinstance(shape_a, Sphere)
+    b_is_sphere = isinstance(shape_b, Sphere)
+
+    if a_is_sphere and b_is_sphere:
+        return sphere_sphere(shape_a.position, shape_a.radius,
+                             shape_b.position, shape_b.radius)
+    if a_is_sphere:
+        return sphere_aabb(shape_a.position, shape_a.radius, *shape_b.aabb())
+    if b_is_sphere:
+        return sphere_aabb(shape_b.position, shape_b.radius, *shape_a.aabb())
+    return aabb_overlap(*shape_a.aabb(), *shape_b.aabb())
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,336 @@
+################################################################################
+# File: obj_loader.py
+# Date: 18 October 2026
+# Description:
+#
+# Loads Wavefront OBJ models into interleaved vertex and index arrays. The
+# text is parsed one line at a time, and the result is written to a binary
+# cache next to the model, stamped with a hash of the model's contents. Later
+# loads of an unchanged model memory-map the cache instead of parsing:
+#
+#   header      128 bytes
+#   vertices    float32 (n, 8)    position, normal, texture coordinate
+#   indices     uint32 (m)        triangles
+#
+################################################################################
+
+# imports
+import hashlib
+import os
+import struct
+import numpy as np
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Sequence, Tuple
+
+from .buffers import GeometryBuffer, shared_buffer
+
+# interleaved vertex layout
+POSITION, NORMAL, TEXCOORD = slice(0, 3), slice(3, 6), slice(6, 8)
+VERTEX_SIZE = 8
+
+# cache file layout
+MAGIC = b'AREMESH\0'
+VERSION = 1
+HEADER = struct.Struct('<8sHxx32sQQ')  # magic, version, sha256 of the model,
+                                       # vertex count, index count
+HEADER_SIZE = 128
+CACHE_SUFFIX = '.meshcache'
+
+class MeshData():
+    def __init__(self, vertices: np.ndarray, indices: np.ndarray,
+                 digest: bytes, name: str='') -> None:
+        '''
+        Constructor for MeshData class. The geometry of one model, shared by
+        every Mesh drawn from it.
+
+        Parameters:
+            - vertices: (n, 8) float32 array of interleaved vertices
+            - indices: (m,) uint32 array of triangle indices
+            - digest: bytes, hash of the model file the data came from
+            - name: string name of the model, for messages
+
+        Returns: None
+        '''
+        self.vertices = vertices
+        self.indices = indices
+        self.digest = digest
+        self.name = name
+
+        # bounding box of the model as loaded
+        if len(vertices):
+            positions = vertices[:, POSITION]
+            self.low = tuple(positions.min(axis=0).tolist())
+            self.high = tuple(positions.max(axis=0).tolist())
+        else:
+            self.low = self.high = (0.0, 0.0, 0.0)
+
+    def buffer(self) -> GeometryBuffer:
+        '''
+        Returns the GPU buffer of the model, shared by every model with the
+        same contents
+
+        Parameters: None
+
+        Returns:
+            - the GeometryBuffer
+        '''
+        return shared_buffer(('mesh', self.digest),
+                             lambda: (self.vertices, self.indices))
+
+def parse_obj(lines: Iterable[bytes],
+              name: str='') -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Parses OBJ text. Only positions, texture coordinates, normals and faces
+    are read; polygons are split into triangle fans. Vertices with the same
+    position / texture coordinate / normal triple are shared. Vertices
+    without a normal get the area-weighted average of their faces' normals.
+
+    Parameters:
+        - lines: the lines of the file as bytes, e.g. an open binary file
+        - name: string name of the model, for error messages
+
+    Returns:
+        - a tuple of (vertices, indices), float32 (n, 8) and uint32 (m,)
+
+    Raises:
+        - ValueError if a line can't be read or a face refers to a
+            missing element
+    '''
+    positions, texcoords, normals = array('f'), array('f'), array('f')
+
+    # position, texture coordinate and normal index of each output vertex,
+    # -1 when missing
+    vertex_ids = {}
+    keys = array('q')
+    indices = array('I')
+
+    for number, line in enumerate(lines, 1):
+        fields = line.split()
+        if not fields:
+            continue
+        kind = fields[0]
+        try:
+            if kind == b'v':
+                positions.extend(map(float, fields[1:4]))
+            elif kind == b'vt':
+                texcoords.extend(map(float, (fields[1:3] + [b'0'])[:2]))
+            elif kind == b'vn':
+                normals.extend(map(float, fields[1:4]))
+            elif kind == b'f':
+                counts = (len(positions) // 3, len(texcoords) // 2,
+                          len(normals) // 3)
+                corners = []
+                for field in fields[1:]:
+                    key = [-1, -1, -1]
+                    for slot, part in enumerate(field.split(b'/')[:3]):
+                        if part:
+                            index = int(part)
+                            # negative indices count back from the end
+                            key[slot] = (index - 1 if index > 0
+                                         else counts[slot] + index)
+                            if key[slot] < 0:
+                                raise ValueError(field)
+                    key = tuple(key)
+                    vertex = vertex_ids.get(key)
+                    if vertex is None:
+                        vertex = vertex_ids[key] = len(vertex_ids)
+                        keys.extend(key)
+                    corners.append(vertex)
+                for i in range(1, len(corners) - 1):
+                    indices.extend((corners[0], corners[i], corners[i + 1]))
+        except ValueError:
+            raise ValueError(f'{name}:{number}: can not read '
+                             f'{line.strip()[:40]!r}') from None
+
+    positions = np.frombuffer(positions, dtype=np.float32).reshape(-1, 3)
+    texcoords = np.frombuffer(texcoords, dtype=np.float32).reshape(-1, 2)
+    normals = np.frombuffer(normals, dtype=np.float32).reshape(-1, 3)
+    keys = np.frombuffer(keys, dtype=np.int64).reshape(-1, 3)
+    indices = np.frombuffer(indices, dtype=np.uint32)
+
+    for column, table, kind in ((0, positions, 'position'),
+                                (1, texcoords, 'texture coordinate'),
+                                (2, normals, 'normal')):
+        used = keys[:, column]
+        if len(used) and (used.max() >= len(table)
+                          or (column == 0 and used.min() < 0)):
+            raise ValueError(f'{name}: a face refers to a missing {kind}')
+
+    # gather the interleaved vertices
+    vertices = np.zeros((len(keys), VERTEX_SIZE), dtype=np.float32)
+    if len(keys):
+        vertices[:, POSITION] = positions[keys[:, 0]]
+        has_texcoord = keys[:, 1] >= 0
+        vertices[has_texcoord, TEXCOORD] = texcoords[keys[has_texcoord, 1]]
+        has_normal = keys[:, 2] >= 0
+        vertices[has_normal, NORMAL] = normals[keys[has_normal, 2]]
+
+        missing = ~has_normal
+        if missing.any():
+            smooth = vertex_normals(vertices[:, POSITION], indices)
+            vertices[missing, NORMAL] = smooth[missing]
+
+    return vertices, indices
+
+def vertex_normals(positions: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    '''
+    Computes smooth vertex normals as the area-weighted sum of the normals
+    of the triangles around each vertex
+
+    Parameters:
+        - positions: (n, 3) array of vertex positions
+        - indices: (m,) array of triangle indices
+
+    Returns:
+        - (n, 3) float32 array of unit normals, zero for unused vertices
+    '''
+    triangles = indices.reshape(-1, 3)
+    a, b, c = (positions[triangles[:, i]] for i in range(3))
+
+    # the cross product's length is twice the triangle's area
+    face_normals = np.cross(b - a, c - a)
+    normals = np.zeros_like(positions)
+    for i in range(3):
+        np.add.at(normals, triangles[:, i], face_normals)
+
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+    return normals
+
+def file_digest(path: str) -> bytes:
+    '''
+    Hashes a file's contents
+
+    Parameters:
+        - path: string path of the file
+
+    Returns:
+        - the 32-byte SHA-256 digest
+    '''
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+def write_cache(path: str, digest: bytes, vertices: np.ndarray,
+                indices: np.ndarray) -> None:
+    '''
+    Writes a mesh cache file. The file is written under a temporary name and
+    renamed, so a reader never sees half a cache.
+
+    Parameters:
+        - path: string path of the cache file
+        - digest: bytes, hash of the model the cache belongs to
+        - vertices: (n, 8) float32 array of interleaved vertices
+        - indices: (m,) uint32 array of triangle indices
+
+    Returns: None
+    '''
+    header = HEADER.pack(MAGIC, VERSION, digest, len(vertices), len(indices))
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(header.ljust(HEADER_SIZE, b'\0'))
+        file.write(np.ascontiguousarray(vertices, dtype=np.float32).tobytes())
+        file.write(np.ascontiguousarray(indices, dtype=np.uint32).tobytes())
+    os.replace(temporary, path)
+
+def read_cache(path: str,
+               digest: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Memory-maps a mesh cache file if it belongs to the given model contents
+
+    Parameters:
+        - path: string path of the cache file
+        - digest: bytes, hash of the model's current contents
+
+    Returns:
+        - a tuple of read-only (vertices, indices) views of the file, or
+            None if there is no cache or it is for other contents
+    '''
+    try:
+        raw = np.memmap(path, dtype=np.uint8, mode='r')
+    except (OSError, ValueError):
+        return None
+    if len(raw) < HEADER_SIZE:
+        return None
+
+    magic, version, cached, vertex_count, index_count = HEADER.unpack_from(
+        raw, 0)
+    if magic != MAGIC or version != VERSION or cached != digest:
+        return None
+
+    vertex_bytes = vertex_count * VERTEX_SIZE * 4
+    if HEADER_SIZE + vertex_bytes + index_count * 4 > len(raw):
+        return None
+
+    vertices = np.ndarray((vertex_count, VERTEX_SIZE), dtype=np.float32,
+                          buffer=raw, offset=HEADER_SIZE)
+    indices = np.ndarray((index_count,), dtype=np.uint32, buffer=raw,
+                         offset=HEADER_SIZE + vertex_bytes)
+    return vertices, indices
+
+def load_obj(path: str, cache: bool=True) -> MeshData:
+    '''
+    Loads an OBJ model, from its cache if the model hasn't changed since the
+    cache was written
+
+    Parameters:
+        - path: string path of the .obj file
+        - cache: boolean, False to always parse and never write a cache
+
+    Returns:
+        - the MeshData
+
+    Raises:
+        - ValueError if the model can't be parsed
+    '''
+    name = os.path.basename(path)
+    digest = file_digest(path)
+    cache_path = path + CACHE_SUFFIX
+
+    if cache:
+        cached = read_cache(cache_path, digest)
+        if cached is not None:
+            return MeshData(*cached, digest, name)
+
+    with open(path, 'rb') as file:
+        vertices, indices = parse_obj(file, name)
+
+    if cache:
+        try:
+            write_cache(cache_path, digest, vertices, indices)
+        except OSError:
+            # e.g. a read-only model directory: carry on without a cache
+            pass
+
+    return MeshData(vertices, indices, digest, name)
+
+def load_objs(paths: Sequence[str], cache: bool=True,
+              workers: int=None) -> List[MeshData]:
+    '''
+    Loads several OBJ models at once on a thread pool. Hashing, reading and
+    the array work run outside the interpreter lock, so the models overlap
+    where they spend most of their time once cached.
+
+    Parameters:
+        - paths: string paths of the .obj files
+        - cache: boolean, False to always parse and never write caches
+        - workers: integer number of threads, by default one per model up
+            to the pool's usual limit
+
+    Returns:
+        - a list of MeshData in the order of paths
+
+    Raises:
+        - ValueError if a model can't be parsed
+    '''
+    if workers is None:
+        workers = min(len(paths), 32, (os.cpu_count() or 1) + 4) or 1
+    with ThreadPoolExecutor(max_workers=workers,
+                            thread_name_prefix='obj') as pool:
+        return list(pool.map(lambda path: load_obj(path, cache), paths))
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -8,22 +8,573 @@
 ################################################################################
 
 # imports
-from typing import Tuple
+import math
+import numpy as np
+from typing import (Any, Callable, Dict, Hashable, Iterator, List, Optional,
+                    Sequence, Tuple)
+
+from .spatial_hash import SpatialHash
+from .broadphase import SweepAndPrune
+from .bvh import BVH
+from .narrowphase import aabb_overlap, shapes_collide
+from .raycast import ray_aabb, ray_shape
+from .rigid_body import RigidBodies
+from .scene_store import shape_boxes, stores_of
+
+Vector = Tuple[float, float, float]
+
+class Region():
+    def __init__(self, low: Vector, high: Vector, shapes: Sequence[Any],
+                 cell_size: float=2.0) -> None:
+        '''
+        Constructor for Region class. A block of static shapes with its own
+        collision index and BVH, e.g. one chunk of a streamed world, that
+        can be added to and dropped from the physics as a whole.
+
+        Parameters:
+            - low, high: corners of the block. The region's bounds also
+                cover any shape reaching out of it, so queries near the
+                edge still find those shapes.
+            - shapes: the shapes in the block
+            - cell_size: float, cell size of the region's spatial hash
+
+        Returns: None
+        '''
+        self.shapes = list(shapes)
+        self.index = SpatialHash(cell_size)
+        self.bvh = BVH()
+
+        # the bounds come from the store columns, and the indexes are built
+        # from them in one go
+        lows, highs = shape_boxes(self.shapes)
+        self.low, self.high = tuple(low), tuple(high)
+        if self.shapes:
+            self.low = tuple(np.minimum(low, lows.min(axis=0)).tolist())
+            self.high = tuple(np.maximum(high, highs.max(axis=0)).tolist())
+        self.index.insert_many(self.shapes, lows, highs)
+        self.bvh.insert_many(self.shapes, lows, highs)
+
+        # the shapes are followed through their stores, not one listener
+        # per shape
+        self.stores = stores_of(self.shapes)
+        for store in self.stores:
+            store.add_listener(self.__on_move)
+
+    def __on_move(self, shape: Any) -> None:
+        '''
+        Store listener, keeps the region's indexes and bounds up to date
+        when one of its shapes changes
+
+        Parameters:
+            - shape: the shape that changed
+
+        Returns: None
+        '''
+        if shape not in self.index:
+            return
+        low, high = shape.aabb()
+        self.index.move(shape, low, high)
+        self.bvh.move(shape, low, high)
+        self.low = tuple(map(min, self.low, low))
+        self.high = tuple(map(max, self.high, high))
+
+    def release(self) -> None:
+        '''
+        Stops following the region's shapes
+
+        Parameters: None
+
+        Returns: None
+        '''
+        for store in self.stores:
+            store.remove_listener(self.__on_move)
+        self.stores = []
 
 class Physics():
-    def __init__(self, room_size: Tuple[int, int, int]) -> None:
+    def __init__(self, room_size: Tuple[int, int, int],
+                 cell_size: float=2.0, worker: bool=False,
+                 tick_rate: float=120.0) -> None:
         '''
         Constructor for Physics class
 
         Parameters:
             - room_size: A tuple of three integers indicating the room
                 proportions
+            - cell_size: float, cell size of the spatial hash holding the
+                bounds of the shapes in the room
+            - worker: boolean, True to step the dynamic bodies in a worker
+                process on its own clock instead of in step()
+            - tick_rate: float, steps per second of the worker process
 
         Returns: None
         '''
         self.room_size = room_size
-        
-    def check_collision(self, position: Tuple[float, float, float]) -> bool:
+
+        # spatial index of static shape bounds, so collision queries only
+        # look at shapes near the query position. Dynamic bodies are tested
+        # from their arrays instead.
+        self.index = SpatialHash(cell_size)
+
+        # axis-sorted bounds of the same shapes, for finding shape-to-shape
+        # contacts
+        self.broadphase = SweepAndPrune()
+
+        # bounding volume hierarchy of the same shapes, for casting rays
+        self.bvh = BVH()
+
+        # blocks of static shapes indexed on their own, e.g. world chunks
+        self.regions: Dict[Hashable, Region] = {}
+
+        # optional world (see world.py) deciding where the walls are
+        # instead of room_size, and its active chunks as last given to the
+        # bodies
+        self.world = None
+        self.world_chunks = None
+
+        # state of the shapes that move under gravity
+        self.worker = worker
+        if worker:
+            # multiprocessing is only imported when a worker is wanted
+            from .physics_worker import PhysicsWorker
+            self.bodies = PhysicsWorker(room_size, tick_rate=tick_rate)
+        else:
+            self.bodies = RigidBodies(room_size)
+
+        # set when sync moves bodies; the broadphase and BVH each take their
+        # new bounds in one go before they are next queried
+        self.broadphase_stale = False
+        self.bvh_stale = False
+
+        # functions called with the store rows every sync moved (see
+        # add_listener)
+        self.listeners: List[Callable[[Any, Any], None]] = []
+
+        # stores whose listener follows the static shapes in the index
+        self.stores: List[Any] = []
+
+    def __watch(self, shapes: Sequence[Any]) -> None:
+        '''
+        Follows static shapes through a listener on each of their stores,
+        added once per store rather than once per shape
+
+        Parameters:
+            - shapes: the shapes to follow
+
+        Returns: None
+        '''
+        for store in stores_of(shapes):
+            if not any(store is watched for watched in self.stores):
+                store.add_listener(self.__on_move)
+                self.stores.append(store)
+
+    def add_listener(self, listener: Callable[[Any, Any], None]) -> None:
+        '''
+        Registers a function to call after every sync that moved bodies.
+        sync writes the shapes' positions to their store without calling
+        the shapes' own listeners, so anything else following them, e.g. a
+        renderer, is updated through this in bulk.
+
+        Parameters:
+            - listener: a function taking the SceneStore and an integer
+                array of the rows that moved
+
+        Returns: None
+        '''
+        self.listeners.append(listener)
+
+    def add_body(self, shape: Any) -> None:
+        '''
+        Adds a shape to the collision index. The index follows the shape as
+        it moves.
+
+        Parameters:
+            - shape: the shape to add
+
+        Returns: None
+        '''
+        low, high = shape.aabb()
+        self.index.insert(shape, low, high)
+        self.broadphase.insert(shape, low, high)
+        self.bvh.insert(shape, low, high)
+        self.__watch((shape,))
+
+    def add_dynamic_body(self, shape: Any, mass: float=1.0,
+                         velocity: Sequence[float]=(0.0, 0.0, 0.0)) -> None:
+        '''
+        Adds a shape that falls under gravity and bounces off the room. The
+        simulation owns its position from then on, so the indexes follow
+        the body rather than listening to the shape.
+
+        Parameters:
+            - shape: the shape to add
+            - mass: a float, the shape's mass
+            - velocity: the shape's starting velocity
+
+        Returns: None
+        '''
+        low, high = shape.aabb()
+        self.broadphase.insert(shape, low, high)
+        self.bvh.insert(shape, low, high)
+        self.bodies.add(shape, mass, velocity)
+
+    def add_bodies(self, shapes: Sequence[Any], dynamic: bool=False) -> None:
+        '''
+        Adds many shapes at once. Their bounds are read from the store
+        columns and every index takes them as whole arrays; the broadphase
+        sorts them in one go the next time contacts are needed.
+
+        Parameters:
+            - shapes: the shapes to add
+            - dynamic: a boolean, True if the shapes fall under gravity
+
+        Returns: None
+        '''
+        lows, highs = shape_boxes(shapes)
+
+        if dynamic:
+            self.bodies.add_many(shapes, lows, highs)
+        else:
+            self.index.insert_many(shapes, lows, highs)
+            self.__watch(shapes)
+        self.broadphase.insert_many(shapes, lows, highs)
+        self.bvh.insert_many(shapes, lows, highs)
+
+    def clear(self) -> None:
+        '''
+        Removes every shape, keeping the simulation settings
+
+        Parameters: None
+
+        Returns: None
+        '''
+        for store in self.stores:
+            store.remove_listener(self.__on_move)
+        self.stores = []
+
+        self.index = SpatialHash(self.index.cell_size)
+        self.broadphase = SweepAndPrune()
+        self.bvh = BVH()
+        self.bodies.clear()
+        self.broadphase_stale = self.bvh_stale = False
+
+        for region in self.regions.values():
+            region.release()
+        self.regions = {}
+
+    def add_region(self, key: Hashable, low: Vector, high: Vector,
+                   shapes: Sequence[Any]) -> Region:
+        '''
+        Adds a block of static shapes with its own index. Queries look in
+        every region whose bounds they reach, so they work across region
+        borders.
+
+        Parameters:
+            - key: any hashable naming the region
+            - low, high: corners of the block
+            - shapes: the shapes in the block
+
+        Returns:
+            - the new Region
+        '''
+        region = Region(low, high, shapes, self.index.cell_size)
+        self.regions[key] = region
+        return region
+
+    def remove_region(self, key: Hashable) -> None:
+        '''
+        Drops a region and its index in one go
+
+        Parameters:
+            - key: the region's name
+
+        Returns: None
+        '''
+        self.regions.pop(key).release()
+
+    def __regions_near(self, low: Sequence[float],
+                       high: Sequence[float]) -> Iterator[Region]:
+        '''
+        Yields the regions whose bounds overlap a box
+
+        Parameters:
+            - low, high: corners of the box
+
+        Returns:
+            - an iterator of Regions
+        '''
+        for region in self.regions.values():
+            if aabb_overlap(low, high, region.low, region.high):
+                yield region
+
+    def close(self) -> None:
+        '''
+        Stops the physics worker process, if there is one
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.worker:
+            self.bodies.close()
+
+    def remove_body(self, shape: Any) -> None:
+        '''
+        Removes a shape from the collision index
+
+        Parameters:
+            - shape: the shape to remove
+
+        Returns: None
+        '''
+        if id(shape) in self.bodies.indices:
+            self.bodies.remove(shape)
+        else:
+            self.index.remove(shape)
+        self.broadphase.remove(shape)
+        self.bvh.remove(shape)
+
+    def __on_move(self, shape: Any) -> None:
+        '''
+        Store listener, updates a static shape's entries in the indexes
+        when it changes
+
+        Parameters:
+            - shape: the shape that changed
+
+        Returns: None
+        '''
+        if shape not in self.index:
+            return
+        bounds = shape.aabb()
+        self.index.move(shape, *bounds)
+        self.broadphase.move(shape, *bounds)
+        self.bvh.move(shape, *bounds)
+
+    def __follow_bodies(self, index: Any) -> None:
+        '''
+        Gives the broadphase or BVH the current bounds of every dynamic
+        body
+
+        Parameters:
+            - index: the SweepAndPrune or BVH to update
+
+        Returns: None
+        '''
+        lows, highs = self.bodies.bounds()
+        index.move_many(self.bodies.shapes, lows, highs)
+
+    def find_contacts(self) -> List[Tuple[Any, Any]]:
+        '''
+        Finds every pair of shapes that are touching. The broadphase narrows
+        the candidates down to pairs with overlapping bounding boxes, then
+        each pair gets an exact test.
+
+        Parameters: None
+
+        Returns:
+            - a list of (shape, shape) tuples
+        '''
+        if self.broadphase_stale:
+            self.__follow_bodies(self.broadphase)
+            self.broadphase_stale = False
+        self.broadphase.update()
+        return [pair for pair in self.broadphase.overlapping_pairs()
+                if shapes_collide(*pair)]
+
+    def check_collision(self, position: Tuple[float, float, float],
+                        radius: float=0.0) -> bool:
+        '''
+        Checks for collision with the room walls, ceiling, floor and any shape
+        in the room
+
+        Parameters:
+            - position: a tuple of three floats indicating the camera position
+            - radius: a float giving the camera some size, 0 tests a point
+
+        Returns:
+            - a boolean indicating whether or not the camera has run into a 
+                wall, ceiling, floor or shape
+        '''
+        if self.check_walls(position):
+            return True
+        if self.index.query_sphere(position, radius):
+            return True
+        if self.bodies.query_sphere(position, radius):
+            return True
+
+        x, y, z = position
+        low = (x - radius, y - radius, z - radius)
+        high = (x + radius, y + radius, z + radius)
+        return any(region.index.query_sphere(position, radius)
+                   for region in self.__regions_near(low, high))
+
+    def check_capsule(self, start: Tuple[float, float, float],
+                      end: Tuple[float, float, float], radius: float) -> bool:
+        '''
+        Checks whether a capsule, e.g. a body or the path swept by a moving
+        sphere, overlaps any shape or leaves the room
+
+        Parameters:
+            - start: the center of one end of the capsule
+            - end: the center of the other end of the capsule
+            - radius: a float, the capsule radius
+
+        Returns:
+            - a boolean indicating whether there is a collision
+        '''
+        if self.check_walls(start) or self.check_walls(end):
+            return True
+        if self.index.query_capsule(start, end, radius):
+            return True
+        if self.bodies.query_capsule(start, end, radius):
+            return True
+
+        low = tuple(min(start[i], end[i]) - radius for i in range(3))
+        high = tuple(max(start[i], end[i]) + radius for i in range(3))
+        return any(region.index.query_capsule(start, end, radius)
+                   for region in self.__regions_near(low, high))
+
+    def shapes_near(self, position: Tuple[float, float, float],
+                    radius: float) -> List[Any]:
+        '''
+        Finds the shapes whose bounds overlap a sphere
+
+        Parameters:
+            - position: the sphere center
+            - radius: a float, the sphere radius
+
+        Returns:
+            - a list of shapes
+        '''
+        shapes = self.index.query_sphere(position, radius)
+        shapes.extend(self.bodies.query_sphere(position, radius))
+
+        x, y, z = position
+        low = (x - radius, y - radius, z - radius)
+        high = (x + radius, y + radius, z + radius)
+        for region in self.__regions_near(low, high):
+            shapes.extend(region.index.query_sphere(position, radius))
+        return shapes
+
+    def raycast(self, origin: Vector, direction: Vector,
+                max_distance: float=math.inf) -> Optional[Tuple[Any, float]]:
+        '''
+        Finds the first shape along a ray. The BVH narrows the search down to
+        the shapes whose bounds the ray passes through, then each of those
+        gets an exact test against its real surface.
+
+        Parameters:
+            - origin: the start of the ray
+            - direction: the direction of the ray, distances are in units
+                of its length
+            - max_distance: a float, how far along the ray to look
+
+        Returns:
+            - a tuple of (shape, distance), or None if no shape was hit
+        '''
+        if self.bvh_stale:
+            self.__follow_bodies(self.bvh)
+            self.bvh_stale = False
+        hit = self.bvh.raycast(origin, direction, max_distance, ray_shape)
+        if hit is not None:
+            max_distance = hit[1]
+
+        # regions only need a look if the ray reaches them before the
+        # closest hit so far
+        for region in self.regions.values():
+            if ray_aabb(origin, direction, region.low, region.high,
+                        max_distance) is None:
+                continue
+            found = region.bvh.raycast(origin, direction, max_distance,
+                                       ray_shape)
+            if found is not None:
+                hit = found
+                max_distance = found[1]
+        return hit
+
+    def step(self, dt: float) -> None:
+        '''
+        Advances the dynamic bodies by dt seconds. The shapes aren't moved
+        until sync() is called. Does nothing for the bodies when they run in
+        a worker process, which steps them on its own clock. With a world,
+        the bodies are first told which chunks are active if that changed.
+
+        Parameters:
+            - dt: a float, the time step in seconds
+
+        Returns: None
+        '''
+        world = self.world
+        chunks = None if world is None else frozenset(world.active)
+        if chunks != self.world_chunks:
+            self.world_chunks = chunks
+            if world is None:
+                self.bodies.set_world(None, ())
+            else:
+                self.bodies.set_world(world.chunk_size, chunks)
+        self.bodies.step(dt)
+
+    def sync(self, alpha: float=1.0) -> int:
+        '''
+        Moves the dynamic shapes to their simulated positions, in bulk, and
+        passes them to the listeners
+
+        Parameters:
+            - alpha: a float, where to place the shapes between the previous
+                step (0) and the latest step (1)
+
+        Returns:
+            - the integer number of shapes moved
+        '''
+        bodies = self.bodies
+        moved = bodies.sync(alpha)
+        if not moved:
+            return 0
+
+        self.broadphase_stale = self.bvh_stale = True
+        rows = bodies.moved_rows
+        if rows is not None:
+            for listener in self.listeners:
+                listener(bodies.store, rows)
+        return moved
+
+    def step_camera(self, position: Vector, velocity: float, dt: float,
+                    radius: float=0.0,
+                    eye_height: float=1.7) -> Tuple[Vector, float, bool]:
+        '''
+        Lets the camera fall under gravity until it stands on the floor or on
+        top of a shape
+
+        Parameters:
+            - position: a tuple of three floats, the camera position
+            - velocity: a float, the camera's vertical velocity
+            - dt: a float, the time step in seconds
+            - radius: a float, the camera's collision radius
+            - eye_height: a float, how far above the floor the camera sits
+                when standing
+
+        Returns:
+            - a tuple of the new position, new vertical velocity and whether
+                the camera is standing on something
+        '''
+        velocity += self.bodies.gravity * dt
+        x, y, z = position
+        new_y = y + velocity * dt
+
+        # standing on the floor, of the room or of every chunk of a world
+        height = (self.room_size[1] if self.world is None
+                  else self.world.chunk_size[1])
+        floor = eye_height - height / 2
+        if new_y <= floor:
+            return (x, floor, z), 0.0, True
+
+        # blocked by a shape (or the ceiling) on the way
+        if self.check_collision((x, new_y, z), radius):
+            return position, 0.0, velocity < 0
+
+        return (x, new_y, z), velocity, False
+
+    def check_walls(self, position: Tuple[float, float, float]) -> bool:
         '''
         Checks for collision with the room walls, ceiling, and floor
 
@@ -34,6 +585,10 @@ class Physics():
             - a boolean indicating whether or not the camera has run into a 
                 wall, ceiling, or floor
         '''
+        # a streamed world is open wherever a chunk is loaded
+        if self.world is not None:
+            return not self.world.contains(position)
+
         # calculate half values from room tuple
         half_width, half_height, half_length = self.room_size
 
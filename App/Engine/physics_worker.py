@@ -0,0 +1,579 @@
+################################################################################
+# File: physics_worker.py
+# Date: 18 October 2026
+# Description:
+#
+# Runs the rigid body simulation in a worker process so it doesn't compete
+# with rendering for the interpreter. The worker steps on its own clock and
+# publishes body state into one of two shared memory buffers; the engine
+# reads the other one in place, so it always sees a whole step without
+# copying or pickling.
+#
+# Body structure (adding, removing) is still owned by the engine process,
+# which forwards every change to the worker through a command queue.
+#
+################################################################################
+
+# imports
+import atexit
+import multiprocessing
+import queue
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Any, List, Sequence, Tuple
+
+from .rigid_body import RigidBodies
+
+# control block slots
+FRONT, READING = 0, 1
+CONTROL_SLOTS = 2
+
+# per-buffer stamp slots
+TIME, COUNT, GENERATION = 0, 1, 2
+STAMP_SLOTS = 3
+
+class SharedState():
+    def __init__(self, buffer: memoryview, capacity: int) -> None:
+        '''
+        Constructor for SharedState class. Lays NumPy arrays over a shared
+        memory block:
+
+            control     int64 (2)           front buffer, buffer being read
+            stamps      float64 (2, 3)      step time, body count and
+                                            generation of each buffer
+            velocities  float32 (2, n, 3)   latest step, per buffer
+            positions   float32 (2, n, 3)   latest step, per buffer
+            previous    float32 (2, n, 3)   step before it, per buffer
+
+        Parameters:
+            - buffer: the shared memory block's buffer
+            - capacity: integer number of bodies the block holds
+
+        Returns: None
+        '''
+        self.capacity = capacity
+        offset = 0
+
+        def view(shape, dtype):
+            nonlocal offset
+            array = np.ndarray(shape, dtype=dtype, buffer=buffer,
+                               offset=offset)
+            offset += array.nbytes
+            return array
+
+        self.control = view(CONTROL_SLOTS, np.int64)
+        self.stamps = view((2, STAMP_SLOTS), np.float64)
+        self.velocities = view((2, capacity, 3), np.float32)
+        self.positions = view((2, capacity, 3), np.float32)
+        self.previous = view((2, capacity, 3), np.float32)
+
+    @staticmethod
+    def size(capacity: int) -> int:
+        '''
+        Bytes needed for a given capacity
+
+        Parameters:
+            - capacity: integer number of bodies
+
+        Returns:
+            - the integer size in bytes
+        '''
+        return (CONTROL_SLOTS * 8 + 2 * STAMP_SLOTS * 8
+                + capacity * 3 * 4 * 6)
+
+def run_worker(name: str, capacity: int, settings: Tuple, tick_rate: float,
+               commands: Any, lock: Any) -> None:
+    '''
+    Worker process entry point. Applies queued commands, steps the bodies
+    at the tick rate and publishes every step to the back buffer.
+
+    Parameters:
+        - name: string name of the shared memory block
+        - capacity: integer number of bodies the block holds
+        - settings: tuple of room size, gravity, damping and restitution
+        - tick_rate: float, steps per second
+        - commands: the queue of commands from the engine process
+        - lock: the lock guarding the control block
+
+    Returns: None
+    '''
+    block = shared_memory.SharedMemory(name=name)
+    shared = SharedState(block.buf, capacity)
+    control = shared.control
+
+    bodies = RigidBodies(*settings, capacity=capacity)
+    generation = 0
+
+    dt = 1.0 / tick_rate
+    next_tick = time.perf_counter()
+    try:
+        while True:
+            # apply every structural change queued so far
+            while True:
+                try:
+                    command = commands.get_nowait()
+                except queue.Empty:
+                    break
+                if command[0] == 'stop':
+                    return
+                generation = apply_command(bodies, command, generation)
+
+            now = time.perf_counter()
+            if now < next_tick:
+                time.sleep(min(next_tick - now, 0.002))
+                continue
+
+            # don't try to catch up after a long stall
+            next_tick = max(next_tick + dt, now - 0.25)
+            bodies.step(dt)
+            publish(shared, lock, bodies, generation)
+    finally:
+        # drop the views before closing the block
+        del shared, control, bodies
+        block.close()
+
+def apply_command(bodies: RigidBodies, command: Tuple,
+                  generation: int) -> int:
+    '''
+    Applies one command from the engine process to the worker's bodies
+
+    Parameters:
+        - bodies: the worker's RigidBodies, without shapes
+        - command: a tuple of the command name and its arguments
+        - generation: integer generation before the command
+
+    Returns:
+        - the integer generation after the command
+    '''
+    name = command[0]
+    if name == 'add':
+        _, generation, start, centers, velocities, masses, extents = command
+        end = start + len(centers)
+        bodies.positions[start:end] = centers
+        bodies.previous[start:end] = centers
+        bodies.velocities[start:end] = velocities
+        bodies.masses[start:end] = masses
+        bodies.half_extents[start:end] = extents
+        bodies.count = end
+    elif name == 'remove':
+        _, generation, index = command
+        last = bodies.count - 1
+        for array in (bodies.positions, bodies.velocities, bodies.masses,
+                      bodies.half_extents, bodies.previous):
+            array[index] = array[last]
+        bodies.count = last
+    elif name == 'clear':
+        _, generation = command
+        bodies.count = 0
+    elif name == 'impulse':
+        # an impulse sent before a later structural change would land on
+        # whatever body has moved into its row since
+        _, stamp, index, impulse = command
+        if stamp == generation:
+            bodies.apply_impulse(index, impulse)
+    elif name == 'room':
+        bodies.room_size = command[1]
+    elif name == 'world':
+        bodies.set_world(command[1], command[2])
+    return generation
+
+def publish(shared: SharedState, lock: Any, bodies: RigidBodies,
+            generation: int) -> None:
+    '''
+    Copies the latest step into the back buffer and makes it the front one.
+    Waits while the engine is still reading the back buffer from before.
+
+    Parameters:
+        - shared: the shared state views
+        - lock: the lock guarding the control block
+        - bodies: the worker's RigidBodies
+        - generation: integer generation the step belongs to
+
+    Returns: None
+    '''
+    control = shared.control
+    while True:
+        with lock:
+            back = 1 - control[FRONT]
+            if control[READING] != back:
+                break
+        time.sleep(0.0001)
+
+    n = bodies.count
+    shared.positions[back, :n] = bodies.positions[:n]
+    shared.previous[back, :n] = bodies.previous[:n]
+    shared.velocities[back, :n] = bodies.velocities[:n]
+    shared.stamps[back] = (time.perf_counter(), n, generation)
+
+    with lock:
+        control[FRONT] = back
+
+class PhysicsWorker():
+    def __init__(self, room_size: Tuple[int, int, int], gravity: float=-9.81,
+                 damping: float=0.1, restitution: float=0.4,
+                 capacity: int=1024, tick_rate: float=120.0) -> None:
+        '''
+        Constructor for PhysicsWorker class. Drop-in replacement for
+        RigidBodies that steps the bodies in a worker process.
+
+        Parameters:
+            - room_size: tuple of three integers, the room the bodies are
+                kept inside
+            - gravity: float, acceleration along y in units per second squared
+            - damping: float, fraction of velocity lost per second
+            - restitution: float, fraction of speed kept when bouncing
+            - capacity: integer number of bodies to allocate room for
+            - tick_rate: float, steps per second in the worker
+
+        Returns: None
+        '''
+        self._room_size = room_size
+        self.gravity = gravity
+        self.damping = damping
+        self.restitution = restitution
+        self.tick_rate = tick_rate
+
+        # shapes, offsets and last synced positions stay in this process
+        self.local = RigidBodies(room_size, gravity, damping, restitution,
+                                 capacity)
+
+        # bumped on every add, remove or clear; snapshots from an older
+        # generation have bodies in the wrong rows and are skipped
+        self.generation = 0
+
+        self.context = multiprocessing.get_context('spawn')
+        self.process = None
+        self.__start(capacity)
+        atexit.register(self.close)
+
+    def __start(self, capacity: int) -> None:
+        '''
+        Creates the shared memory block and starts the worker
+
+        Parameters:
+            - capacity: integer number of bodies the block holds
+
+        Returns: None
+        '''
+        self.capacity = capacity
+        self.block = shared_memory.SharedMemory(
+            create=True, size=SharedState.size(capacity))
+        self.shared = SharedState(self.block.buf, capacity)
+        self.shared.control[:] = (0, -1)
+        self.shared.stamps[:] = 0
+        self.shared.stamps[:, GENERATION] = -1
+
+        self.commands = self.context.Queue()
+        self.lock = self.context.Lock()
+        settings = (self._room_size, self.gravity, self.damping,
+                    self.restitution)
+        self.process = self.context.Process(
+            target=run_worker, daemon=True, name='physics',
+            args=(self.block.name, capacity, settings, self.tick_rate,
+                  self.commands, self.lock))
+        self.process.start()
+
+    def __stop(self) -> None:
+        '''
+        Stops the worker and frees the shared memory block
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.process is None:
+            return
+        self.commands.put(('stop',))
+        self.process.join(timeout=2.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
+
+        self.shared = None
+        self.block.close()
+        self.block.unlink()
+
+    def close(self) -> None:
+        '''
+        Shuts the worker down
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.__stop()
+
+    def __grow(self, needed: int) -> None:
+        '''
+        Restarts the worker with a bigger shared memory block, carrying over
+        the current state
+
+        Parameters:
+            - needed: integer number of bodies that must fit
+
+        Returns: None
+        '''
+        # the worker only knows the rows it was sent; bodies added since
+        # start from their local state
+        local = self.local
+        n = local.count
+        positions = local.positions[:n].copy()
+        velocities = local.velocities[:n].copy()
+        published, moving = self.snapshot(wait=True)
+        known = min(len(published), n)
+        positions[:known] = published[:known]
+        velocities[:known] = moving[:known]
+
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+
+        self.__stop()
+        self.__start(capacity)
+        self.generation += 1
+        self.commands.put(('add', self.generation, 0, positions, velocities,
+                           local.masses[:n].copy(),
+                           local.half_extents[:n].copy()))
+
+    def snapshot(self, wait: bool=False,
+                 timeout: float=1.0) -> Tuple[np.ndarray, np.ndarray]:
+        '''
+        Copies the latest published positions and velocities. Both come from
+        the same buffer, so they belong to the same step.
+
+        Parameters:
+            - wait: boolean, True to wait for the worker to publish a step
+                with every add, remove and clear sent so far applied
+            - timeout: float, seconds to wait for that step
+
+        Returns:
+            - a tuple of (positions, velocities) arrays in body order, for
+                as many bodies as the worker has published. If the worker
+                hasn't caught up with the latest change, the positions last
+                written to the shapes and the local velocities are returned
+                instead.
+        '''
+        shared = self.shared
+        deadline = time.perf_counter() + timeout
+        while True:
+            with self.lock:
+                front = shared.control[FRONT]
+                _, count, generation = shared.stamps[front]
+                if generation == self.generation:
+                    count = int(count)
+                    return (shared.positions[front, :count].copy(),
+                            shared.velocities[front, :count].copy())
+            if not wait or time.perf_counter() > deadline:
+                break
+            time.sleep(0.001)
+
+        # the rows the worker published are from before a change, so they
+        # can't be matched to bodies
+        local = self.local
+        n = local.count
+        return local.synced[:n].copy(), local.velocities[:n].copy()
+
+    @property
+    def room_size(self) -> Tuple[int, int, int]:
+        return self._room_size
+
+    @room_size.setter
+    def room_size(self, room_size: Tuple[int, int, int]) -> None:
+        self._room_size = room_size
+        self.local.room_size = room_size
+        self.commands.put(('room', room_size))
+
+    def set_world(self, chunk_size: Sequence[float],
+                  coords: Sequence[Tuple[int, int]]) -> None:
+        '''
+        Keeps the bodies inside the active chunks of a streamed world, see
+        RigidBodies.set_world
+
+        Parameters:
+            - chunk_size: the width, height and length of every chunk, or
+                None to go back to room_size
+            - coords: the (x, z) grid coordinates of the active chunks
+
+        Returns: None
+        '''
+        coords = list(coords)
+        self.local.set_world(chunk_size, coords)
+        self.commands.put(('world', chunk_size, coords))
+
+    @property
+    def count(self) -> int:
+        return self.local.count
+
+    @property
+    def shapes(self):
+        return self.local.shapes
+
+    @property
+    def indices(self):
+        return self.local.indices
+
+    @property
+    def moved_rows(self) -> np.ndarray:
+        return self.local.moved_rows
+
+    @property
+    def store(self) -> Any:
+        return self.local.store
+
+    def __len__(self) -> int:
+        return self.local.count
+
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.local.bounds()
+
+    def query_sphere(self, center: Sequence[float],
+                     radius: float=0.0) -> List[Any]:
+        return self.local.query_sphere(center, radius)
+
+    def query_capsule(self, start: Sequence[float], end: Sequence[float],
+                      radius: float) -> List[Any]:
+        return self.local.query_capsule(start, end, radius)
+
+    def __send_added(self, start: int) -> None:
+        '''
+        Forwards bodies added to the local arrays to the worker
+
+        Parameters:
+            - start: integer index of the first new body
+
+        Returns: None
+        '''
+        local = self.local
+        end = local.count
+        if end > self.capacity:
+            self.__grow(end)
+            return
+
+        self.generation += 1
+        self.commands.put(('add', self.generation, start,
+                           local.positions[start:end].copy(),
+                           local.velocities[start:end].copy(),
+                           local.masses[start:end].copy(),
+                           local.half_extents[start:end].copy()))
+
+    def add(self, shape: Any, mass: float=1.0,
+            velocity: Sequence[float]=(0.0, 0.0, 0.0)) -> int:
+        '''
+        Adds a shape as a dynamic body
+
+        Parameters:
+            - shape: the shape to simulate
+            - mass: float, the body's mass
+            - velocity: the body's starting velocity
+
+        Returns:
+            - the integer index of the body
+        '''
+        index = self.local.add(shape, mass, velocity)
+        self.__send_added(index)
+        return index
+
+    def add_many(self, shapes: Sequence[Any], lows: np.ndarray,
+                 highs: np.ndarray, masses: Sequence[float]=None) -> None:
+        '''
+        Adds many shapes as dynamic bodies at rest
+
+        Parameters:
+            - shapes: the shapes to simulate
+            - lows, highs: (n, 3) arrays of the shapes' bounding box corners
+            - masses: optional masses, 1.0 each by default
+
+        Returns: None
+        '''
+        start = self.local.count
+        self.local.add_many(shapes, lows, highs, masses)
+        self.__send_added(start)
+
+    def remove(self, shape: Any) -> None:
+        '''
+        Removes a shape's body; the worker moves its last body into the slot
+        just like RigidBodies.remove
+
+        Parameters:
+            - shape: the shape to stop simulating
+
+        Returns: None
+        '''
+        index = self.local.indices[id(shape)]
+        self.local.remove(shape)
+        self.generation += 1
+        self.commands.put(('remove', self.generation, index))
+
+    def clear(self) -> None:
+        '''
+        Removes every body
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.local.clear()
+        self.generation += 1
+        self.commands.put(('clear', self.generation))
+
+    def apply_impulse(self, index: int, impulse: Sequence[float]) -> None:
+        '''
+        Changes a body's velocity by impulse / mass, in the worker. The
+        impulse is dropped if a body is added or removed before the worker
+        gets to it, since the index may then name another body.
+
+        Parameters:
+            - index: integer index of the body
+            - impulse: the impulse vector
+
+        Returns: None
+        '''
+        self.commands.put(('impulse', self.generation, index,
+                           tuple(impulse)))
+
+    def step(self, dt: float) -> None:
+        '''
+        Does nothing: the worker steps on its own clock
+
+        Parameters:
+            - dt: float, ignored
+
+        Returns: None
+        '''
+        return
+
+    def sync(self, alpha: float=1.0) -> int:
+        '''
+        Writes the latest published step back to the shapes. The front
+        buffer is read in place while the worker is kept off it.
+
+        Parameters:
+            - alpha: float, ignored; the shapes are interpolated by how long
+                ago the worker's last step finished
+
+        Returns:
+            - the integer number of shapes moved
+        '''
+        shared = self.shared
+        control = shared.control
+        with self.lock:
+            front = control[FRONT]
+            control[READING] = front
+
+        try:
+            when, count, generation = shared.stamps[front]
+            if generation != self.generation or count != self.local.count:
+                return 0
+
+            # the worker runs a step ahead of what is shown
+            dt = 1.0 / self.tick_rate
+            alpha = min(1.0, max(0.0, (time.perf_counter() - when) / dt))
+            return self.local.sync(alpha, shared.positions[front],
+                                   shared.previous[front])
+        finally:
+            with self.lock:
+                control[READING] = -1
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,249 @@
+################################################################################
+# File: profiler.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the frame profiler. Times the phases of each frame, keeps
+# rolling percentiles, counts draw calls and vertices, and can capture a range
+# of frames as Chrome trace-event JSON (open in chrome://tracing or Perfetto).
+#
+################################################################################
+
+# imports
+import json
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+class Phase():
+    def __init__(self, profiler: 'FrameProfiler', name: str) -> None:
+        '''
+        Constructor for Phase class. A reusable context manager that adds the
+        time spent inside it to one phase of the current frame.
+
+        Parameters:
+            - profiler: the FrameProfiler that owns the phase
+            - name: string name of the phase
+
+        Returns: None
+        '''
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self) -> 'Phase':
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        end = time.perf_counter_ns()
+        profiler = self.profiler
+        profiler.current[self.name] = (profiler.current.get(self.name, 0)
+                                       + end - self.start)
+        if profiler.capturing:
+            profiler.events.append((self.name, self.start, end))
+
+class FrameProfiler():
+    def __init__(self, window: int=240) -> None:
+        '''
+        Constructor for FrameProfiler class
+
+        Parameters:
+            - window: integer number of recent frames the percentiles cover
+
+        Returns: None
+        '''
+        self.window = window
+
+        # nanoseconds per phase for the frame in progress
+        self.current: Dict[str, int] = {}
+
+        # milliseconds per phase (and 'frame') for recent frames
+        self.history: Dict[str, Deque[float]] = {}
+
+        self.phases: Dict[str, Phase] = {}
+        self.frame_start = 0
+        self.frame_count = 0
+
+        # draw calls and vertices submitted in the frame in progress and the
+        # last finished frame
+        self.draw_calls = 0
+        self.vertices = 0
+        self.last_draw_calls = 0
+        self.last_vertices = 0
+
+        # trace capture
+        self.capturing = False
+        self.events: List[Tuple[str, int, int]] = []
+        self.counters: List[Tuple[int, int, int]] = []
+
+    def phase(self, name: str) -> Phase:
+        '''
+        Returns the context manager timing a phase, e.g.
+
+            with profiler.phase('draw_room'):
+                ...
+
+        Parameters:
+            - name: string name of the phase
+
+        Returns:
+            - the Phase context manager
+        '''
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = Phase(self, name)
+        return phase
+
+    def count_draw(self, calls: int, vertices: int) -> None:
+        '''
+        Adds to the draw call and vertex counters of the current frame
+
+        Parameters:
+            - calls: integer number of draw calls
+            - vertices: integer number of vertices submitted
+
+        Returns: None
+        '''
+        self.draw_calls += calls
+        self.vertices += vertices
+
+    def sample(self, name: str, seconds: float) -> None:
+        '''
+        Adds a measured time to the current frame that wasn't timed with a
+        phase, e.g. how late the frame pacer woke up
+
+        Parameters:
+            - name: string name to report the time under
+            - seconds: float time in seconds
+
+        Returns: None
+        '''
+        self.current[name] = (self.current.get(name, 0)
+                              + int(seconds * 1e9))
+
+    def begin_frame(self) -> None:
+        '''
+        Starts timing a frame
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.current = {}
+        self.draw_calls = 0
+        self.vertices = 0
+        self.frame_start = time.perf_counter_ns()
+
+    def end_frame(self) -> None:
+        '''
+        Finishes the frame and adds its timings to the rolling history
+
+        Parameters: None
+
+        Returns: None
+        '''
+        end = time.perf_counter_ns()
+        self.current['frame'] = end - self.frame_start
+
+        for name, nanoseconds in self.current.items():
+            samples = self.history.get(name)
+            if samples is None:
+                samples = self.history[name] = deque(maxlen=self.window)
+            samples.append(nanoseconds / 1e6)
+
+        self.last_draw_calls = self.draw_calls
+        self.last_vertices = self.vertices
+        self.frame_count += 1
+
+        if self.capturing:
+            self.events.append(('frame', self.frame_start, end))
+            self.counters.append((end, self.draw_calls, self.vertices))
+
+    def percentiles(self, name: str) -> Tuple[float, float, float]:
+        '''
+        Rolling percentiles of one phase over the recent frames
+
+        Parameters:
+            - name: string name of the phase, or 'frame' for whole frames
+
+        Returns:
+            - a tuple of the p50, p95 and p99 times in milliseconds
+        '''
+        samples = sorted(self.history.get(name, ()))
+        if not samples:
+            return 0.0, 0.0, 0.0
+
+        last = len(samples) - 1
+        return tuple(samples[min(last, int(fraction * len(samples)))]
+                     for fraction in (0.50, 0.95, 0.99))
+
+    def summary(self) -> List[str]:
+        '''
+        Formats the percentiles and counters as lines of text
+
+        Parameters: None
+
+        Returns:
+            - a list of strings, one per phase
+        '''
+        lines = ['phase            p50    p95    p99 ms']
+        names = sorted(self.history, key=lambda name: name != 'frame')
+        for name in names:
+            p50, p95, p99 = self.percentiles(name)
+            lines.append(f'{name:<14}{p50:>6.2f} {p95:>6.2f} {p99:>6.2f}')
+        lines.append(f'draw calls {self.last_draw_calls}  '
+                     f'vertices {self.last_vertices}')
+        return lines
+
+    def start_capture(self) -> None:
+        '''
+        Starts recording trace events for every following frame
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.events = []
+        self.counters = []
+        self.capturing = True
+
+    def stop_capture(self) -> None:
+        '''
+        Stops recording trace events
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.capturing = False
+
+    def export_chrome_trace(self, path: str) -> None:
+        '''
+        Writes the captured frames as Chrome trace-event JSON
+
+        Parameters:
+            - path: string path of the file to write
+
+        Returns: None
+        '''
+        pid = os.getpid()
+        trace = []
+        for name, start, end in self.events:
+            trace.append({
+                'name': name, 'cat': 'engine', 'ph': 'X', 'pid': pid,
+                'tid': 0, 'ts': start / 1e3, 'dur': (end - start) / 1e3
+            })
+        for timestamp, calls, vertices in self.counters:
+            trace.append({
+                'name': 'draw', 'ph': 'C', 'pid': pid, 'tid': 0,
+                'ts': timestamp / 1e3,
+                'args': {'calls': calls, 'vertices': vertices}
+            })
+
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, file)
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
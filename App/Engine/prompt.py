@@ -0,0 +1,143 @@
+################################################################################
+# File: prompt.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the object prompt. The Tkinter dialogs run on their own
+# thread with one long-lived Tk root, so the game keeps rendering while they
+# are open. Finished prompts are handed back through a callback. Tkinter is
+# only imported the first time the prompt opens.
+#
+################################################################################
+
+# imports
+import queue
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+from .input_stream import SHAPE_TYPES
+
+Spawn = Tuple[str, float, Tuple[float, float, float]]
+
+class ObjectPrompt():
+    def __init__(self, on_submit: Callable[[Spawn], None]) -> None:
+        '''
+        Constructor for ObjectPrompt class. The thread and Tk root are only
+        created the first time the prompt opens.
+
+        Parameters:
+            - on_submit: function called with (shape type, size, color) when
+                the user finishes a prompt. It runs on the prompt thread, so
+                it should only queue work for the main thread.
+
+        Returns: None
+        '''
+        self.on_submit = on_submit
+        self.requests = queue.SimpleQueue()
+        self.thread = None
+
+        # True while the dialogs are on screen
+        self.busy = False
+
+    def open(self) -> None:
+        '''
+        Shows the dialogs without waiting for them. Does nothing if they are
+        already open.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.busy:
+            return
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.__run, daemon=True,
+                                           name='object-prompt')
+            self.thread.start()
+        self.busy = True
+        self.requests.put(True)
+
+    def close(self) -> None:
+        '''
+        Stops the prompt thread, destroying the Tk root. Dialogs that are
+        still open are abandoned.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.thread is None:
+            return
+        self.requests.put(None)
+        if not self.busy:
+            self.thread.join(timeout=1.0)
+        self.thread = None
+
+    def __run(self) -> None:
+        '''
+        Prompt thread: owns the Tk root and shows the dialogs on request
+
+        Parameters: None
+
+        Returns: None
+        '''
+        import tkinter
+
+        # initialize root window once. We don't want a full GUI, so keep the
+        # root window from appearing.
+        root = tkinter.Tk()
+        root.withdraw()
+
+        try:
+            while self.requests.get() is not None:
+                spawn = self.__ask(root)
+                self.busy = False
+                if spawn is not None:
+                    self.on_submit(spawn)
+        finally:
+            root.destroy()
+
+    @staticmethod
+    def __ask(root: Any) -> Optional[Spawn]:
+        '''
+        Asks the user for the properties of a new object
+
+        Parameters:
+            - root: the hidden Tk root the dialogs belong to
+
+        Returns:
+            - a tuple of (shape type, size, color), or None if the prompt
+                was cancelled or the input is invalid
+        '''
+        from tkinter import simpledialog
+
+        # Simple dialog to get the shape type
+        shape_type = simpledialog.askstring(
+            "Input", "Shape Type (Cube/Sphere/Pyramid):", parent=root
+        )
+        if shape_type is None:
+            return None
+
+        # Ask for size and color
+        size = simpledialog.askfloat("Input", "Size:", parent=root)
+        color = simpledialog.askstring("Input", "Color (R,G,B):", parent=root)
+        if size is None or color is None:
+            return None
+
+        if shape_type.lower() not in SHAPE_TYPES:
+            print("Unknown shape type.")
+            return None
+
+        # Process color input
+        try:
+            color = tuple(map(float, color.split(',')))
+        except ValueError:
+            print("Color must be three numbers, e.g. 1,0,0")
+            return None
+        if len(color) != 3:
+            print("Color must be three numbers, e.g. 1,0,0")
+            return None
+        return shape_type.lower(), size, color
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
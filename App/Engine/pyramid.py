@@ -9,10 +9,26 @@
 
 # imports
 from .shape import Shape
+from .scene_store import Dimension
+from .geometry import pyramid_geometry
 from typing import Tuple
+import numpy as np
 from OpenGL.GL import GL_TRIANGLES, glBegin, glEnd, glVertex3f
 
 class Pyramid(Shape):
+    __slots__ = ()
+    type_code = 2
+
+    # drawn from the shared GPU buffer built by geometry()
+    buffered = True
+
+    base = Dimension(0)
+
+    # the apex height is always this many times the base. The shared unit
+    # geometry, the uniform instance scale and the scene file's single size
+    # all rely on it, so height can't be set on its own.
+    HEIGHT_RATIO = 1.5
+
     def __init__(self, base: float=1.0,
                  color: Tuple[float, float, float]=(1.0, 1.0, 1.0),
                  position: Tuple[float, float, float]=(0.0, 0.0, 0.0)) -> None:
@@ -29,10 +45,12 @@ class Pyramid(Shape):
         # call parent constructor
         super().__init__(color, position)
 
-        # initialize base and height values (height is always proportional to
-        # base, can change later if needed)
+        # initialize base value (the height follows from it)
         self.base = base
-        self.height = base * 1.5
+
+    @property
+    def height(self) -> float:
+        return self.base * self.HEIGHT_RATIO
 
     def draw_shape(self) -> None:
         '''
@@ -42,33 +60,112 @@ class Pyramid(Shape):
 
         Returns: None
         '''
-        # Manually draw pyramid using immediate mode
+        # Manually draw pyramid using immediate mode (the fallback path, see
+        # Shape.immediate_mode)
+        # Same triangles, in the same order, as pyramid_geometry
+        b, h = self.base, self.height
         glBegin(GL_TRIANGLES)
 
-        # Base
-        glVertex3f(-self.base, -self.base, 0)
-        glVertex3f(self.base, -self.base, 0)
-        glVertex3f(self.base, self.base, 0)
-        glVertex3f(-self.base, self.base, 0)
+        # Base, two triangles
+        glVertex3f(-b, -b, 0)
+        glVertex3f(b, b, 0)
+        glVertex3f(b, -b, 0)
+
+        glVertex3f(-b, -b, 0)
+        glVertex3f(-b, b, 0)
+        glVertex3f(b, b, 0)
 
         # Sides
-        glVertex3f(0, 0, self.height)
-        glVertex3f(-self.base, -self.base, 0)
-        glVertex3f(self.base, -self.base, 0)
+        glVertex3f(0, 0, h)
+        glVertex3f(-b, -b, 0)
+        glVertex3f(b, -b, 0)
 
-        glVertex3f(0, 0, self.height)
-        glVertex3f(self.base, -self.base, 0)
-        glVertex3f(self.base, self.base, 0)
+        glVertex3f(0, 0, h)
+        glVertex3f(b, -b, 0)
+        glVertex3f(b, b, 0)
 
-        glVertex3f(0, 0, self.height)
-        glVertex3f(self.base, self.base, 0)
-        glVertex3f(-self.base, -self.base, 0)
+        glVertex3f(0, 0, h)
+        glVertex3f(b, b, 0)
+        glVertex3f(-b, b, 0)
 
-        glVertex3f(0, 0, self.height)
-        glVertex3f(-self.base, self.base, 0)
-        glVertex3f(-self.base, -self.base, 0)
+        glVertex3f(0, 0, h)
+        glVertex3f(-b, b, 0)
+        glVertex3f(-b, -b, 0)
 
         glEnd()
 
+    @classmethod
+    def geometry(cls):
+        '''
+        Unit pyramid geometry shared by every Pyramid
+
+        Parameters: None
+
+        Returns:
+            - a tuple of (vertices, indices) arrays
+        '''
+        return pyramid_geometry()
+
+    def scale(self) -> float:
+        '''
+        Scale applied to the unit pyramid geometry. The height is derived
+        from the base, so a uniform scale is enough.
+
+        Parameters: None
+
+        Returns:
+            - the base size
+        '''
+        return self.base
+
+    @classmethod
+    def local_spheres(cls, dimensions: np.ndarray):
+        '''
+        Bounding spheres of many pyramids, around the same boxes as
+        local_bounds
+
+        Parameters:
+            - dimensions: (n, 2) array of store dimensions
+
+        Returns:
+            - a tuple of (n, 3) center offsets and (n,) radii
+        '''
+        bases = dimensions[:, 0]
+        heights = bases * cls.HEIGHT_RATIO
+        offsets = np.zeros((len(dimensions), 3))
+        offsets[:, 2] = heights / 2
+        return offsets, np.sqrt(8 * bases * bases + heights * heights) / 2
+
+    @classmethod
+    def local_boxes(cls, dimensions: np.ndarray):
+        '''
+        Bounding boxes of many pyramids, as in local_bounds
+
+        Parameters:
+            - dimensions: (n, 2) array of store dimensions
+
+        Returns:
+            - a tuple of (n, 3) min and max corner offsets
+        '''
+        bases = dimensions[:, 0]
+        heights = bases * cls.HEIGHT_RATIO
+        low = np.zeros((len(dimensions), 3))
+        low[:, 0] = low[:, 1] = -bases
+        high = np.column_stack((bases, bases, heights))
+        return low, high
+
+    def local_bounds(self):
+        '''
+        Bounding box relative to the pyramid's position. The base sits at
+        z = 0 and the apex at z = height.
+
+        Parameters: None
+
+        Returns:
+            - a tuple of the (min, max) corners
+        '''
+        b = self.base
+        return (-b, -b, 0.0), (b, b, self.height)
+
 if __name__ == '__main__':
     assert False, 'This is a class file. Import its contents into another file.'
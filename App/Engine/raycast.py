@@ -0,0 +1,168 @@
+################################################################################
+# File: raycast.py
+# Date: 18 October 2026
+# Description:
+#
+# Exact ray tests against each kind of shape. Cubes are axis-aligned boxes,
+# spheres are spheres and pyramids are clipped against their five faces.
+# Every test returns the distance along the ray to the first point inside
+# the shape, or None if the ray misses it within the maximum distance.
+#
+################################################################################
+
+# imports
+import math
+from typing import Any, Optional, Sequence
+
+from .sphere import Sphere
+from .pyramid import Pyramid
+
+def ray_aabb(origin: Sequence[float], direction: Sequence[float],
+             low: Sequence[float], high: Sequence[float],
+             max_distance: float=math.inf) -> Optional[float]:
+    '''
+    Intersects a ray with an axis-aligned box using the slab method
+
+    Parameters:
+        - origin: the start of the ray
+        - direction: the direction of the ray
+        - low, high: the min and max corners of the box
+        - max_distance: float, how far along the ray to look
+
+    Returns:
+        - the distance to the box, 0 if the ray starts inside it, or None
+    '''
+    t_min, t_max = 0.0, max_distance
+    for axis in range(3):
+        start = origin[axis]
+        step = direction[axis]
+        if step == 0.0:
+            if start < low[axis] or start > high[axis]:
+                return None
+            continue
+
+        t0 = (low[axis] - start) / step
+        t1 = (high[axis] - start) / step
+        if t0 > t1:
+            t0, t1 = t1, t0
+        t_min = max(t_min, t0)
+        t_max = min(t_max, t1)
+        if t_min > t_max:
+            return None
+    return t_min
+
+def ray_sphere(origin: Sequence[float], direction: Sequence[float],
+               center: Sequence[float], radius: float,
+               max_distance: float=math.inf) -> Optional[float]:
+    '''
+    Intersects a ray with a sphere
+
+    Parameters:
+        - origin: the start of the ray
+        - direction: the direction of the ray
+        - center, radius: the sphere
+        - max_distance: float, how far along the ray to look
+
+    Returns:
+        - the distance to the sphere, 0 if the ray starts inside it, or None
+    '''
+    ox = origin[0] - center[0]
+    oy = origin[1] - center[1]
+    oz = origin[2] - center[2]
+    dx, dy, dz = direction
+
+    # solve |o + t d|^2 = r^2 for t
+    a = dx * dx + dy * dy + dz * dz
+    b = ox * dx + oy * dy + oz * dz
+    c = ox * ox + oy * oy + oz * oz - radius * radius
+    if c <= 0.0:
+        return 0.0
+    if b >= 0.0 or a == 0.0:
+        return None
+
+    discriminant = b * b - a * c
+    if discriminant < 0.0:
+        return None
+    t = (-b - math.sqrt(discriminant)) / a
+    return t if t <= max_distance else None
+
+def ray_pyramid(origin: Sequence[float], direction: Sequence[float],
+                position: Sequence[float], base: float, height: float,
+                max_distance: float=math.inf) -> Optional[float]:
+    '''
+    Intersects a ray with a square pyramid whose base spans -base..base in x
+    and y at z = 0 and whose apex is at z = height, all relative to position.
+    The ray is clipped against the five face planes.
+
+    Parameters:
+        - origin: the start of the ray
+        - direction: the direction of the ray
+        - position: the pyramid's position
+        - base: float, half the width of the base
+        - height: float, the height of the apex
+        - max_distance: float, how far along the ray to look
+
+    Returns:
+        - the distance to the pyramid, 0 if the ray starts inside it, or None
+    '''
+    ox = origin[0] - position[0]
+    oy = origin[1] - position[1]
+    oz = origin[2] - position[2]
+    dx, dy, dz = direction
+
+    # faces as (normal, offset), inside where normal . p <= offset
+    side = height * base
+    faces = (
+        ((0.0, 0.0, -1.0), 0.0),
+        ((height, 0.0, base), side),
+        ((-height, 0.0, base), side),
+        ((0.0, height, base), side),
+        ((0.0, -height, base), side)
+    )
+
+    t_min, t_max = 0.0, max_distance
+    for (nx, ny, nz), offset in faces:
+        distance = offset - (nx * ox + ny * oy + nz * oz)
+        rate = nx * dx + ny * dy + nz * dz
+        if rate == 0.0:
+            if distance < 0.0:
+                return None
+            continue
+
+        t = distance / rate
+        if rate < 0.0:
+            t_min = max(t_min, t)
+        else:
+            t_max = min(t_max, t)
+        if t_min > t_max:
+            return None
+    return t_min
+
+def ray_shape(shape: Any, origin: Sequence[float],
+              direction: Sequence[float],
+              max_distance: float=math.inf) -> Optional[float]:
+    '''
+    Picks the right test for a shape
+
+    Parameters:
+        - shape: the shape to test
+        - origin: the start of the ray
+        - direction: the direction of the ray
+        - max_distance: float, how far along the ray to look
+
+    Returns:
+        - the distance to the shape, or None if the ray misses it
+    '''
+    if isinstance(shape, Sphere):
+        return ray_sphere(origin, direction, shape.position, shape.radius,
+                          max_distance)
+    if isinstance(shape, Pyramid):
+        return ray_pyramid(origin, direction, shape.position, shape.base,
+                           shape.height, max_distance)
+
+    # cubes are axis-aligned, so their bounding box is exact. Anything else
+    # (e.g. a mesh) is tested as its bounding box too.
+    return ray_aabb(origin, direction, *shape.aabb(), max_distance)
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
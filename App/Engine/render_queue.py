@@ -0,0 +1,144 @@
+################################################################################
+# File: render_queue.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the render queue. Draws are collected during the frame and
+# submitted sorted by layer, pipeline state, color and distance, so that
+# draws sharing GL state run back to back and opaque draws go front to back.
+#
+################################################################################
+
+# imports
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .gl_state import state
+
+Vector = Tuple[float, float, float]
+
+# layers, drawn in this order
+BACKGROUND, OPAQUE, OVERLAY = 0, 1, 2
+
+# bits of the sort key below the color id
+DEPTH_BITS = 20
+DEPTH_LEVELS = (1 << DEPTH_BITS) - 1
+
+class RenderQueue():
+    def __init__(self, max_distance: float=100.0) -> None:
+        '''
+        Constructor for RenderQueue class
+
+        Parameters:
+            - max_distance: float, distance from the camera beyond which
+                draws are no longer told apart by depth
+
+        Returns: None
+        '''
+        self.max_distance = max_distance
+
+        # small integer ids for pipeline states and colors, handed out the
+        # first time each is seen and kept across frames, so equal states
+        # always get equal keys
+        self.pipeline_ids: Dict[Hashable, int] = {}
+        self.color_ids: Dict[Optional[Tuple[float, ...]], int] = {None: 0}
+
+        # the frame's draws: (sort key, write depth, draw function)
+        self.items: List[Tuple[int, bool, Callable[[], None]]] = []
+
+        # counters from the last flush
+        self.pipeline_changes = 0
+        self.color_changes = 0
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def push(self, draw: Callable[[], None], pipeline: Hashable,
+             color: Optional[Sequence[float]]=None,
+             center: Optional[Vector]=None, eye: Optional[Vector]=None,
+             layer: int=OPAQUE, depth_write: bool=True) -> None:
+        '''
+        Queues one draw
+
+        Parameters:
+            - draw: function issuing the draw
+            - pipeline: any hashable naming the GL state the draw needs
+                (program, buffers, drawing path)
+            - color: optional color the draw sets
+            - center: optional position the draw is sorted by
+            - eye: the camera position, needed with center
+            - layer: integer layer; BACKGROUND draws first, OVERLAY last
+            - depth_write: boolean, whether the draw writes depth. Draws
+                that do are sorted front to back, draws that don't back to
+                front.
+
+        Returns: None
+        '''
+        pipeline_id = self.pipeline_ids.get(pipeline)
+        if pipeline_id is None:
+            pipeline_id = self.pipeline_ids[pipeline] = len(self.pipeline_ids)
+
+        if color is not None:
+            color = tuple(color)
+        color_id = self.color_ids.get(color)
+        if color_id is None:
+            color_id = self.color_ids[color] = len(self.color_ids)
+
+        depth = 0
+        if center is not None and eye is not None:
+            dx = center[0] - eye[0]
+            dy = center[1] - eye[1]
+            dz = center[2] - eye[2]
+            distance = (dx * dx + dy * dy + dz * dz) / (
+                self.max_distance * self.max_distance)
+            depth = int(min(distance, 1.0) * DEPTH_LEVELS)
+            if not depth_write:
+                depth = DEPTH_LEVELS - depth
+
+        key = ((((layer << 32) | pipeline_id) << 32 | color_id) << DEPTH_BITS
+               | depth)
+        self.items.append((key, depth_write, draw))
+
+    def clear(self) -> None:
+        '''
+        Drops the queued draws without running them
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.items = []
+
+    def flush(self) -> None:
+        '''
+        Runs the queued draws in key order and empties the queue. Python's
+        sort is stable and the keys are plain integers, so this stays cheap.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        items = self.items
+        self.items = []
+        items.sort(key=lambda item: item[0])
+
+        pipeline_changes = color_changes = 0
+        last_pipeline = last_color = None
+        for key, depth_write, draw in items:
+            # the key with the depth (and color) bits shifted off
+            pipeline = key >> (32 + DEPTH_BITS)
+            color = key >> DEPTH_BITS
+            if pipeline != last_pipeline:
+                pipeline_changes += 1
+                last_pipeline = pipeline
+            if color != last_color:
+                color_changes += 1
+                last_color = color
+
+            state.set_depth_mask(depth_write)
+            draw()
+
+        self.pipeline_changes = pipeline_changes
+        self.color_changes = color_changes
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,473 @@
+################################################################################
+# File: rigid_body.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the rigid body arrays. The state of every dynamic body lives
+# in contiguous NumPy arrays so a physics step is a handful of batched array
+# operations rather than a Python loop over objects.
+#
+################################################################################
+
+# imports
+import math
+import numpy as np
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .bvh import ray_boxes
+from .scene_store import move_shapes
+
+def chunk_keys(x: np.ndarray, z: np.ndarray, width: float,
+               length: float) -> np.ndarray:
+    '''
+    Keys of the world chunks (see ChunkedWorld.chunk_of) that many x, z
+    positions are in, one integer per chunk so they can be looked up with
+    np.isin
+
+    Parameters:
+        - x, z: arrays of world coordinates
+        - width, length: the chunk size along x and z
+
+    Returns:
+        - an int64 array of chunk keys
+    '''
+    cx = np.floor(np.asarray(x) / width + 0.5).astype(np.int64)
+    cz = np.floor(np.asarray(z) / length + 0.5).astype(np.int64)
+    return (cx << 32) + cz
+
+class RigidBodies():
+    def __init__(self, room_size: Tuple[int, int, int], gravity: float=-9.81,
+                 damping: float=0.1, restitution: float=0.4,
+                 capacity: int=1024) -> None:
+        '''
+        Constructor for RigidBodies class
+
+        Parameters:
+            - room_size: tuple of three integers, the room the bodies are
+                kept inside
+            - gravity: float, acceleration along y in units per second squared
+            - damping: float, fraction of velocity lost per second
+            - restitution: float, fraction of speed kept when bouncing off a
+                wall, floor or ceiling
+            - capacity: integer number of bodies to allocate room for
+
+        Returns: None
+        '''
+        self.room_size = room_size
+        self.gravity = gravity
+        self.damping = damping
+        self.restitution = restitution
+
+        # bounces slower than this come to rest instead
+        self.rest_speed = 0.05
+
+        self.count = 0
+        self.shapes: List[Any] = []
+        self.indices: Dict[int, int] = {}
+
+        # body centers, i.e. the centers of the shapes' bounding boxes
+        self.positions = np.zeros((capacity, 3), dtype=np.float32)
+        self.velocities = np.zeros((capacity, 3), dtype=np.float32)
+        self.masses = np.ones(capacity, dtype=np.float32)
+        self.half_extents = np.zeros((capacity, 3), dtype=np.float32)
+
+        # shape position = body center - offset
+        self.offsets = np.zeros((capacity, 3), dtype=np.float32)
+
+        # positions at the start of the last step, for interpolation
+        self.previous = np.zeros((capacity, 3), dtype=np.float32)
+
+        # positions last written back to the shapes
+        self.synced = np.zeros((capacity, 3), dtype=np.float32)
+
+        # store handles of the shapes, and the store they all share (None
+        # if they are in different ones), so sync writes every moved shape
+        # with one indexed assignment. A shape must stay in its store while
+        # it is a body.
+        self.handles = np.zeros(capacity, dtype=np.int64)
+        self.store = None
+
+        # rows of store written by the last sync, None if it wrote none or
+        # moved the shapes one by one
+        self.moved_rows = None
+
+        # size and sorted chunk keys of the active chunks of a streamed
+        # world (see set_world), bounding the bodies instead of room_size
+        self.chunk_size = None
+        self.chunks = np.zeros(0, dtype=np.int64)
+
+    def set_world(self, chunk_size: Sequence[float],
+                  coords: Sequence[Tuple[int, int]]) -> None:
+        '''
+        Keeps the bodies inside the active chunks of a streamed world
+        instead of room_size: between the chunks' floor and ceiling, and
+        out of the chunks that aren't loaded. Bodies are free along x and
+        z inside the loaded ones.
+
+        Parameters:
+            - chunk_size: the width, height and length of every chunk, or
+                None to go back to room_size
+            - coords: the (x, z) grid coordinates of the active chunks
+
+        Returns: None
+        '''
+        self.chunk_size = None if chunk_size is None else tuple(chunk_size)
+        coords = np.array(sorted(coords), dtype=np.int64).reshape(-1, 2)
+        self.chunks = (coords[:, 0] << 32) + coords[:, 1]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __grow(self) -> None:
+        '''
+        Doubles the capacity of every array
+
+        Parameters: None
+
+        Returns: None
+        '''
+        for name in ('positions', 'velocities', 'masses', 'half_extents',
+                     'offsets', 'previous', 'synced', 'handles'):
+            array = getattr(self, name)
+            grown = np.zeros((len(array) * 2,) + array.shape[1:],
+                             dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def add(self, shape: Any, mass: float=1.0,
+            velocity: Sequence[float]=(0.0, 0.0, 0.0)) -> int:
+        '''
+        Adds a shape as a dynamic body
+
+        Parameters:
+            - shape: the shape to simulate
+            - mass: float, the body's mass
+            - velocity: the body's starting velocity
+
+        Returns:
+            - the integer index of the body
+        '''
+        if self.count == len(self.positions):
+            self.__grow()
+
+        index = self.count
+        low, high = (np.asarray(corner, dtype=np.float32)
+                     for corner in shape.aabb())
+        center = (low + high) / 2
+
+        self.positions[index] = center
+        self.velocities[index] = velocity
+        self.masses[index] = mass
+        self.half_extents[index] = (high - low) / 2
+        self.offsets[index] = center - np.asarray(shape.position,
+                                                  dtype=np.float32)
+        self.previous[index] = center
+        self.synced[index] = center
+        self.__track(index, [shape])
+
+        self.shapes.append(shape)
+        self.indices[id(shape)] = index
+        self.count += 1
+        return index
+
+    def add_many(self, shapes: Sequence[Any], lows: np.ndarray,
+                 highs: np.ndarray, masses: Sequence[float]=None) -> None:
+        '''
+        Adds many shapes as dynamic bodies at rest, filling the arrays with
+        whole-slice writes
+
+        Parameters:
+            - shapes: the shapes to simulate
+            - lows, highs: (n, 3) arrays of the shapes' bounding box corners
+            - masses: optional masses, 1.0 each by default
+
+        Returns: None
+        '''
+        n = len(shapes)
+        while self.count + n > len(self.positions):
+            self.__grow()
+
+        lows = np.asarray(lows, dtype=np.float32)
+        highs = np.asarray(highs, dtype=np.float32)
+        centers = (lows + highs) / 2
+        start, end = self.count, self.count + n
+
+        self.positions[start:end] = centers
+        self.velocities[start:end] = 0.0
+        self.masses[start:end] = 1.0 if masses is None else masses
+        self.half_extents[start:end] = (highs - lows) / 2
+        self.offsets[start:end] = centers - np.array(
+            [shape.position for shape in shapes], dtype=np.float32)
+        self.previous[start:end] = centers
+        self.synced[start:end] = centers
+        self.__track(start, shapes)
+
+        self.shapes.extend(shapes)
+        for index, shape in enumerate(shapes, start):
+            self.indices[id(shape)] = index
+        self.count = end
+
+    def __track(self, start: int, shapes: Sequence[Any]) -> None:
+        '''
+        Records the store handles of shapes added from index start
+
+        Parameters:
+            - start: integer index of the first shape
+            - shapes: the shapes added
+
+        Returns: None
+        '''
+        if not len(shapes):
+            return
+        self.handles[start:start + len(shapes)] = [shape._handle
+                                                   for shape in shapes]
+        store = shapes[0]._store
+        if start == 0:
+            self.store = store
+        if store is not self.store or any(shape._store is not store
+                                          for shape in shapes):
+            self.store = None
+
+    def remove(self, shape: Any) -> None:
+        '''
+        Removes a shape's body by moving the last body into its slot
+
+        Parameters:
+            - shape: the shape to stop simulating
+
+        Returns: None
+        '''
+        index = self.indices.pop(id(shape))
+        last = self.count - 1
+
+        for array in (self.positions, self.velocities, self.masses,
+                      self.half_extents, self.offsets, self.previous,
+                      self.synced, self.handles):
+            array[index] = array[last]
+
+        moved = self.shapes.pop()
+        if moved is not shape:
+            self.shapes[index] = moved
+            self.indices[id(moved)] = index
+        self.count -= 1
+
+    def clear(self) -> None:
+        '''
+        Removes every body, keeping the allocated arrays
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.count = 0
+        self.shapes = []
+        self.indices = {}
+        self.store = None
+
+    def apply_impulse(self, index: int, impulse: Sequence[float]) -> None:
+        '''
+        Changes a body's velocity by impulse / mass
+
+        Parameters:
+            - index: integer index of the body
+            - impulse: the impulse vector
+
+        Returns: None
+        '''
+        self.velocities[index] += (np.asarray(impulse, dtype=np.float32)
+                                   / self.masses[index])
+
+    def step(self, dt: float) -> None:
+        '''
+        Advances every body by dt seconds: gravity, damping, integration and
+        bouncing off the room bounds, all as batched array operations
+
+        Parameters:
+            - dt: float, the time step in seconds
+
+        Returns: None
+        '''
+        n = self.count
+        if not n:
+            return
+
+        positions = self.positions[:n]
+        velocities = self.velocities[:n]
+        extents = self.half_extents[:n]
+        self.previous[:n] = positions
+
+        # gravity, then exponential damping, then semi-implicit Euler
+        velocities[:, 1] += self.gravity * dt
+        velocities *= math.exp(-self.damping * dt)
+        positions += velocities * dt
+
+        # room bounds, shrunk by each body's half extents. A streamed world
+        # only bounds y here; its chunks bound x and z below.
+        if self.chunk_size is None:
+            half_room = np.asarray(self.room_size, dtype=np.float32) / 2
+        else:
+            half_room = np.array([np.inf, self.chunk_size[1] / 2, np.inf],
+                                 dtype=np.float32)
+        low = extents - half_room
+        high = half_room - extents
+
+        below = positions < low
+        above = positions > high
+        np.copyto(positions, low, where=below)
+        np.copyto(positions, high, where=above)
+
+        # reflect the velocity of bodies that hit a bound, and stop the ones
+        # that are barely bouncing
+        hit = (below & (velocities < 0)) | (above & (velocities > 0))
+        bounced = -velocities * self.restitution
+        bounced[np.abs(bounced) < self.rest_speed] = 0.0
+        np.copyto(velocities, bounced, where=hit)
+
+        if self.chunk_size is not None:
+            self.__keep_in_chunks(positions, velocities, self.previous[:n])
+
+    def __keep_in_chunks(self, positions: np.ndarray, velocities: np.ndarray,
+                         previous: np.ndarray) -> None:
+        '''
+        Bounces bodies off the sides of the active chunks: a body that was
+        in an active chunk and would move into one that isn't loaded is
+        put back and reflected along that axis. x and z are tested one
+        after the other, so a body at a corner slides along the open side.
+
+        Parameters:
+            - positions, velocities: the bodies' arrays after the step
+            - previous: the bodies' positions before the step
+
+        Returns: None
+        '''
+        width, _, length = self.chunk_size
+        chunks = self.chunks
+        inside = np.isin(chunk_keys(previous[:, 0], previous[:, 2], width,
+                                    length), chunks)
+        for axis in (0, 2):
+            z = positions[:, 2] if axis == 2 else previous[:, 2]
+            left = inside & ~np.isin(chunk_keys(positions[:, 0], z, width,
+                                                length), chunks)
+            if not left.any():
+                continue
+            positions[left, axis] = previous[left, axis]
+            bounced = -velocities[left, axis] * self.restitution
+            bounced[np.abs(bounced) < self.rest_speed] = 0.0
+            velocities[left, axis] = bounced
+
+    def sync(self, alpha: float=1.0, positions: np.ndarray=None,
+             previous: np.ndarray=None) -> int:
+        '''
+        Writes the positions of bodies that moved back to their shapes, with
+        one write to the shapes' store. The shapes' listeners are not
+        called; the rows written are left in moved_rows for the caller to
+        pass on in bulk. Only if the shapes are in different stores are
+        they moved one by one, with their listeners, and moved_rows None.
+
+        Parameters:
+            - alpha: float, where to place the shapes between the previous
+                step (0) and the latest step (1)
+            - positions, previous: optional arrays to read the latest and
+                previous step from instead of this object's own, e.g. a
+                snapshot stepped by another process
+
+        Returns:
+            - the integer number of shapes moved
+        '''
+        n = self.count
+        if positions is None:
+            positions, previous = self.positions, self.previous
+        positions = positions[:n]
+        if alpha != 1.0:
+            previous = previous[:n]
+            positions = previous + (positions - previous) * alpha
+
+        moved = np.flatnonzero(np.any(positions != self.synced[:n], axis=1))
+        self.moved_rows = None
+        if not len(moved):
+            return 0
+
+        self.synced[moved] = positions[moved]
+        new_positions = positions[moved] - self.offsets[moved]
+
+        store = self.store
+        rows = (store.rows_of(self.handles[moved]) if store is not None
+                else None)
+        if rows is not None and (rows >= 0).all():
+            store.positions[rows] = new_positions
+            self.moved_rows = rows
+        else:
+            shapes = self.shapes
+            move_shapes([shapes[index] for index in moved.tolist()],
+                        new_positions)
+        return len(moved)
+
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        '''
+        Bounding boxes of the bodies where sync last placed their shapes
+
+        Parameters: None
+
+        Returns:
+            - a tuple of (n, 3) min and max corner arrays
+        '''
+        n = self.count
+        centers = self.synced[:n]
+        extents = self.half_extents[:n]
+        return centers - extents, centers + extents
+
+    def query_sphere(self, center: Sequence[float],
+                     radius: float=0.0) -> List[Any]:
+        '''
+        Finds the shapes whose bounding boxes overlap a sphere, testing
+        every body at once
+
+        Parameters:
+            - center: the sphere center
+            - radius: float, the sphere radius
+
+        Returns:
+            - a list of shapes
+        '''
+        if not self.count:
+            return []
+        lows, highs = self.bounds()
+        center = np.asarray(center, dtype=np.float32)
+
+        # squared distance from the center to the closest point on each box
+        offset = np.clip(center, lows, highs) - center
+        hit = np.einsum('ij,ij->i', offset, offset) <= radius * radius
+        shapes = self.shapes
+        return [shapes[index] for index in np.flatnonzero(hit).tolist()]
+
+    def query_capsule(self, start: Sequence[float], end: Sequence[float],
+                      radius: float) -> List[Any]:
+        '''
+        Finds the shapes whose bounding boxes overlap a capsule, testing
+        every body at once. Boxes are grown by the radius and tested against
+        the capsule's segment, as in SpatialHash.query_capsule.
+
+        Parameters:
+            - start: the center of one end of the capsule
+            - end: the center of the other end of the capsule
+            - radius: float, the capsule radius
+
+        Returns:
+            - a list of shapes
+        '''
+        if not self.count:
+            return []
+        lows, highs = self.bounds()
+        start = np.asarray(start, dtype=np.float64)
+        direction = np.asarray(end, dtype=np.float64) - start
+
+        # a tiny step instead of zero keeps the slab test free of inf * 0
+        step = np.where(direction == 0.0, 1e-30, direction)
+        near = ray_boxes(lows - radius, highs + radius, start, 1.0 / step,
+                         1.0)
+        shapes = self.shapes
+        return [shapes[index]
+                for index in np.flatnonzero(near < np.inf).tolist()]
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,150 @@
+################################################################################
+# File: room.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the room geometry. The walls, floor and ceiling are baked
+# into a GPU buffer that is only rebuilt when the room's dimensions change.
+#
+################################################################################
+
+# imports
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+from typing import Sequence, Tuple
+
+from .gl_state import state
+
+# face colors: floor, ceiling, and the four walls
+FLOOR_COLOR = (0.5, 0.5, 0.5)
+WALL_COLORS = ((0.5, 0.0, 0.0), (0.0, 0.5, 0.0), (0.0, 0.0, 0.5),
+               (0.5, 0.5, 0.0))
+
+class Room():
+    def __init__(self, size: Tuple[float, float, float],
+                 origin: Tuple[float, float, float]=(0.0, 0.0, 0.0),
+                 walls: Sequence[bool]=(True, True, True, True)) -> None:
+        '''
+        Constructor for Room class
+
+        Parameters:
+            - size: tuple of the room's width, height and length
+            - origin: tuple, where the middle of the room is
+            - walls: four booleans, which of the -x, +x, -z and +z walls to
+                build. Chunks of a larger world leave out the walls they
+                share with their neighbors.
+
+        Returns: None
+        '''
+        self.size = None
+        self.origin = tuple(origin)
+        self.walls = tuple(walls)
+        self.vertices = None
+        self.vbo = None
+        self.uploaded = False
+        self.resize(size)
+
+    def resize(self, size: Tuple[float, float, float]) -> None:
+        '''
+        Rebuilds the room geometry if the dimensions changed
+
+        Parameters:
+            - size: tuple of the room's width, height and length
+
+        Returns: None
+        '''
+        size = tuple(size)
+        if size == self.size:
+            return
+
+        self.size = size
+        self.vertices = self.build(*size, self.origin, self.walls)
+        self.uploaded = False
+
+    @staticmethod
+    def build(width: float, height: float, length: float,
+              origin: Tuple[float, float, float]=(0.0, 0.0, 0.0),
+              walls: Sequence[bool]=(True, True, True, True)) -> np.ndarray:
+        '''
+        Builds the interleaved position and color array for the room
+
+        Parameters:
+            - width: float, the width of the room
+            - height: float, the height of the room
+            - length: float, the length of the room
+            - origin: tuple, where the middle of the room is
+            - walls: four booleans, which of the -x, +x, -z and +z walls to
+                build
+
+        Returns:
+            - a (4 * faces, 6) float32 array of x, y, z, r, g, b
+        '''
+        w, h, l = width / 2, height / 2, length / 2
+        faces = (
+            # floor and ceiling
+            (FLOOR_COLOR, ((-w, -h, -l), (w, -h, -l), (w, -h, l), (-w, -h, l))),
+            (FLOOR_COLOR, ((-w, h, -l), (w, h, -l), (w, h, l), (-w, h, l))),
+            # walls
+            (WALL_COLORS[0], ((-w, -h, -l), (-w, h, -l), (-w, h, l), (-w, -h, l))),
+            (WALL_COLORS[1], ((w, -h, -l), (w, h, -l), (w, h, l), (w, -h, l))),
+            (WALL_COLORS[2], ((-w, -h, -l), (w, -h, -l), (w, h, -l), (-w, h, -l))),
+            (WALL_COLORS[3], ((-w, -h, l), (w, -h, l), (w, h, l), (-w, h, l)))
+        )
+        faces = faces[:2] + tuple(face for face, wall in zip(faces[2:], walls)
+                                  if wall)
+        vertices = np.array([corner + color for color, corners in faces
+                             for corner in corners], dtype=np.float32)
+        vertices[:, :3] += origin
+        return vertices
+
+    def draw(self) -> None:
+        '''
+        Draws the room with one draw call, uploading it first if it changed
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.vbo is None:
+            self.vbo = glGenBuffers(1)
+
+        # fixed function, and the client arrays must not end up in a shape's
+        # vertex array
+        state.use_program(0)
+        state.bind_vertex_array(0)
+
+        state.bind_buffer(GL_ARRAY_BUFFER, self.vbo)
+        if not self.uploaded:
+            glBufferData(GL_ARRAY_BUFFER, self.vertices.nbytes, self.vertices,
+                         GL_STATIC_DRAW)
+            self.uploaded = True
+
+        stride = self.vertices.strides[0]
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(3, GL_FLOAT, stride, None)
+        glColorPointer(3, GL_FLOAT, stride, ctypes.c_void_p(12))
+        glDrawArrays(GL_QUADS, 0, len(self.vertices))
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+        # drawing with a color array leaves the current color undefined
+        state.invalidate_color()
+
+    def release(self) -> None:
+        '''
+        Deletes the room's GPU buffer. Drawing again uploads a new one.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.vbo is not None:
+            state.bind_buffer(GL_ARRAY_BUFFER, 0)
+            glDeleteBuffers(1, [self.vbo])
+            self.vbo = None
+            self.uploaded = False
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,428 @@
+################################################################################
+# File: scene_graph.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the scene graph. Nodes have a local translation, rotation
+# and scale and an optional parent, and can carry a shape. Local and world
+# matrices are cached in arrays; changing a node only marks it dirty, and
+# update() recomputes the dirty nodes and everything below them in one pass
+# over the tree's levels, a batched matrix product per level. Shapes on
+# nodes that moved are then placed at their node's world position.
+#
+################################################################################
+
+# imports
+import numpy as np
+from typing import Any, List, Optional, Sequence
+
+from .scene_store import move_shapes
+from .transforms import trs_matrices
+
+class SceneNode():
+    __slots__ = ('graph', 'index')
+
+    def __init__(self, graph: 'SceneGraph', index: int) -> None:
+        '''
+        Constructor for SceneNode class. A view of one node of a SceneGraph;
+        make nodes with SceneGraph.add.
+
+        Parameters:
+            - graph: the SceneGraph holding the node
+            - index: integer slot of the node in the graph's arrays
+
+        Returns: None
+        '''
+        self.graph = graph
+        self.index = index
+
+    @property
+    def translation(self) -> tuple:
+        return tuple(self.graph.translations[self.index].tolist())
+
+    @translation.setter
+    def translation(self, value: Sequence[float]) -> None:
+        self.graph.translations[self.index] = value
+        self.graph.mark_dirty(self.index)
+
+    @property
+    def rotation(self) -> tuple:
+        return tuple(self.graph.rotations[self.index].tolist())
+
+    @rotation.setter
+    def rotation(self, value: Sequence[float]) -> None:
+        value = np.asarray(value, dtype=np.float64)
+        self.graph.rotations[self.index] = value / np.linalg.norm(value)
+        self.graph.mark_dirty(self.index)
+
+    @property
+    def scale(self) -> tuple:
+        return tuple(self.graph.scales[self.index].tolist())
+
+    @scale.setter
+    def scale(self, value) -> None:
+        self.graph.scales[self.index] = value
+        self.graph.mark_dirty(self.index)
+
+    @property
+    def shape(self) -> Any:
+        return self.graph.shapes[self.index]
+
+    @property
+    def parent(self) -> Optional['SceneNode']:
+        parent = self.graph.parents[self.index]
+        return self.graph.nodes[parent] if parent >= 0 else None
+
+    @parent.setter
+    def parent(self, parent: Optional['SceneNode']) -> None:
+        self.graph.set_parent(self, parent)
+
+    @property
+    def children(self) -> List['SceneNode']:
+        nodes = self.graph.nodes
+        return [nodes[child] for child in self.graph.children[self.index]]
+
+    def translate(self, dx: float, dy: float, dz: float) -> None:
+        '''
+        Moves the node by an offset in its parent's space
+
+        Parameters:
+            - dx, dy, dz: floats, the offset
+
+        Returns: None
+        '''
+        self.graph.translations[self.index] += (dx, dy, dz)
+        self.graph.mark_dirty(self.index)
+
+    def rotate(self, rotation: Sequence[float]) -> None:
+        '''
+        Turns the node by a further rotation, applied after its current one
+
+        Parameters:
+            - rotation: a unit quaternion (x, y, z, w), e.g. from
+                transforms.quaternion
+
+        Returns: None
+        '''
+        bx, by, bz, bw = rotation
+        ax, ay, az, aw = self.graph.rotations[self.index].tolist()
+        self.rotation = (bw * ax + bx * aw + by * az - bz * ay,
+                         bw * ay - bx * az + by * aw + bz * ax,
+                         bw * az + bx * ay - by * ax + bz * aw,
+                         bw * aw - bx * ax - by * ay - bz * az)
+
+    def world_matrix(self) -> np.ndarray:
+        '''
+        The node's local to world matrix, brought up to date first if
+        anything in the graph is dirty
+
+        Parameters: None
+
+        Returns:
+            - a 4x4 float64 matrix (a copy)
+        '''
+        self.graph.update()
+        return self.graph.worlds[self.index].copy()
+
+    def world_position(self) -> tuple:
+        '''
+        Where the node's origin is in world space
+
+        Parameters: None
+
+        Returns:
+            - a tuple of three floats
+        '''
+        self.graph.update()
+        return tuple(self.graph.worlds[self.index, :3, 3].tolist())
+
+class SceneGraph():
+    def __init__(self, capacity: int=256) -> None:
+        '''
+        Constructor for SceneGraph class
+
+        Parameters:
+            - capacity: integer number of nodes to allocate up front,
+                doubled whenever it runs out
+
+        Returns: None
+        '''
+        # slots in use are below count; removed slots are reused
+        self.count = 0
+        self.free: List[int] = []
+
+        # local transform parts, and the cached local and world matrices
+        self.translations = np.zeros((capacity, 3))
+        self.rotations = np.zeros((capacity, 4))
+        self.scales = np.ones((capacity, 3))
+        self.locals = np.zeros((capacity, 4, 4))
+        self.worlds = np.zeros((capacity, 4, 4))
+
+        # parent slot, -1 for roots and -2 for unused slots
+        self.parents = np.full(capacity, -2, dtype=np.int64)
+
+        # nodes whose local transform changed since the last update
+        self.dirty = np.zeros(capacity, dtype=bool)
+        self.any_dirty = False
+
+        self.children: List[List[int]] = []
+        self.shapes: List[Any] = []
+        self.nodes: List[Optional[SceneNode]] = []
+
+        # slots grouped by depth, roots first. Rebuilt when the tree's
+        # shape changes.
+        self.levels: List[np.ndarray] = []
+        self.levels_stale = False
+
+    def __len__(self) -> int:
+        return self.count - len(self.free)
+
+    def __reserve(self) -> None:
+        '''
+        Makes room for one more slot
+
+        Parameters: None
+
+        Returns: None
+        '''
+        capacity = len(self.parents)
+        if self.count < capacity:
+            return
+
+        for name, fill in (('translations', 0.0), ('rotations', 0.0),
+                           ('scales', 1.0), ('locals', 0.0),
+                           ('worlds', 0.0), ('parents', -2),
+                           ('dirty', False)):
+            old = getattr(self, name)
+            new = np.full((capacity * 2,) + old.shape[1:], fill,
+                          dtype=old.dtype)
+            new[:capacity] = old
+            setattr(self, name, new)
+
+    def add(self, shape: Any=None, parent: Optional[SceneNode]=None,
+            translation: Optional[Sequence[float]]=None,
+            rotation: Sequence[float]=(0.0, 0.0, 0.0, 1.0),
+            scale=1.0) -> SceneNode:
+        '''
+        Adds a node
+
+        Parameters:
+            - shape: optional shape placed at the node's world position.
+                Move it through the node from now on; moving the shape
+                itself is undone by the node's next change.
+            - parent: optional parent node, None for a root
+            - translation: the position relative to the parent. By default
+                a shape stays where it is, and a node without one sits at
+                the parent's origin.
+            - rotation: unit quaternion (x, y, z, w) relative to the parent
+            - scale: float or three floats, scale relative to the parent.
+                Scales and rotates where the children are placed; shapes
+                themselves stay axis-aligned at their own size.
+
+        Returns:
+            - the new SceneNode
+        '''
+        if translation is None:
+            translation = (0.0, 0.0, 0.0)
+            if shape is not None:
+                position = np.append(shape.position, 1.0)
+                if parent is not None:
+                    position = np.linalg.solve(
+                        self.__chain_matrix(parent.index), position)
+                translation = position[:3]
+
+        if self.free:
+            index = self.free.pop()
+        else:
+            self.__reserve()
+            index = self.count
+            self.count += 1
+            self.children.append([])
+            self.shapes.append(None)
+            self.nodes.append(None)
+
+        node = SceneNode(self, index)
+        self.nodes[index] = node
+        self.shapes[index] = shape
+        self.children[index] = []
+        self.translations[index] = translation
+        rotation = np.asarray(rotation, dtype=np.float64)
+        self.rotations[index] = rotation / np.linalg.norm(rotation)
+        self.scales[index] = scale
+        self.parents[index] = -1
+        if parent is not None:
+            self.parents[index] = parent.index
+            self.children[parent.index].append(index)
+
+        self.levels_stale = True
+        self.mark_dirty(index)
+        return node
+
+    def __chain_matrix(self, index: int) -> np.ndarray:
+        '''
+        A node's current local to world matrix, multiplied out from the
+        local transforms along its ancestors. Unlike update() it touches
+        nothing else, so adding many nodes under one parent doesn't
+        recompute the graph for each.
+
+        Parameters:
+            - index: integer slot of the node
+
+        Returns:
+            - a 4x4 float64 matrix
+        '''
+        chain = []
+        while index >= 0:
+            chain.append(index)
+            index = int(self.parents[index])
+        chain.reverse()
+
+        matrices = trs_matrices(self.translations[chain],
+                                self.rotations[chain], self.scales[chain])
+        world = matrices[0]
+        for local in matrices[1:]:
+            world = world @ local
+        return world
+
+    def remove(self, node: SceneNode) -> None:
+        '''
+        Removes a node and everything below it. Their shapes stay where
+        they are.
+
+        Parameters:
+            - node: the node to remove
+
+        Returns: None
+        '''
+        parent = self.parents[node.index]
+        if parent >= 0:
+            self.children[parent].remove(node.index)
+
+        stack = [node.index]
+        while stack:
+            index = stack.pop()
+            stack.extend(self.children[index])
+            self.children[index] = []
+            self.shapes[index] = None
+            self.nodes[index] = None
+            self.parents[index] = -2
+            self.dirty[index] = False
+            self.free.append(index)
+
+        self.levels_stale = True
+
+    def set_parent(self, node: SceneNode,
+                   parent: Optional[SceneNode]) -> None:
+        '''
+        Moves a node under another parent, keeping its local transform
+
+        Parameters:
+            - node: the node to move
+            - parent: the new parent, None to make the node a root
+
+        Returns: None
+
+        Raises:
+            - ValueError if the parent is the node or below it
+        '''
+        index = node.index
+        if parent is not None:
+            ancestor = parent.index
+            while ancestor >= 0:
+                if ancestor == index:
+                    raise ValueError('a node can not be its own ancestor')
+                ancestor = self.parents[ancestor]
+
+        old = self.parents[index]
+        if old >= 0:
+            self.children[old].remove(index)
+        self.parents[index] = -1 if parent is None else parent.index
+        if parent is not None:
+            self.children[parent.index].append(index)
+
+        self.levels_stale = True
+        self.mark_dirty(index)
+
+    def mark_dirty(self, index: int) -> None:
+        '''
+        Marks a node's local transform as changed. Its world matrix, and
+        those of everything below it, are recomputed by the next update.
+
+        Parameters:
+            - index: integer slot of the node
+
+        Returns: None
+        '''
+        self.dirty[index] = True
+        self.any_dirty = True
+
+    def __build_levels(self) -> None:
+        '''
+        Groups the slots in use by depth, walking down from the roots
+
+        Parameters: None
+
+        Returns: None
+        '''
+        level = np.flatnonzero(self.parents[:self.count] == -1)
+        levels = []
+        children = self.children
+        while len(level):
+            levels.append(level)
+            level = np.fromiter(
+                (child for index in level.tolist()
+                 for child in children[index]), dtype=np.int64)
+        self.levels = levels
+        self.levels_stale = False
+
+    def update(self) -> int:
+        '''
+        Recomputes the world matrices of the dirty nodes and everything
+        below them, one level at a time, then moves their shapes. Does
+        nothing if no node changed.
+
+        Parameters: None
+
+        Returns:
+            - the integer number of nodes recomputed
+        '''
+        if not self.any_dirty:
+            return 0
+        if self.levels_stale:
+            self.__build_levels()
+
+        n = self.count
+        dirty = self.dirty[:n]
+        changed = np.flatnonzero(dirty)
+        self.locals[changed] = trs_matrices(self.translations[changed],
+                                            self.rotations[changed],
+                                            self.scales[changed])
+
+        # a node is recomputed if it or its parent was this pass
+        recomputed = dirty.copy()
+        parents = self.parents
+        for depth, level in enumerate(self.levels):
+            if depth == 0:
+                stale = level[recomputed[level]]
+                self.worlds[stale] = self.locals[stale]
+                continue
+            recomputed[level] |= recomputed[parents[level]]
+            stale = level[recomputed[level]]
+            if len(stale):
+                self.worlds[stale] = np.matmul(self.worlds[parents[stale]],
+                                               self.locals[stale])
+
+        dirty[:] = False
+        self.any_dirty = False
+
+        # place the shapes of the nodes that moved
+        moved = np.flatnonzero(recomputed).tolist()
+        shapes = self.shapes
+        with_shapes = [index for index in moved if shapes[index] is not None]
+        if with_shapes:
+            move_shapes([shapes[index] for index in with_shapes],
+                        self.worlds[with_shapes, :3, 3])
+        return len(moved)
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
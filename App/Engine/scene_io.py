@@ -0,0 +1,211 @@
+################################################################################
+# File: scene_io.py
+# Date: 18 October 2026
+# Description:
+#
+# Saving and loading scenes. A scene file is a fixed-size header (room size
+# and camera) followed by the shape table stored column by column as
+# fixed-width arrays, so loading is a memory map rather than a parse.
+#
+#   header      128 bytes
+#   positions   float32 (n, 3)
+#   colors      float32 (n, 3)
+#   sizes       float32 (n)       side length, radius or base
+#   types       uint8 (n)         index into SHAPE_TYPES
+#   flags       uint8 (n)         FLAG_DYNAMIC
+#
+################################################################################
+
+# imports
+import struct
+import numpy as np
+from typing import Iterable, Iterator, Sequence, Tuple
+
+from .cube import Cube
+from .sphere import Sphere
+from .pyramid import Pyramid
+from .scene_store import SceneStore
+from .shape import Shape
+from .input_stream import SHAPE_TYPES
+
+# shape classes in SHAPE_TYPES order
+SHAPE_CLASSES = (Cube, Sphere, Pyramid)
+
+# file layout
+MAGIC = b'ARESCENE'
+VERSION = 1
+HEADER = struct.Struct('<8sHxxQ3I3ddd')  # magic, version, count, room size,
+                                          # camera position, yaw, pitch
+HEADER_SIZE = 128
+
+# per-shape flags
+FLAG_DYNAMIC = 1
+
+# (name, dtype, columns) in file order
+COLUMNS = (
+    ('positions', np.float32, 3),
+    ('colors', np.float32, 3),
+    ('sizes', np.float32, 1),
+    ('types', np.uint8, 1),
+    ('flags', np.uint8, 1)
+)
+
+def shape_columns(store: SceneStore,
+                  dynamic: Iterable[Shape]=()) -> Tuple[np.ndarray, ...]:
+    '''
+    Packs the shapes of a scene store into the scene file columns, read
+    straight from the store's columns in row order
+
+    Parameters:
+        - store: the SceneStore holding the shapes
+        - dynamic: the shapes that fall under gravity
+
+    Returns:
+        - a tuple of the positions, colors, sizes, types and flags arrays
+
+    Raises:
+        - ValueError if a shape has no scene file type
+    '''
+    n = len(store)
+    type_codes = store.types[:n]
+
+    # Shape.type_code -> index into SHAPE_CLASSES
+    known = {cls.type_code: cls for cls in SHAPE_CLASSES}
+    lookup = np.zeros(256, dtype=np.uint8)
+    for code, cls in enumerate(SHAPE_CLASSES):
+        lookup[cls.type_code] = code
+    for type_code in np.unique(type_codes).tolist():
+        cls = store.classes.get(type_code, known.get(type_code))
+        if cls is None or known.get(type_code) is not cls:
+            name = cls.__name__ if cls is not None else f'Type {type_code}'
+            raise ValueError(f'{name} shapes can not be saved in a scene '
+                             'file')
+
+    # every scene file class keeps its size in the first dimension
+    positions = store.positions[:n].astype(np.float32)
+    colors = store.colors[:n].astype(np.float32)
+    sizes = store.dimensions[:n, 0].astype(np.float32)
+    types = lookup[type_codes]
+
+    flags = np.zeros(n, dtype=np.uint8)
+    dynamic = [shape for shape in dynamic if shape in store]
+    handles = np.fromiter((shape._handle for shape in dynamic),
+                          dtype=np.int64, count=len(dynamic))
+    flags[store.rows_of(handles)] = FLAG_DYNAMIC
+
+    return positions, colors, sizes, types, flags
+
+def save_scene(path: str, room_size: Sequence[int],
+               camera: Tuple[Sequence[float], float, float],
+               positions: np.ndarray, colors: np.ndarray, sizes: np.ndarray,
+               types: np.ndarray, flags: np.ndarray=None) -> None:
+    '''
+    Writes a scene file
+
+    Parameters:
+        - path: string path of the file to write
+        - room_size: the room's integer width, height and length
+        - camera: tuple of the camera position, yaw and pitch
+        - positions: (n, 3) array of shape positions
+        - colors: (n, 3) array of shape colors
+        - sizes: (n,) array of side lengths, radii or bases
+        - types: (n,) array of indices into SHAPE_TYPES
+        - flags: optional (n,) array of per-shape flags
+
+    Returns: None
+    '''
+    count = len(positions)
+    if flags is None:
+        flags = np.zeros(count, dtype=np.uint8)
+    arrays = dict(positions=positions, colors=colors, sizes=sizes,
+                  types=types, flags=flags)
+
+    position, yaw, pitch = camera
+    header = HEADER.pack(MAGIC, VERSION, count, *room_size, *position, yaw,
+                         pitch)
+
+    with open(path, 'wb') as file:
+        file.write(header.ljust(HEADER_SIZE, b'\0'))
+        for name, dtype, columns in COLUMNS:
+            array = np.ascontiguousarray(arrays[name], dtype=dtype)
+            if array.size != count * columns:
+                raise ValueError(f'{name} has {array.size} values, expected '
+                                 f'{count * columns}')
+            file.write(array.tobytes())
+
+class SceneData():
+    def __init__(self, path: str) -> None:
+        '''
+        Constructor for SceneData class. Memory-maps a scene file; the
+        columns are read-only views of the file, paged in as they are used.
+
+        Parameters:
+            - path: string path of the file to read
+
+        Returns: None
+
+        Raises:
+            - ValueError if the file isn't a scene this version can read
+        '''
+        self.raw = np.memmap(path, dtype=np.uint8, mode='r')
+        if len(self.raw) < HEADER_SIZE:
+            raise ValueError(f'{path} is not a scene file')
+
+        (magic, version, count, *values) = HEADER.unpack_from(self.raw, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a version {VERSION} scene')
+
+        self.count = count
+        self.room_size = tuple(values[0:3])
+        self.camera_position = tuple(values[3:6])
+        self.yaw, self.pitch = values[6:8]
+
+        offset = HEADER_SIZE
+        for name, dtype, columns in COLUMNS:
+            shape = (count, columns) if columns > 1 else (count,)
+            nbytes = count * columns * np.dtype(dtype).itemsize
+            if offset + nbytes > len(self.raw):
+                raise ValueError(f'{path} is truncated')
+            setattr(self, name, np.ndarray(shape, dtype=dtype,
+                                           buffer=self.raw, offset=offset))
+            offset += nbytes
+
+    def __len__(self) -> int:
+        return self.count
+
+    def shape(self, index: int) -> Shape:
+        '''
+        Builds one shape from the table
+
+        Parameters:
+            - index: integer row of the shape table
+
+        Returns:
+            - the new shape
+        '''
+        return SHAPE_CLASSES[self.types[index]](
+            float(self.sizes[index]), tuple(self.colors[index].tolist()),
+            tuple(self.positions[index].tolist()))
+
+    def shapes(self, start: int=0, stop: int=None) -> Iterator[Shape]:
+        '''
+        Builds the shapes in a range of rows, converting each column range
+        in one go rather than field by field
+
+        Parameters:
+            - start: integer first row
+            - stop: integer row to stop before, defaults to the end
+
+        Returns:
+            - an iterator of the new shapes
+        '''
+        stop = self.count if stop is None else min(stop, self.count)
+        columns = zip(self.types[start:stop].tolist(),
+                      self.sizes[start:stop].tolist(),
+                      self.colors[start:stop].tolist(),
+                      self.positions[start:stop].tolist())
+        for code, size, color, position in columns:
+            yield SHAPE_CLASSES[code](size, tuple(color), tuple(position))
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,593 @@
+################################################################################
+# File: scene_store.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the scene store. The type code, dimensions, color and
+# position of every shape live in typed columns, one row per shape, instead
+# of in each shape object. Shapes are small __slots__ views holding a store
+# and a handle; the handle stays valid while rows move, so adding and
+# removing are O(1) and bulk work (culling, saving) reads whole columns.
+#
+#   types       uint8 (n)         Shape.type_code of the row's class
+#   data        float64 (n, 8)    dimensions (2), color (3), position (3)
+#
+# dimensions, colors and positions are views of the columns of data, so a
+# row is written, copied or moved with one assignment.
+#
+################################################################################
+
+# imports
+import numpy as np
+from array import array
+from typing import (Any, Callable, Dict, Iterator, List, Optional, Sequence,
+                    Tuple)
+
+class Dimension():
+    def __init__(self, column: int) -> None:
+        '''
+        Constructor for Dimension class. A size attribute of a shape, e.g.
+        Cube.side_length, kept in a column of the shape's store.
+
+        Parameters:
+            - column: integer column of SceneStore.dimensions
+
+        Returns: None
+        '''
+        self.column = column
+
+    def __get__(self, obj: Any, owner: type=None) -> float:
+        if obj is None:
+            return self
+        store = obj._store
+        return store.dimensions[store.rows[obj._handle], self.column].item()
+
+    def __set__(self, obj: Any, value: float) -> None:
+        store = obj._store
+        store.dimensions[store.rows[obj._handle], self.column] = value
+
+class SceneStore():
+    def __init__(self, capacity: int=1024, keep_proxies: bool=True) -> None:
+        '''
+        Constructor for SceneStore class
+
+        Parameters:
+            - capacity: integer number of rows to allocate up front, doubled
+                whenever it runs out
+            - keep_proxies: boolean, True to keep the shape of every row so
+                the store can be used like a list of shapes. Shapes in a
+                store that doesn't keep them give their row back when they
+                are garbage collected.
+
+        Returns: None
+        '''
+        self.count = 0
+        self.keep_proxies = keep_proxies
+
+        # columns, valid up to count. Removing a row moves the last row into
+        # its place, so the rows stay packed.
+        self.types = np.zeros(capacity, dtype=np.uint8)
+        self.data = np.zeros((capacity, 8))
+        self.__views()
+
+        # handle -> row (-1 for a free handle) and row -> handle
+        self.rows = array('q')
+        self.handles = array('q')
+        self.free = array('q')
+
+        # row -> shape, when kept
+        self.proxies: List[Any] = []
+
+        # type code -> shape class, None when several classes share a code
+        self.classes: Dict[int, Optional[type]] = {}
+
+        # handles given back by garbage collected shapes. The collector can
+        # run in the middle of another call, so they are only freed at the
+        # start of the next one.
+        self.pending: List[int] = []
+
+        # functions called with any shape of the store that changes, for
+        # indexes over many of its shapes (see add_listener)
+        self.listeners: List[Callable[[Any], None]] = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.proxies)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.proxies[index]
+
+    def __contains__(self, shape: Any) -> bool:
+        return getattr(shape, '_store', None) is self
+
+    def __views(self) -> None:
+        '''
+        Points the named columns at the current data array
+
+        Parameters: None
+
+        Returns: None
+        '''
+        data = self.data
+        self.dimensions = data[:, 0:2]
+        self.colors = data[:, 2:5]
+        self.positions = data[:, 5:8]
+
+    def __reserve(self, n: int) -> None:
+        '''
+        Makes room for n more rows
+
+        Parameters:
+            - n: integer number of rows
+
+        Returns: None
+        '''
+        needed = self.count + n
+        capacity = len(self.types)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+
+        for name in ('types', 'data'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.__views()
+
+    def __collect(self) -> None:
+        '''
+        Frees the rows of shapes that were garbage collected
+
+        Parameters: None
+
+        Returns: None
+        '''
+        pending = self.pending
+        while pending:
+            self.delete(pending.pop())
+
+    def add(self, type_code: int, values: Sequence[float],
+            proxy: Any=None) -> int:
+        '''
+        Adds one row
+
+        Parameters:
+            - type_code: integer code of the shape's class
+            - values: the row's eight floats, see data
+            - proxy: the shape viewing the row, kept if keep_proxies is set
+
+        Returns:
+            - the integer handle of the row
+        '''
+        self.__collect()
+        self.__reserve(1)
+
+        row = self.count
+        self.types[row] = type_code
+        self.data[row] = values
+        self.count += 1
+
+        if self.free:
+            handle = self.free.pop()
+            self.rows[handle] = row
+        else:
+            handle = len(self.rows)
+            self.rows.append(row)
+        self.handles.append(handle)
+
+        if self.keep_proxies:
+            self.proxies.append(proxy)
+            if proxy is not None:
+                self.__register(type_code, type(proxy))
+        return handle
+
+    def add_many(self, types: np.ndarray, dimensions: np.ndarray,
+                 colors: np.ndarray, positions: np.ndarray,
+                 proxies: Sequence[Any]=None) -> List[int]:
+        '''
+        Adds many rows with one copy per column
+
+        Parameters:
+            - types: (n,) array of type codes
+            - dimensions: (n, 2) array of dimensions
+            - colors: (n, 3) array of colors
+            - positions: (n, 3) array of positions
+            - proxies: the shapes viewing the rows, if keep_proxies is set.
+                None leaves them to be filled in by the caller.
+
+        Returns:
+            - the list of new handles, in row order
+        '''
+        self.__collect()
+        n = len(types)
+        self.__reserve(n)
+
+        start, end = self.count, self.count + n
+        self.types[start:end] = types
+        self.dimensions[start:end] = dimensions
+        self.colors[start:end] = colors
+        self.positions[start:end] = positions
+        self.count = end
+
+        # reuse free handles first, then number new ones
+        reused = min(n, len(self.free))
+        handles = self.free[len(self.free) - reused:].tolist()
+        del self.free[len(self.free) - reused:]
+        handles.extend(range(len(self.rows), len(self.rows) + n - reused))
+        self.rows.extend(array('q', [-1]) * (n - reused))
+
+        rows = self.rows
+        for row, handle in enumerate(handles, start):
+            rows[handle] = row
+        self.handles.extend(handles)
+
+        if self.keep_proxies:
+            if proxies is None:
+                self.proxies.extend([None] * n)
+            else:
+                self.proxies.extend(proxies)
+                for code in np.unique(types).tolist():
+                    self.__register(code, type(
+                        proxies[int(np.argmax(types == code))]))
+        return handles
+
+    def delete(self, handle: int) -> None:
+        '''
+        Removes one row by moving the last row into its place
+
+        Parameters:
+            - handle: integer handle of the row
+
+        Returns: None
+
+        Raises:
+            - KeyError if the handle is not in use
+        '''
+        row = self.rows[handle] if 0 <= handle < len(self.rows) else -1
+        if row < 0:
+            raise KeyError(handle)
+
+        last = self.count - 1
+        if row != last:
+            self.types[row] = self.types[last]
+            self.data[row] = self.data[last]
+            moved = self.handles[last]
+            self.handles[row] = moved
+            self.rows[moved] = row
+            if self.keep_proxies:
+                self.proxies[row] = self.proxies[last]
+
+        self.handles.pop()
+        if self.keep_proxies:
+            self.proxies.pop()
+        self.rows[handle] = -1
+        self.free.append(handle)
+        self.count = last
+
+    def add_listener(self, listener: Callable[[Any], None]) -> None:
+        '''
+        Registers a function to call whenever any shape in the store
+        changes, as Shape.add_listener does for one shape. Lets an index
+        over many shapes follow them without a listener on each.
+
+        Parameters:
+            - listener: a function taking the shape that changed
+
+        Returns: None
+        '''
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Any], None]) -> None:
+        '''
+        Unregisters a function added with add_listener
+
+        Parameters:
+            - listener: the function to remove
+
+        Returns: None
+        '''
+        self.listeners.remove(listener)
+
+    def row(self, handle: int) -> int:
+        '''
+        Returns the current row of a handle
+
+        Parameters:
+            - handle: integer handle
+
+        Returns:
+            - the integer row, -1 if the handle is free
+        '''
+        return self.rows[handle]
+
+    def rows_of(self, handles: np.ndarray) -> np.ndarray:
+        '''
+        Returns the current rows of many handles at once
+
+        Parameters:
+            - handles: integer array of handles
+
+        Returns:
+            - an int64 array of rows, -1 for free handles
+        '''
+        # a copy, so the handle table isn't held and can still grow
+        return np.frombuffer(self.rows, dtype=np.int64)[handles]
+
+    def handles_of(self, rows: np.ndarray) -> np.ndarray:
+        '''
+        Returns the handles of many rows at once
+
+        Parameters:
+            - rows: integer array of rows
+
+        Returns:
+            - an int64 array of handles
+        '''
+        return np.frombuffer(self.handles, dtype=np.int64)[rows]
+
+    def __register(self, code: int, cls: type) -> None:
+        '''
+        Remembers the class behind a type code, for the bulk bounds in
+        visible()
+
+        Parameters:
+            - code: integer type code
+            - cls: the shape class
+
+        Returns: None
+        '''
+        known = self.classes.setdefault(code, cls)
+        if known is not cls:
+            self.classes[code] = None
+
+    def create(self, classes: Sequence[type], types: np.ndarray,
+               dimensions: np.ndarray, colors: np.ndarray,
+               positions: np.ndarray) -> List[Any]:
+        '''
+        Adds many rows and makes a shape for each, without going through
+        the shape constructors
+
+        Parameters:
+            - classes: shape classes indexed by the codes in types
+            - types: (n,) array of indices into classes
+            - dimensions: (n, 2) array of dimensions
+            - colors: (n, 3) array of colors
+            - positions: (n, 3) array of positions
+
+        Returns:
+            - the list of new shapes, in row order
+        '''
+        codes = np.array([cls.type_code for cls in classes],
+                         dtype=np.uint8)[types]
+        handles = self.add_many(codes, dimensions, colors, positions)
+        shapes = [classes[index].view(self, handle)
+                  for index, handle in zip(types.tolist(), handles)]
+        if self.keep_proxies and shapes:
+            self.proxies[-len(shapes):] = shapes
+            for index in np.unique(types).tolist():
+                self.__register(classes[index].type_code, classes[index])
+        return shapes
+
+    def append(self, shape: Any) -> None:
+        '''
+        Moves a shape's row into this store
+
+        Parameters:
+            - shape: the shape to add
+
+        Returns: None
+
+        Raises:
+            - ValueError if the shape is already in this or another store
+                that keeps its shapes, e.g. another scene
+        '''
+        old = shape._store
+        if old is self or old.keep_proxies:
+            raise ValueError('the shape is already in a scene')
+        row = old.rows[shape._handle]
+        handle = self.add(old.types[row], old.data[row], shape)
+        old.delete(shape._handle)
+        shape._store, shape._handle = self, handle
+
+    def extend(self, shapes: Sequence[Any]) -> None:
+        '''
+        Moves many shapes' rows into this store
+
+        Parameters:
+            - shapes: the shapes to add
+
+        Returns: None
+        '''
+        for shape in shapes:
+            self.append(shape)
+
+    def remove(self, shape: Any) -> None:
+        '''
+        Moves a shape's row out of this store. The shape keeps working on
+        its own and can be added again.
+
+        Parameters:
+            - shape: the shape to remove
+
+        Returns: None
+
+        Raises:
+            - ValueError if the shape is not in this store
+        '''
+        if shape not in self:
+            raise ValueError('the shape is not in the scene')
+        row = self.rows[shape._handle]
+        handle = detached.add(self.types[row], self.data[row])
+        self.delete(shape._handle)
+        shape._store, shape._handle = detached, handle
+
+    def clear(self) -> None:
+        '''
+        Moves every row out of this store at once
+
+        Parameters: None
+
+        Returns: None
+        '''
+        n = self.count
+        handles = detached.add_many(self.types[:n], self.dimensions[:n],
+                                    self.colors[:n], self.positions[:n])
+        shapes = self.proxies
+        for shape, handle in zip(shapes, handles):
+            if shape is not None:
+                shape._store, shape._handle = detached, handle
+
+        self.count = 0
+        self.rows, self.handles, self.free = array('q'), array('q'), array('q')
+        self.proxies = []
+        self.pending = []
+
+    def boxes(self, rows: np.ndarray,
+              shapes: Sequence[Any]=None) -> Tuple[np.ndarray, np.ndarray]:
+        '''
+        Bounding boxes of many rows in world space. They come from whole
+        columns for classes that provide local_boxes(), and from each shape
+        otherwise.
+
+        Parameters:
+            - rows: integer array of rows
+            - shapes: optional shapes viewing the rows, asked for their
+                bounds instead of the kept proxies
+
+        Returns:
+            - a tuple of (n, 3) min and max corner arrays
+        '''
+        rows = np.asarray(rows, dtype=np.int64)
+        codes = self.types[rows]
+        lows = self.positions[rows]
+        highs = lows.copy()
+        for code in np.unique(codes).tolist():
+            part = np.flatnonzero(codes == code)
+            cls = self.classes.get(code)
+            boxes = (cls.local_boxes(self.dimensions[rows[part]])
+                     if cls is not None else None)
+            if boxes is None:
+                if shapes is None:
+                    proxies = self.proxies
+                    shapes = [proxies[row] for row in rows.tolist()]
+                for index in part.tolist():
+                    lows[index], highs[index] = shapes[index].aabb()
+            else:
+                lows[part] += boxes[0]
+                highs[part] += boxes[1]
+        return lows, highs
+
+    def visible(self, frustum: Any) -> List[Any]:
+        '''
+        Culls the stored shapes against a frustum. Bounding spheres come
+        from whole columns for classes that provide local_spheres(), and
+        from each shape otherwise.
+
+        Parameters:
+            - frustum: the Frustum to test against, or None for every shape
+
+        Returns:
+            - the list of visible shapes, in row order
+        '''
+        proxies = self.proxies
+        if frustum is None:
+            return list(proxies)
+
+        n = self.count
+        codes = self.types[:n]
+        centers = self.positions[:n].copy()
+        radii = np.zeros(n)
+        for code in np.unique(codes).tolist():
+            rows = np.flatnonzero(codes == code)
+            cls = self.classes.get(code)
+            spheres = (cls.local_spheres(self.dimensions[rows])
+                       if cls is not None else None)
+            if spheres is None:
+                for row in rows.tolist():
+                    centers[row], radii[row] = proxies[row].bounding_sphere()
+            else:
+                offsets, radii[rows] = spheres
+                centers[rows] += offsets
+
+        visible = frustum.spheres_visible(centers, radii)
+        return [proxies[row] for row in np.flatnonzero(visible).tolist()]
+
+def move_shapes(shapes: Sequence[Any], positions: np.ndarray,
+                notify: bool=True) -> None:
+    '''
+    Moves many shapes with one write per store, then notifies each shape's
+    listeners as its position setter would
+
+    Parameters:
+        - shapes: the shapes to move
+        - positions: (n, 3) array of new positions, in the order of shapes
+        - notify: boolean, False to skip the listeners, for callers that
+            update whatever follows the shapes in bulk themselves
+
+    Returns: None
+    '''
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    groups: Dict[SceneStore, tuple] = {}
+    for index, shape in enumerate(shapes):
+        store = shape._store
+        rows, indices = groups.setdefault(store, ([], []))
+        rows.append(store.rows[shape._handle])
+        indices.append(index)
+
+    for store, (rows, indices) in groups.items():
+        store.positions[rows] = positions[indices]
+    if notify:
+        for shape in shapes:
+            shape.changed()
+
+def shape_boxes(shapes: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    '''
+    Bounding boxes of many shapes, read from their stores' columns with
+    SceneStore.boxes, one call per store
+
+    Parameters:
+        - shapes: the shapes
+
+    Returns:
+        - a tuple of (n, 3) min and max corner arrays, in the order of shapes
+    '''
+    n = len(shapes)
+    stores = [shape._store for shape in shapes]
+    handles = np.fromiter((shape._handle for shape in shapes),
+                          dtype=np.int64, count=n)
+    if n and stores.count(stores[0]) == n:
+        store = stores[0]
+        return store.boxes(store.rows_of(handles), shapes)
+
+    lows = np.empty((n, 3))
+    highs = np.empty((n, 3))
+    groups: Dict[SceneStore, List[int]] = {}
+    for index, store in enumerate(stores):
+        groups.setdefault(store, []).append(index)
+    for store, indices in groups.items():
+        lows[indices], highs[indices] = store.boxes(
+            store.rows_of(handles[indices]),
+            [shapes[index] for index in indices])
+    return lows, highs
+
+def stores_of(shapes: Sequence[Any]) -> List[SceneStore]:
+    '''
+    Lists the stores holding some shapes, each once
+
+    Parameters:
+        - shapes: the shapes
+
+    Returns:
+        - a list of SceneStores, in order of first appearance
+    '''
+    return list(dict.fromkeys(shape._store for shape in shapes))
+
+# where shapes live until they are added to a scene
+detached = SceneStore(keep_proxies=False)
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -0,0 +1,79 @@
+################################################################################
+# File: shaders.py
+# Date: 18 October 2026
+# Description:
+#
+# Helper functions for compiling GLSL shader programs
+#
+################################################################################
+
+# imports
+from OpenGL.GL import *
+from typing import Dict
+
+def compile_shader(source: str, shader_type: int) -> int:
+    '''
+    Compiles a single shader stage
+
+    Parameters:
+        - source: string holding the GLSL source
+        - shader_type: GL_VERTEX_SHADER or GL_FRAGMENT_SHADER
+
+    Returns:
+        - the shader object id
+
+    Raises:
+        - RuntimeError if the shader fails to compile
+    '''
+    shader = glCreateShader(shader_type)
+    glShaderSource(shader, source)
+    glCompileShader(shader)
+
+    if not glGetShaderiv(shader, GL_COMPILE_STATUS):
+        log = glGetShaderInfoLog(shader)
+        glDeleteShader(shader)
+        raise RuntimeError(f'Shader compile failed: {log}')
+
+    return shader
+
+def build_program(vertex_source: str, fragment_source: str,
+                  attributes: Dict[str, int]) -> int:
+    '''
+    Compiles and links a shader program
+
+    Parameters:
+        - vertex_source: string holding the vertex shader source
+        - fragment_source: string holding the fragment shader source
+        - attributes: dictionary of attribute name to the location it should
+            be bound to before linking
+
+    Returns:
+        - the program object id
+
+    Raises:
+        - RuntimeError if a stage fails to compile or the program fails to
+            link
+    '''
+    vertex = compile_shader(vertex_source, GL_VERTEX_SHADER)
+    fragment = compile_shader(fragment_source, GL_FRAGMENT_SHADER)
+
+    program = glCreateProgram()
+    glAttachShader(program, vertex)
+    glAttachShader(program, fragment)
+    for name, location in attributes.items():
+        glBindAttribLocation(program, location, name)
+    glLinkProgram(program)
+
+    # the shaders aren't needed once they're linked into the program
+    glDeleteShader(vertex)
+    glDeleteShader(fragment)
+
+    if not glGetProgramiv(program, GL_LINK_STATUS):
+        log = glGetProgramInfoLog(program)
+        glDeleteProgram(program)
+        raise RuntimeError(f'Shader link failed: {log}')
+
+    return program
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
@@ -8,10 +8,44 @@
 ################################################################################
 
 # imports
-from OpenGL.GL import glPushMatrix, glColor3f, glTranslatef, glPopMatrix
-from typing import Tuple
+from .buffers import GeometryBuffer, shared_buffer
+from .geometry import point_geometry
+from .gl_state import state
+from .lod import screen_size, select_level
+from .scene_store import SceneStore, detached
+from OpenGL.GL import glPushMatrix, glTranslatef, glPopMatrix, glScalef
+from typing import Callable, Hashable, Optional, Tuple
+import math
+import numpy as np
+
+Vector = Tuple[float, float, float]
 
 class Shape:
+    # the color, position and sizes live in a row of a SceneStore; a shape
+    # only holds the store and the row's handle
+    __slots__ = ('_store', '_handle', '_listeners', '_lod')
+
+    # code of the shape's class in SceneStore.types, 255 for none
+    type_code = 255
+
+    # set to True to draw every shape with the original glBegin/glEnd code
+    # instead of the shared GPU buffers, e.g. to compare the two
+    immediate_mode = False
+
+    # child classes that provide geometry() set this to True
+    buffered = False
+
+    # level of detail: screen sizes (radius / distance, decreasing) below
+    # which the next coarser lod_geometry() level is drawn. Empty means the
+    # shape always uses geometry(). Levels only change once a threshold is
+    # passed by the hysteresis fraction.
+    lod_thresholds: Tuple[float, ...] = ()
+    lod_hysteresis = 0.15
+
+    # camera position used to pick levels, set by the engine every frame.
+    # None draws every shape at level 0.
+    lod_eye: Optional[Vector] = None
+
     def __init__(self, color: Tuple[float, float, float],
                  position: Tuple[float, float, float]) -> None:
         '''
@@ -25,8 +59,127 @@ class Shape:
 
         Returns: None
         '''
-        self.color = color
-        self.position = position
+        self._listeners = ()
+        self._store = detached
+        self._handle = detached.add(self.type_code,
+                                    (0.0, 0.0, *color, *position))
+
+        # level of detail drawn last
+        self._lod = 0
+
+    @classmethod
+    def view(cls, store: SceneStore, handle: int) -> 'Shape':
+        '''
+        Makes a shape for a row that is already in a store, without calling
+        the constructor
+
+        Parameters:
+            - store: the SceneStore holding the row
+            - handle: integer handle of the row
+
+        Returns:
+            - the new shape
+        '''
+        shape = cls.__new__(cls)
+        shape._listeners = ()
+        shape._store = store
+        shape._handle = handle
+        shape._lod = 0
+        return shape
+
+    def __del__(self) -> None:
+        # rows of shapes outside a scene are freed with the shape
+        store = getattr(self, '_store', None)
+        if store is not None and not store.keep_proxies:
+            store.pending.append(self._handle)
+
+    @property
+    def color(self) -> Tuple[float, float, float]:
+        store = self._store
+        return tuple(store.colors[store.rows[self._handle]].tolist())
+
+    @color.setter
+    def color(self, value: Tuple[float, float, float]) -> None:
+        store = self._store
+        store.colors[store.rows[self._handle]] = value
+        self.changed()
+
+    @property
+    def position(self) -> Tuple[float, float, float]:
+        store = self._store
+        return tuple(store.positions[store.rows[self._handle]].tolist())
+
+    @position.setter
+    def position(self, value: Tuple[float, float, float]) -> None:
+        store = self._store
+        store.positions[store.rows[self._handle]] = value
+        self.changed()
+
+    def add_listener(self, listener: Callable[['Shape'], None]) -> None:
+        '''
+        Registers a function to call whenever the shape's color or position
+        changes. Lets renderers and indexes update only what moved.
+
+        Parameters:
+            - listener: a function taking the shape that changed
+
+        Returns: None
+        '''
+        self._listeners += (listener,)
+
+    def remove_listener(self, listener: Callable[['Shape'], None]) -> None:
+        '''
+        Unregisters a function added with add_listener
+
+        Parameters:
+            - listener: the function to remove
+
+        Returns: None
+        '''
+        listeners = list(self._listeners)
+        listeners.remove(listener)
+        self._listeners = tuple(listeners)
+
+    def changed(self) -> None:
+        '''
+        Notifies the listeners that the shape changed. Call this after
+        changing a size attribute directly.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        for listener in self._listeners:
+            listener(self)
+        for listener in self._store.listeners:
+            listener(self)
+
+    def aabb(self) -> Tuple[Vector, Vector]:
+        '''
+        Axis-aligned bounding box in world space
+
+        Parameters: None
+
+        Returns:
+            - a tuple of the (min, max) corners
+        '''
+        (lx, ly, lz), (hx, hy, hz) = self.local_bounds()
+        x, y, z = self.position
+        return (x + lx, y + ly, z + lz), (x + hx, y + hy, z + hz)
+
+    def bounding_sphere(self) -> Tuple[Vector, float]:
+        '''
+        Sphere enclosing the shape's bounding box, in world space
+
+        Parameters: None
+
+        Returns:
+            - a tuple of (center, radius)
+        '''
+        (lx, ly, lz), (hx, hy, hz) = self.aabb()
+        center = ((lx + hx) / 2, (ly + hy) / 2, (lz + hz) / 2)
+        radius = math.sqrt((hx - lx) ** 2 + (hy - ly) ** 2 + (hz - lz) ** 2) / 2
+        return center, radius
 
     def draw(self) -> None:
         '''
@@ -37,14 +190,164 @@ class Shape:
         Returns: None
         '''
         # Set color and position
+        state.use_program(0)
         glPushMatrix()
-        glColor3f(*self.color)
+        state.set_color(*self.color)
         glTranslatef(*self.position)
-        self.draw_shape()
+        if Shape.immediate_mode or not self.buffered:
+            self.draw_shape()
+        else:
+            self.draw_buffered()
         glPopMatrix()
 
-    # virtual function to be overridden
+    def pipeline(self) -> Hashable:
+        '''
+        Names the GL state the shape is drawn with, so a render queue can
+        run shapes that share it back to back
+
+        Parameters: None
+
+        Returns:
+            - a hashable, equal for shapes drawn the same way
+        '''
+        if Shape.immediate_mode or not self.buffered:
+            return ('immediate', type(self))
+        return ('buffered', type(self))
+
+    def vertex_count(self) -> int:
+        '''
+        Number of vertices one buffered draw of this shape submits
+
+        Parameters: None
+
+        Returns:
+            - an integer vertex (index) count, 0 for unbuffered shapes
+        '''
+        if not self.buffered:
+            return 0
+        return self.lod_buffer(self._lod).count
+
+    def lod_level(self) -> int:
+        '''
+        Picks the level of detail to draw at from the shape's screen size
+        and remembers it
+
+        Parameters: None
+
+        Returns:
+            - the integer level, 0 being the full geometry
+        '''
+        thresholds = self.lod_thresholds
+        eye = Shape.lod_eye
+        if not thresholds or eye is None:
+            self._lod = 0
+            return 0
+
+        size = screen_size(*self.bounding_sphere(), eye)
+        self._lod = select_level(thresholds, size, self._lod,
+                                 self.lod_hysteresis)
+        return self._lod
+
+    @classmethod
+    def lod_buffer(cls, level: int) -> GeometryBuffer:
+        '''
+        Returns the shared buffer for one level of detail
+
+        Parameters:
+            - level: integer level, 0 being the full geometry
+
+        Returns:
+            - the GeometryBuffer for the level
+        '''
+        if level == 0:
+            return shared_buffer(cls, cls.geometry)
+        return shared_buffer((cls, level), lambda: cls.lod_geometry(level))
+
+    def draw_buffered(self) -> None:
+        '''
+        Draws the shape from the buffer shared by all shapes of its type,
+        scaled to this shape's size. Issues a single draw call.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        scale = self.scale()
+        glScalef(scale, scale, scale)
+        self.lod_buffer(self.lod_level()).draw()
+
+    # virtual functions to be overridden
     def draw_shape(self) -> None: return
 
+    @classmethod
+    def geometry(cls) -> Optional[Tuple[np.ndarray, np.ndarray]]: return None
+
+    @classmethod
+    def lod_geometry(cls, level: int) -> Tuple:
+        '''
+        Geometry for a coarser level of detail. By default every level
+        past 0 is a single point at the middle of the geometry.
+
+        Parameters:
+            - level: integer level, 1 or more
+
+        Returns:
+            - a tuple of (vertices, indices) or (vertices, indices, mode)
+        '''
+        vertices, _ = cls.geometry()[:2]
+        center = (vertices.min(axis=0) + vertices.max(axis=0)) / 2
+        return point_geometry(tuple(center))
+
+    @classmethod
+    def size_dimensions(cls, sizes: np.ndarray) -> np.ndarray:
+        '''
+        Store dimensions of shapes made from one size each, as in
+        Engine.spawn_many
+
+        Parameters:
+            - sizes: (n,) array of sizes
+
+        Returns:
+            - (n, 2) float64 array of dimensions
+        '''
+        dimensions = np.zeros((len(sizes), 2))
+        dimensions[:, 0] = sizes
+        return dimensions
+
+    @classmethod
+    def local_spheres(cls, dimensions: np.ndarray) -> Optional[Tuple]:
+        '''
+        Bounding spheres of many shapes of this class from their store
+        dimensions, relative to their positions. None means the bounds
+        depend on more than the dimensions, so each shape is asked.
+
+        Parameters:
+            - dimensions: (n, 2) array of dimensions
+
+        Returns:
+            - a tuple of (n, 3) center offsets and (n,) radii, or None
+        '''
+        return None
+
+    @classmethod
+    def local_boxes(cls, dimensions: np.ndarray) -> Optional[Tuple]:
+        '''
+        Bounding boxes of many shapes of this class from their store
+        dimensions, relative to their positions, as local_bounds gives for
+        one. None means each shape is asked.
+
+        Parameters:
+            - dimensions: (n, 2) array of dimensions
+
+        Returns:
+            - a tuple of (n, 3) min and max corner offsets, or None
+        '''
+        return None
+
+    def scale(self) -> float: return 1.0
+
+    def local_bounds(self) -> Tuple[Vector, Vector]:
+        return (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)
+
 if __name__ == '__main__':
     assert False, 'This is a class file. Import its contents into another file.'
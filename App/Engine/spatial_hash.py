@@ -0,0 +1,428 @@
+################################################################################
+# File: spatial_hash.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the spatial hash used to find objects near a position
+# without testing every object in the scene
+#
+################################################################################
+
+# imports
+import math
+import numpy as np
+from typing import Any, Dict, Iterator, List, Sequence, Set, Tuple
+
+from .narrowphase import aabb_overlap, sphere_aabb
+
+Vector = Tuple[float, float, float]
+CellRange = Tuple[int, int, int, int, int, int]
+
+# a cell (x, y, z) is keyed by one integer, 21 bits per coordinate, so keys
+# can be computed for many cells at once with NumPy
+CELL_BITS = 21
+CELL_OFFSET = 1 << (CELL_BITS - 1)
+
+def segment_hits_aabb(start: Sequence[float], end: Sequence[float],
+                      low: Sequence[float], high: Sequence[float]) -> bool:
+    '''
+    Tests whether a line segment passes through an axis-aligned box using the
+    slab method
+
+    Parameters:
+        - start: the first end point of the segment
+        - end: the second end point of the segment
+        - low, high: the min and max corners of the box
+
+    Returns:
+        - True if any part of the segment is inside the box
+    '''
+    t_min, t_max = 0.0, 1.0
+    for axis in range(3):
+        origin = start[axis]
+        direction = end[axis] - origin
+        if direction == 0.0:
+            if origin < low[axis] or origin > high[axis]:
+                return False
+            continue
+
+        t0 = (low[axis] - origin) / direction
+        t1 = (high[axis] - origin) / direction
+        if t0 > t1:
+            t0, t1 = t1, t0
+        t_min = max(t_min, t0)
+        t_max = min(t_max, t1)
+        if t_min > t_max:
+            return False
+    return True
+
+def as_set(members: Any) -> Set[int]:
+    '''
+    Returns a cell's slots as a set, converting an array of them from
+    SpatialHash.insert_many
+
+    Parameters:
+        - members: a set or integer array of slots
+
+    Returns:
+        - a set of integer slots
+    '''
+    return members if isinstance(members, set) else set(members.tolist())
+
+class SpatialHash():
+    def __init__(self, cell_size: float=2.0, capacity: int=1024) -> None:
+        '''
+        Constructor for SpatialHash class. Space is split into cubic cells and
+        every object is stored in each cell its bounding box touches.
+
+        Parameters:
+            - cell_size: float, edge length of a cell. Works best at about the
+                size of a typical object.
+            - capacity: integer number of objects to allocate room for
+
+        Returns: None
+        '''
+        self.cell_size = cell_size
+
+        # cell key -> slots of the objects in the cell. A set, or an array
+        # of slots as insert_many grouped them until the cell next changes.
+        self.cells: Dict[int, Any] = {}
+
+        # objects by slot (None for a free slot), id(object) -> slot, and
+        # the slots freed by remove
+        self.objects: List[Any] = []
+        self.slots: Dict[int, int] = {}
+        self.free: List[int] = []
+
+        # bounding box and cell range of every slot
+        self.lows = np.zeros((capacity, 3))
+        self.highs = np.zeros((capacity, 3))
+        self.ranges = np.zeros((capacity, 6), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __contains__(self, obj: Any) -> bool:
+        return id(obj) in self.slots
+
+    def cell_range(self, low: Sequence[float],
+                   high: Sequence[float]) -> CellRange:
+        '''
+        Finds the range of cells covered by a box
+
+        Parameters:
+            - low, high: the min and max corners of the box
+
+        Returns:
+            - a tuple of the min cell x, y, z and max cell x, y, z
+        '''
+        size = self.cell_size
+        return (math.floor(low[0] / size), math.floor(low[1] / size),
+                math.floor(low[2] / size), math.floor(high[0] / size),
+                math.floor(high[1] / size), math.floor(high[2] / size))
+
+    @staticmethod
+    def __cells(cell_range: Sequence[int]) -> Iterator[int]:
+        '''
+        Generates the key of every cell in a cell range
+
+        Parameters:
+            - cell_range: a range from cell_range()
+
+        Returns:
+            - a generator of integer cell keys
+        '''
+        x0, y0, z0, x1, y1, z1 = cell_range
+        for x in range(x0 + CELL_OFFSET, x1 + CELL_OFFSET + 1):
+            for y in range(y0 + CELL_OFFSET, y1 + CELL_OFFSET + 1):
+                key = (x << (2 * CELL_BITS)) | (y << CELL_BITS)
+                for z in range(z0 + CELL_OFFSET, z1 + CELL_OFFSET + 1):
+                    yield key | z
+
+    def __reserve(self, n: int) -> None:
+        '''
+        Makes room for n more slots at the end
+
+        Parameters:
+            - n: integer number of slots
+
+        Returns: None
+        '''
+        needed = len(self.objects) + n
+        capacity = len(self.lows)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ('lows', 'highs', 'ranges'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(self.objects)] = old[:len(self.objects)]
+            setattr(self, name, new)
+
+    def __place(self, slot: int, low: Sequence[float],
+                high: Sequence[float]) -> None:
+        '''
+        Stores a slot's bounds and adds it to the cells they touch
+
+        Parameters:
+            - slot: integer slot
+            - low, high: the min and max corners of the bounding box
+
+        Returns: None
+        '''
+        cell_range = self.cell_range(low, high)
+        self.lows[slot] = low
+        self.highs[slot] = high
+        self.ranges[slot] = cell_range
+        cells = self.cells
+        for key in self.__cells(cell_range):
+            members = cells.get(key)
+            if members is None:
+                cells[key] = {slot}
+            else:
+                members = cells[key] = as_set(members)
+                members.add(slot)
+
+    def __unplace(self, slot: int) -> None:
+        '''
+        Takes a slot out of every cell it is in
+
+        Parameters:
+            - slot: integer slot
+
+        Returns: None
+        '''
+        cells = self.cells
+        for key in self.__cells(self.ranges[slot].tolist()):
+            members = cells[key] = as_set(cells[key])
+            members.discard(slot)
+            if not members:
+                del cells[key]
+
+    def insert(self, obj: Any, low: Sequence[float],
+               high: Sequence[float]) -> None:
+        '''
+        Adds an object with the given bounding box
+
+        Parameters:
+            - obj: the object to add
+            - low, high: the min and max corners of its bounding box
+
+        Returns: None
+        '''
+        if self.free:
+            slot = self.free.pop()
+            self.objects[slot] = obj
+        else:
+            self.__reserve(1)
+            slot = len(self.objects)
+            self.objects.append(obj)
+        self.slots[id(obj)] = slot
+        self.__place(slot, low, high)
+
+    def insert_many(self, objects: Sequence[Any], lows: np.ndarray,
+                    highs: np.ndarray) -> None:
+        '''
+        Adds many objects at once. The cell ranges and cell keys of every
+        object are computed as whole arrays and sorted by cell, and each
+        cell keeps its slice of the sorted slots until it next changes.
+
+        Parameters:
+            - objects: the objects to add
+            - lows, highs: (n, 3) arrays of the min and max corners of their
+                bounding boxes
+
+        Returns: None
+        '''
+        n = len(objects)
+        if not n:
+            return
+        self.__reserve(n)
+        start = len(self.objects)
+        end = start + n
+
+        lows = np.asarray(lows, dtype=np.float64).reshape(n, 3)
+        highs = np.asarray(highs, dtype=np.float64).reshape(n, 3)
+        low_cells = np.floor(lows / self.cell_size).astype(np.int64)
+        high_cells = np.floor(highs / self.cell_size).astype(np.int64)
+        self.lows[start:end] = lows
+        self.highs[start:end] = highs
+        self.ranges[start:end, :3] = low_cells
+        self.ranges[start:end, 3:] = high_cells
+
+        self.objects.extend(objects)
+        self.slots.update(zip(map(id, objects), range(start, end)))
+
+        # one entry per object and cell it touches: the object's slot and
+        # the cell's coordinates, counted off from the object's low corner
+        counts = high_cells - low_cells + 1
+        totals = counts.prod(axis=1)
+        owners = np.repeat(np.arange(start, end), totals)
+        first = np.repeat(np.cumsum(totals) - totals, totals)
+        within = np.arange(len(owners)) - first
+        depth = np.repeat(counts[:, 2], totals)
+        height = np.repeat(counts[:, 1], totals)
+        x = np.repeat(low_cells[:, 0], totals) + within // (depth * height)
+        y = np.repeat(low_cells[:, 1], totals) + (within // depth) % height
+        z = np.repeat(low_cells[:, 2], totals) + within % depth
+        keys = (((x + CELL_OFFSET) << (2 * CELL_BITS))
+                | ((y + CELL_OFFSET) << CELL_BITS) | (z + CELL_OFFSET))
+
+        # group the entries by cell
+        order = np.argsort(keys)
+        keys = keys[order]
+        owners = owners[order]
+        firsts = np.flatnonzero(np.diff(keys, prepend=keys[0] - 1))
+        bounds = firsts.tolist() + [len(owners)]
+        parts = [owners[first:last] for first, last
+                 in zip(bounds, bounds[1:])]
+        keys = keys[firsts].tolist()
+
+        cells = self.cells
+        if not cells:
+            cells.update(zip(keys, parts))
+            return
+        for key, part in zip(keys, parts):
+            members = cells.get(key)
+            if members is None:
+                cells[key] = part
+            else:
+                members = cells[key] = as_set(members)
+                members.update(part.tolist())
+
+    def remove(self, obj: Any) -> None:
+        '''
+        Removes an object
+
+        Parameters:
+            - obj: the object to remove
+
+        Returns: None
+        '''
+        slot = self.slots.pop(id(obj))
+        self.__unplace(slot)
+        self.objects[slot] = None
+        self.free.append(slot)
+
+    def move(self, obj: Any, low: Sequence[float],
+             high: Sequence[float]) -> None:
+        '''
+        Updates the bounding box of an object. Cells are only touched if the
+        object moved into a different set of cells.
+
+        Parameters:
+            - obj: the object that moved
+            - low, high: the min and max corners of its new bounding box
+
+        Returns: None
+        '''
+        slot = self.slots[id(obj)]
+        if tuple(self.ranges[slot].tolist()) == self.cell_range(low, high):
+            self.lows[slot] = low
+            self.highs[slot] = high
+            return
+
+        self.__unplace(slot)
+        self.__place(slot, low, high)
+
+    def candidates(self, low: Sequence[float],
+                   high: Sequence[float]) -> Set[int]:
+        '''
+        Collects the slots of objects stored in any cell the box touches
+
+        Parameters:
+            - low, high: the min and max corners of the box
+
+        Returns:
+            - a set of integer slots
+        '''
+        found = set()
+        cells = self.cells
+        for key in self.__cells(self.cell_range(low, high)):
+            members = cells.get(key)
+            if members is not None:
+                found |= as_set(members)
+        return found
+
+    def __candidate_bounds(self, low: Sequence[float],
+                           high: Sequence[float]) -> Iterator[Tuple]:
+        '''
+        Yields the objects near a box with their bounds
+
+        Parameters:
+            - low, high: the min and max corners of the box
+
+        Returns:
+            - an iterator of (object, low, high) tuples
+        '''
+        slots = list(self.candidates(low, high))
+        if not slots:
+            return iter(())
+        objects = self.objects
+        return zip([objects[slot] for slot in slots],
+                   self.lows[slots].tolist(), self.highs[slots].tolist())
+
+    def query_box(self, low: Sequence[float],
+                  high: Sequence[float]) -> List[Any]:
+        '''
+        Finds every object whose bounding box overlaps a box
+
+        Parameters:
+            - low, high: the min and max corners of the box
+
+        Returns:
+            - a list of objects
+        '''
+        return [obj for obj, obj_low, obj_high
+                in self.__candidate_bounds(low, high)
+                if aabb_overlap(low, high, obj_low, obj_high)]
+
+    def query_sphere(self, center: Sequence[float],
+                     radius: float=0.0) -> List[Any]:
+        '''
+        Finds every object whose bounding box overlaps a sphere (or contains a
+        point when radius is 0)
+
+        Parameters:
+            - center: the sphere center
+            - radius: float, the sphere radius
+
+        Returns:
+            - a list of objects
+        '''
+        x, y, z = center
+        low = (x - radius, y - radius, z - radius)
+        high = (x + radius, y + radius, z + radius)
+        return [obj for obj, obj_low, obj_high
+                in self.__candidate_bounds(low, high)
+                if sphere_aabb(center, radius, obj_low, obj_high)]
+
+    def query_capsule(self, start: Sequence[float], end: Sequence[float],
+                      radius: float) -> List[Any]:
+        '''
+        Finds every object whose bounding box overlaps a capsule. Boxes are
+        grown by the radius and tested against the capsule's segment, which
+        is slightly conservative near box corners.
+
+        Parameters:
+            - start: the center of one end of the capsule
+            - end: the center of the other end of the capsule
+            - radius: float, the capsule radius
+
+        Returns:
+            - a list of objects
+        '''
+        low = tuple(min(start[i], end[i]) - radius for i in range(3))
+        high = tuple(max(start[i], end[i]) + radius for i in range(3))
+
+        hits = []
+        for obj, obj_low, obj_high in self.__candidate_bounds(low, high):
+            grown_low = tuple(v - radius for v in obj_low)
+            grown_high = tuple(v + radius for v in obj_high)
+            if segment_hits_aabb(start, end, grown_low, grown_high):
+                hits.append(obj)
+        return hits
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
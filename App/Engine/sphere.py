@@ -9,10 +9,30 @@
 
 # imports
 from .shape import Shape
+from .scene_store import Dimension
+from .geometry import sphere_geometry
 from OpenGL.GLU import gluNewQuadric, gluSphere
 from typing import Tuple
+import numpy as np
 
 class Sphere(Shape):
+    __slots__ = ()
+    type_code = 1
+
+    # drawn from the shared GPU buffer built by geometry()
+    buffered = True
+
+    radius = Dimension(0)
+
+    # (slices, stacks) per level of detail, and the screen sizes (radius /
+    # distance) where each coarser level starts. 0.08 is roughly a 60 pixel
+    # radius in an 800x600 window.
+    tessellations = ((32, 32), (16, 16), (10, 8), (6, 4))
+    lod_thresholds = (0.08, 0.03, 0.012)
+
+    # one quadric for every immediate mode draw
+    quadric = None
+
     def __init__(self, radius: float,
                  color: Tuple[float, float, float]=(1.0, 1.0, 1.0),
                  position: Tuple[float, float, float]=(0.0, 0.0, 0.0)) -> None:
@@ -40,9 +60,100 @@ class Sphere(Shape):
 
         Returns: None
         '''
-        # Use GLU quadric to draw the sphere
-        quad = gluNewQuadric()
-        gluSphere(quad, self.radius, 32, 32)
+        # Use GLU quadric to draw the sphere (the fallback path, see
+        # Shape.immediate_mode)
+        if Sphere.quadric is None:
+            Sphere.quadric = gluNewQuadric()
+        slices, stacks = self.tessellations[self.lod_level()]
+        gluSphere(Sphere.quadric, self.radius, slices, stacks)
+
+    @classmethod
+    def geometry(cls):
+        '''
+        Unit sphere geometry shared by every Sphere, tessellated like the
+        quadric path with 32 slices and 32 stacks
+
+        Parameters: None
+
+        Returns:
+            - a tuple of (vertices, indices) arrays
+        '''
+        return sphere_geometry(*cls.tessellations[0])
+
+    @classmethod
+    def lod_geometry(cls, level: int):
+        '''
+        Coarser unit spheres for the levels of detail
+
+        Parameters:
+            - level: integer level, 1 or more
+
+        Returns:
+            - a tuple of (vertices, indices) arrays
+        '''
+        return sphere_geometry(*cls.tessellations[level])
+
+    def scale(self) -> float:
+        '''
+        Scale applied to the unit sphere geometry
+
+        Parameters: None
+
+        Returns:
+            - the radius
+        '''
+        return self.radius
+
+    def local_bounds(self):
+        '''
+        Bounding box relative to the sphere's position
+
+        Parameters: None
+
+        Returns:
+            - a tuple of the (min, max) corners
+        '''
+        r = self.radius
+        return (-r, -r, -r), (r, r, r)
+
+    @classmethod
+    def local_boxes(cls, dimensions: np.ndarray):
+        '''
+        Bounding boxes of many spheres from their radii
+
+        Parameters:
+            - dimensions: (n, 2) array of store dimensions
+
+        Returns:
+            - a tuple of (n, 3) min and max corner offsets
+        '''
+        high = np.repeat(dimensions[:, 0:1], 3, axis=1)
+        return -high, high
+
+    @classmethod
+    def local_spheres(cls, dimensions: np.ndarray):
+        '''
+        Bounding spheres of many spheres: the spheres themselves
+
+        Parameters:
+            - dimensions: (n, 2) array of store dimensions
+
+        Returns:
+            - a tuple of (n, 3) center offsets and (n,) radii
+        '''
+        return np.zeros((len(dimensions), 3)), dimensions[:, 0].copy()
+
+    def bounding_sphere(self):
+        '''
+        Overridden to return the sphere itself rather than the sphere around
+        its bounding box
+
+        Parameters: None
+
+        Returns:
+            - a tuple of (center, radius)
+        '''
+        return self.position, self.radius
 
 if __name__ == '__main__':
     assert False, 'This is a class file. Import its contents into another file.'
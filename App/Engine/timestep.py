@@ -0,0 +1,68 @@
+################################################################################
+# File: timestep.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the fixed timestep accumulator that decouples simulation
+# ticks from rendered frames
+#
+################################################################################
+
+class FixedTimestep():
+    def __init__(self, tick_rate: float=120.0,
+                 max_frame_time: float=0.25) -> None:
+        '''
+        Constructor for FixedTimestep class
+
+        Parameters:
+            - tick_rate: float, simulation ticks per second
+            - max_frame_time: float, longest frame in seconds that is fully
+                simulated. Longer frames (e.g. after a stall) are cut short
+                so the simulation can't fall further and further behind.
+
+        Returns: None
+        '''
+        self.dt = 1.0 / tick_rate
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+        self.ticks = 0
+
+    @property
+    def tick_rate(self) -> float:
+        return 1.0 / self.dt
+
+    @tick_rate.setter
+    def tick_rate(self, value: float) -> None:
+        self.dt = 1.0 / value
+
+    def advance(self, frame_time: float) -> int:
+        '''
+        Adds a frame's worth of time and works out how many ticks to run
+
+        Parameters:
+            - frame_time: float, seconds since the previous frame
+
+        Returns:
+            - the integer number of simulation ticks to run this frame
+        '''
+        self.accumulator += min(frame_time, self.max_frame_time)
+        ticks = int(self.accumulator / self.dt)
+        self.accumulator -= ticks * self.dt
+        self.ticks += ticks
+        return ticks
+
+    @property
+    def alpha(self) -> float:
+        '''
+        How far the current frame is between the last two ticks, for
+        interpolating rendered positions
+
+        Parameters: None
+
+        Returns:
+            - a float from 0 (previous tick) to 1 (latest tick)
+        '''
+        return self.accumulator / self.dt
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
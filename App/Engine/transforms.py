@@ -0,0 +1,132 @@
+################################################################################
+# File: transforms.py
+# Date: 18 October 2026
+# Description:
+#
+# Helper functions for building 4x4 transformation matrices. Matrices are
+# row-major NumPy arrays that act on column vectors (M @ v), so they need to be
+# transposed before being handed to OpenGL.
+#
+################################################################################
+
+# imports
+import math
+import numpy as np
+from typing import Sequence
+
+def perspective(fovy: float, aspect: float, near: float,
+                far: float) -> np.ndarray:
+    '''
+    Builds the same matrix as gluPerspective
+
+    Parameters:
+        - fovy: float, vertical field of view in degrees
+        - aspect: float, width / height of the viewport
+        - near: float, distance to the near clipping plane
+        - far: float, distance to the far clipping plane
+
+    Returns:
+        - a 4x4 float32 matrix
+    '''
+    f = 1.0 / math.tan(math.radians(fovy) / 2)
+    matrix = np.zeros((4, 4), dtype=np.float32)
+    matrix[0, 0] = f / aspect
+    matrix[1, 1] = f
+    matrix[2, 2] = (far + near) / (near - far)
+    matrix[2, 3] = 2 * far * near / (near - far)
+    matrix[3, 2] = -1.0
+    return matrix
+
+def look_at(eye: Sequence[float], target: Sequence[float],
+            up: Sequence[float]) -> np.ndarray:
+    '''
+    Builds the same matrix as gluLookAt
+
+    Parameters:
+        - eye: the camera position
+        - target: the point the camera looks at
+        - up: the camera's up direction
+
+    Returns:
+        - a 4x4 float32 matrix
+    '''
+    eye = np.asarray(eye, dtype=np.float32)
+    forward = np.asarray(target, dtype=np.float32) - eye
+    forward /= np.linalg.norm(forward)
+    side = np.cross(forward, np.asarray(up, dtype=np.float32))
+    side /= np.linalg.norm(side)
+    true_up = np.cross(side, forward)
+
+    matrix = np.identity(4, dtype=np.float32)
+    matrix[0, :3] = side
+    matrix[1, :3] = true_up
+    matrix[2, :3] = -forward
+    matrix[:3, 3] = -matrix[:3, :3] @ eye
+    return matrix
+
+def translation(x: float, y: float, z: float) -> np.ndarray:
+    '''
+    Builds the same matrix as glTranslatef
+
+    Parameters:
+        - x: float, translation along x
+        - y: float, translation along y
+        - z: float, translation along z
+
+    Returns:
+        - a 4x4 float32 matrix
+    '''
+    matrix = np.identity(4, dtype=np.float32)
+    matrix[:3, 3] = (x, y, z)
+    return matrix
+
+def quaternion(axis: Sequence[float], angle: float) -> np.ndarray:
+    '''
+    Builds the rotation quaternion of the same rotation as glRotatef
+
+    Parameters:
+        - axis: the axis to rotate about, any length
+        - angle: float, angle in degrees
+
+    Returns:
+        - a (4,) float64 unit quaternion (x, y, z, w)
+    '''
+    axis = np.asarray(axis, dtype=np.float64)
+    axis = axis / np.linalg.norm(axis)
+    half = math.radians(angle) / 2
+    return np.append(axis * math.sin(half), math.cos(half))
+
+def trs_matrices(translations: np.ndarray, rotations: np.ndarray,
+                 scales: np.ndarray) -> np.ndarray:
+    '''
+    Builds many translate * rotate * scale matrices at once
+
+    Parameters:
+        - translations: (n, 3) array of translations
+        - rotations: (n, 4) array of unit quaternions (x, y, z, w)
+        - scales: (n, 3) array of scale factors
+
+    Returns:
+        - an (n, 4, 4) float64 array of matrices
+    '''
+    x, y, z, w = np.asarray(rotations, dtype=np.float64).T
+    matrices = np.zeros((len(x), 4, 4))
+    rotation = matrices[:, :3, :3]
+    rotation[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    rotation[:, 0, 1] = 2 * (x * y - w * z)
+    rotation[:, 0, 2] = 2 * (x * z + w * y)
+    rotation[:, 1, 0] = 2 * (x * y + w * z)
+    rotation[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    rotation[:, 1, 2] = 2 * (y * z - w * x)
+    rotation[:, 2, 0] = 2 * (x * z - w * y)
+    rotation[:, 2, 1] = 2 * (y * z + w * x)
+    rotation[:, 2, 2] = 1 - 2 * (x * x + y * y)
+
+    # scaling first means scaling the rotation's columns
+    rotation *= np.asarray(scales, dtype=np.float64)[:, None, :]
+    matrices[:, :3, 3] = translations
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
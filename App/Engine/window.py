@@ -10,11 +10,19 @@
 # imports
 import pygame
 from OpenGL.GL import *
-from OpenGL.GLU import gluPerspective
+from OpenGL.GLU import gluPerspective, gluDeleteQuadric
+
+from .transforms import perspective, translation
+from .gl_state import state
+from .headless import OffscreenContext, Framebuffer
+from .buffers import release_shared, forget_shared
+from .instancing import InstancedRenderer
+from .sphere import Sphere
 
 class Window():
     def __init__(self, width: int=800, height: int=600,
-                 caption: str="New Pygame Application") -> None:
+                 caption: str="New Pygame Application",
+                 headless: bool=False, vsync: bool=False) -> None:
         '''
         Constructor for Window class
 
@@ -22,17 +30,98 @@ class Window():
             - width: integer defaulting to 800px
             - height: integer defaulting to 600px
             - caption: string defaulting to 'New Pygame Application'
+            - headless: boolean defaulting to False. When True no window is
+                opened; frames are rendered into an offscreen framebuffer
+                (see headless.py)
+            - vsync: boolean defaulting to False. When True the window asks
+                for buffer swaps synced to the display refresh. Drivers may
+                refuse; self.vsync says whether it was granted.
         '''
-        pygame.init()
-        pygame.display.set_mode((width, height),
-                                pygame.OPENGL | pygame.DOUBLEBUF)
-        pygame.display.set_caption(caption)
-
         self.width = width
         self.height = height
+        self.headless = headless
+        self.vsync = False
+
+        # Only the display is needed, for events, keys and the mouse; the
+        # rest of pygame (audio, joysticks) would just slow startup down.
+        # Headless runs get the dummy video driver.
+        pygame.display.init()
+
+        if headless:
+            self.context = OffscreenContext(width, height)
+            self.framebuffer = Framebuffer(width, height)
+        else:
+            flags = pygame.OPENGL | pygame.DOUBLEBUF
+            if vsync:
+                try:
+                    pygame.display.set_mode((width, height), flags, vsync=1)
+                    self.vsync = True
+                except pygame.error:
+                    pass
+            if not self.vsync:
+                pygame.display.set_mode((width, height), flags)
+            pygame.display.set_caption(caption)
 
         self.__setup()
 
+    def flip(self) -> None:
+        '''
+        Shows the finished frame. Headless windows just wait for rendering to
+        finish.
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.headless:
+            glFinish()
+        else:
+            pygame.display.flip()
+
+    def focused(self) -> bool:
+        '''
+        Whether the window is in the foreground. Headless windows always
+        are.
+
+        Parameters: None
+
+        Returns:
+            - True if the window has input focus and isn't minimized
+        '''
+        if self.headless:
+            return True
+        return pygame.key.get_focused() and pygame.display.get_active()
+
+    def read_pixels(self):
+        '''
+        Copies the last rendered frame into memory (headless windows only)
+
+        Parameters: None
+
+        Returns:
+            - a (height, width, 3) uint8 NumPy array, top row first
+        '''
+        return self.framebuffer.read_pixels()
+
+    def close(self) -> None:
+        '''
+        Releases the offscreen context of a headless window, and the GL
+        objects cached across the engine for it
+
+        Parameters: None
+
+        Returns: None
+        '''
+        if self.headless:
+            release_shared()
+            if Sphere.quadric is not None:
+                gluDeleteQuadric(Sphere.quadric)
+            if InstancedRenderer.program is not None:
+                glDeleteProgram(InstancedRenderer.program)
+            Sphere.quadric = None
+            InstancedRenderer.program = None
+            self.context.destroy()
+
     def __setup(self) -> None:
         '''
         OpenGL setup function
@@ -41,8 +130,15 @@ class Window():
 
         Returns: None
         '''
+        # a new context starts from the default state, without the GL
+        # objects cached for an earlier one that was never closed
+        state.reset()
+        forget_shared()
+        Sphere.quadric = None
+        InstancedRenderer.program = None
+
         glClearColor(0.0, 0.0, 0.0, 1.0)
-        glEnable(GL_DEPTH_TEST)
+        state.enable(GL_DEPTH_TEST)
 
         glMatrixMode(GL_PROJECTION)
         
@@ -52,6 +148,10 @@ class Window():
         # Move back so we can see the prism
         glTranslatef(0.0, 0.0, -3.0)
 
+        # keep a copy of the projection matrix for culling
+        self.projection = (perspective(45, (self.width / self.height), 0.1, 10.0)
+                           @ translation(0.0, 0.0, -3.0))
+
         glMatrixMode(GL_MODELVIEW)
 
 if __name__ == '__main__':
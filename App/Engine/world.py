@@ -0,0 +1,469 @@
+################################################################################
+# File: world.py
+# Date: 18 October 2026
+# Description:
+#
+# Class file for the streamed world. The world is a grid of fixed-size
+# chunks on the x/z plane, each a room of its own with a set of static
+# shapes and its own physics region. Chunks near the camera are loaded on
+# background threads as plain arrays, turned into shapes on the main thread,
+# and dropped again least recently used first once they are out of range
+# and the world is over its memory budget.
+#
+################################################################################
+
+# imports
+import math
+import os
+import zlib
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .frustum import Frustum
+from .room import Room
+from .scene_io import SceneData
+
+ChunkCoord = Tuple[int, int]
+Vector = Tuple[float, float, float]
+
+# rough memory held per active shape: its row and view, instance data,
+# index entries and listeners
+SHAPE_BYTES = 512
+
+# without a set budget, active chunks are kept up to this many times the
+# number in range, at their average size
+BUDGET_CHUNKS = 2
+
+class ChunkData():
+    def __init__(self, coord: ChunkCoord, types: np.ndarray,
+                 sizes: np.ndarray, colors: np.ndarray,
+                 positions: np.ndarray) -> None:
+        '''
+        Constructor for ChunkData class. The contents of one chunk as
+        arrays, made by a loader on a background thread.
+
+        Parameters:
+            - coord: the chunk's (x, z) grid coordinate
+            - types: (n,) array of indices into SHAPE_TYPES
+            - sizes: (n,) array of side lengths, radii or bases
+            - colors: (n, 3) array of colors
+            - positions: (n, 3) array of world positions
+
+        Returns: None
+        '''
+        self.coord = coord
+        self.types = types
+        self.sizes = sizes
+        self.colors = colors
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+def generate_chunk(coord: ChunkCoord, size: Vector, origin: Vector,
+                   count: int=50, seed: int=0) -> ChunkData:
+    '''
+    Scatters random static shapes over a chunk. The same seed and
+    coordinate always give the same chunk.
+
+    Parameters:
+        - coord: the chunk's grid coordinate
+        - size: the chunk's width, height and length
+        - origin: the middle of the chunk
+        - count: integer number of shapes
+        - seed: integer seed of the whole world
+
+    Returns:
+        - the ChunkData
+    '''
+    rng = np.random.default_rng([seed, zlib.crc32(repr(coord).encode())])
+    sizes = rng.uniform(0.2, 1.0, count).astype(np.float32)
+
+    # keep every shape inside the chunk, just above the floor
+    half = np.array(size, dtype=np.float32) / 2 - 1.5
+    positions = rng.uniform(-half, half, (count, 3)).astype(np.float32)
+    positions[:, 1] = -size[1] / 2 + sizes
+    positions += np.asarray(origin, dtype=np.float32)
+
+    return ChunkData(coord, rng.integers(0, 3, count).astype(np.uint8),
+                     sizes, rng.random((count, 3)).astype(np.float32),
+                     positions)
+
+class SceneChunkLoader():
+    def __init__(self, directory: str) -> None:
+        '''
+        Constructor for SceneChunkLoader class. Loads chunks from scene
+        files (see scene_io.py) named chunk_<x>_<z>.scene, with positions
+        relative to the middle of the chunk. Missing files are empty chunks.
+
+        Parameters:
+            - directory: string path of the folder holding the files
+
+        Returns: None
+        '''
+        self.directory = directory
+
+    def __call__(self, coord: ChunkCoord, size: Vector,
+                 origin: Vector) -> ChunkData:
+        path = os.path.join(self.directory,
+                            f'chunk_{coord[0]}_{coord[1]}.scene')
+        if not os.path.exists(path):
+            empty = np.zeros((0, 3), dtype=np.float32)
+            return ChunkData(coord, np.zeros(0, dtype=np.uint8),
+                             np.zeros(0, dtype=np.float32), empty, empty)
+
+        # copies, so the file isn't held open by the active chunk
+        scene = SceneData(path)
+        return ChunkData(coord, np.array(scene.types), np.array(scene.sizes),
+                         np.array(scene.colors),
+                         scene.positions + np.asarray(origin,
+                                                      dtype=np.float32))
+
+class Chunk():
+    def __init__(self, coord: ChunkCoord, origin: Vector, room: Room,
+                 shapes: List[Any], nbytes: int) -> None:
+        '''
+        Constructor for Chunk class. An active chunk: its room, shapes and
+        the estimated memory they hold.
+
+        Parameters:
+            - coord: the chunk's grid coordinate
+            - origin: the middle of the chunk
+            - room: the chunk's Room geometry
+            - shapes: the chunk's shapes, in the engine's scene
+            - nbytes: integer estimate of the memory held
+
+        Returns: None
+        '''
+        self.coord = coord
+        self.origin = origin
+        self.room = room
+        self.shapes = shapes
+        self.nbytes = nbytes
+
+class ChunkedWorld():
+    def __init__(self, chunk_size: Vector=(50, 10, 50), radius: int=1,
+                 extent: Optional[int]=None,
+                 loader: Optional[Callable[..., ChunkData]]=None,
+                 budget: Optional[int]=None, activations_per_frame: int=1,
+                 workers: int=2) -> None:
+        '''
+        Constructor for ChunkedWorld class
+
+        Parameters:
+            - chunk_size: the width, height and length of every chunk
+            - radius: integer, chunks up to this many steps from the
+                camera's chunk (in x and in z) are kept loaded
+            - extent: optional integer, the world only has chunks up to this
+                many steps from chunk (0, 0). None for no edge.
+            - loader: function taking (coord, size, origin) and returning
+                the ChunkData, run on a background thread. By default the
+                chunks are generated with generate_chunk.
+            - budget: integer bytes of active chunks to keep before chunks
+                out of range are evicted. None for about twice the memory
+                of the chunks in range, so a few rings of chunks behind the
+                camera stay loaded.
+            - activations_per_frame: integer number of loaded chunks turned
+                into shapes per frame, to spread the work out
+            - workers: integer number of loader threads
+
+        Returns: None
+        '''
+        self.chunk_size = tuple(chunk_size)
+        self.radius = radius
+        self.extent = extent
+        self.loader = loader if loader is not None else generate_chunk
+        self.budget = budget
+        self.activations_per_frame = activations_per_frame
+
+        self.pool = ThreadPoolExecutor(max_workers=workers,
+                                       thread_name_prefix='chunk')
+        self.pending: Dict[ChunkCoord, Future] = {}
+
+        # chunks whose load failed, not retried until they go out of range
+        self.failed: set = set()
+
+        # active chunks, least recently in range first
+        self.active: 'OrderedDict[ChunkCoord, Chunk]' = OrderedDict()
+        self.nbytes = 0
+
+        # counters
+        self.loaded = 0
+        self.evicted = 0
+
+    def origin(self, coord: ChunkCoord) -> Vector:
+        '''
+        The middle of a chunk
+
+        Parameters:
+            - coord: the chunk's grid coordinate
+
+        Returns:
+            - a tuple of three floats
+        '''
+        width, _, length = self.chunk_size
+        return (coord[0] * width, 0.0, coord[1] * length)
+
+    def chunk_of(self, position: Sequence[float]) -> ChunkCoord:
+        '''
+        The chunk a position is in
+
+        Parameters:
+            - position: a world position
+
+        Returns:
+            - the (x, z) grid coordinate
+        '''
+        width, _, length = self.chunk_size
+        return (math.floor(position[0] / width + 0.5),
+                math.floor(position[2] / length + 0.5))
+
+    def exists(self, coord: ChunkCoord) -> bool:
+        '''
+        Whether the world has a chunk at a coordinate
+
+        Parameters:
+            - coord: a grid coordinate
+
+        Returns:
+            - True if the coordinate is inside the world's extent
+        '''
+        extent = self.extent
+        return (extent is None
+                or (abs(coord[0]) <= extent and abs(coord[1]) <= extent))
+
+    def wanted(self, position: Sequence[float]) -> List[ChunkCoord]:
+        '''
+        The chunks that should be loaded around a position, nearest first
+
+        Parameters:
+            - position: the camera position
+
+        Returns:
+            - a list of grid coordinates
+        '''
+        cx, cz = self.chunk_of(position)
+        radius = self.radius
+        coords = [(cx + dx, cz + dz)
+                  for dx in range(-radius, radius + 1)
+                  for dz in range(-radius, radius + 1)]
+        coords = [coord for coord in coords if self.exists(coord)]
+        coords.sort(key=lambda c: (c[0] - cx) ** 2 + (c[1] - cz) ** 2)
+        return coords
+
+    def contains(self, position: Sequence[float]) -> bool:
+        '''
+        Whether a position is inside an active chunk, i.e. open space. Used
+        by Physics.check_walls in place of the single room.
+
+        Parameters:
+            - position: a world position
+
+        Returns:
+            - True if the position is inside the loaded world
+        '''
+        half_height = self.chunk_size[1] / 2
+        if not -half_height <= position[1] <= half_height:
+            return False
+        return self.chunk_of(position) in self.active
+
+    def update(self, engine: Any, position: Sequence[float]) -> None:
+        '''
+        Streams the world around a position. Call once per frame on the
+        main thread: starts loads for missing chunks in range, activates
+        finished loads, and evicts chunks out of range while over budget.
+        A chunk whose load raised is left empty until it goes out of range
+        and comes back.
+
+        Parameters:
+            - engine: the Engine the chunks' shapes are added to
+            - position: the camera position
+
+        Returns: None
+        '''
+        wanted = self.wanted(position)
+        in_range = set(wanted)
+        self.failed &= in_range
+
+        for coord in wanted:
+            if coord in self.active:
+                self.active.move_to_end(coord)
+            elif coord not in self.pending and coord not in self.failed:
+                self.pending[coord] = self.pool.submit(
+                    self.loader, coord, self.chunk_size, self.origin(coord))
+
+        # finished loads, nearest first. Loads that went out of range are
+        # dropped without being activated.
+        activated = 0
+        for coord in [c for c in wanted if c in self.pending] + [
+                c for c in self.pending if c not in in_range]:
+            future = self.pending[coord]
+            if not future.done():
+                continue
+            if coord not in in_range:
+                del self.pending[coord]
+                continue
+            if activated == self.activations_per_frame:
+                continue
+            del self.pending[coord]
+            try:
+                data = future.result()
+            except Exception as error:
+                # a missing or corrupt chunk leaves a hole rather than
+                # stopping the game
+                self.failed.add(coord)
+                print(f"Could not load chunk {coord}: {error}")
+                continue
+            self.activate(engine, data)
+            activated += 1
+
+        self.evict(engine, in_range)
+
+    def prime(self, engine: Any, position: Sequence[float]) -> None:
+        '''
+        Loads and activates the chunk a position is in right away, on the
+        calling thread, so there is ground under the camera before the
+        first frame. The rest stream in through update.
+
+        Parameters:
+            - engine: the Engine the chunk's shapes are added to
+            - position: the camera position
+
+        Returns: None
+        '''
+        coord = self.chunk_of(position)
+        if coord in self.active or not self.exists(coord):
+            return
+        future = self.pending.pop(coord, None)
+        if future is not None:
+            future.cancel()
+        try:
+            data = self.loader(coord, self.chunk_size, self.origin(coord))
+        except Exception as error:
+            self.failed.add(coord)
+            print(f"Could not load chunk {coord}: {error}")
+            return
+        self.activate(engine, data)
+
+    def walls(self, coord: ChunkCoord) -> Tuple[bool, bool, bool, bool]:
+        '''
+        Which walls a chunk's room needs: only those at the world's edge
+
+        Parameters:
+            - coord: the chunk's grid coordinate
+
+        Returns:
+            - four booleans for the -x, +x, -z and +z walls
+        '''
+        x, z = coord
+        return tuple(not self.exists(neighbor) for neighbor in
+                     ((x - 1, z), (x + 1, z), (x, z - 1), (x, z + 1)))
+
+    def activate(self, engine: Any, data: ChunkData) -> Chunk:
+        '''
+        Turns a loaded chunk into shapes and a room in the engine
+
+        Parameters:
+            - engine: the Engine to add the chunk to
+            - data: the loaded ChunkData
+
+        Returns:
+            - the active Chunk
+        '''
+        coord = data.coord
+        origin = self.origin(coord)
+        room = Room(self.chunk_size, origin, self.walls(coord))
+
+        width, height, length = self.chunk_size
+        low = (origin[0] - width / 2, -height / 2, origin[2] - length / 2)
+        high = (origin[0] + width / 2, height / 2, origin[2] + length / 2)
+        shapes = engine.add_chunk(coord, low, high, data.types, data.sizes,
+                                  data.colors, data.positions)
+
+        nbytes = len(shapes) * SHAPE_BYTES + room.vertices.nbytes
+        chunk = Chunk(coord, origin, room, shapes, nbytes)
+        self.active[coord] = chunk
+        self.nbytes += nbytes
+        self.loaded += 1
+        return chunk
+
+    def evict(self, engine: Any, keep: set) -> None:
+        '''
+        Drops the least recently used chunks out of range until the world is
+        within its budget. Chunks in range are never dropped, even over
+        budget.
+
+        Parameters:
+            - engine: the Engine the chunks' shapes are in
+            - keep: set of coordinates in range
+
+        Returns: None
+        '''
+        budget = self.budget
+        if budget is None:
+            budget = (BUDGET_CHUNKS * len(keep) * self.nbytes
+                      // max(1, len(self.active)))
+        for coord in list(self.active):
+            if self.nbytes <= budget:
+                break
+            if coord in keep:
+                continue
+            chunk = self.active.pop(coord)
+            engine.remove_chunk(coord, chunk.shapes)
+            chunk.room.release()
+            self.nbytes -= chunk.nbytes
+            self.evicted += 1
+
+    def rooms(self, frustum: Optional[Frustum]=None) -> List[Room]:
+        '''
+        The rooms of the active chunks, optionally only those whose
+        bounding sphere is in view
+
+        Parameters:
+            - frustum: optional Frustum to cull the rooms against, None to
+                return them all
+
+        Returns:
+            - a list of Rooms
+        '''
+        rooms = [chunk.room for chunk in self.active.values()]
+        if frustum is None or not rooms:
+            return rooms
+        radius = math.sqrt(sum(side * side for side in self.chunk_size)) / 2
+        centers = np.array([room.origin for room in rooms], dtype=np.float32)
+        visible = frustum.spheres_visible(centers, radius)
+        return [room for room, shown in zip(rooms, visible) if shown]
+
+    def clear(self, engine: Any) -> None:
+        '''
+        Drops every active chunk and forgets the pending loads
+
+        Parameters:
+            - engine: the Engine the chunks' shapes are in
+
+        Returns: None
+        '''
+        for future in self.pending.values():
+            future.cancel()
+        self.pending = {}
+        self.failed.clear()
+        for coord, chunk in self.active.items():
+            engine.remove_chunk(coord, chunk.shapes)
+            chunk.room.release()
+        self.active.clear()
+        self.nbytes = 0
+
+    def close(self) -> None:
+        '''
+        Stops the loader threads
+
+        Parameters: None
+
+        Returns: None
+        '''
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+if __name__ == '__main__':
+    assert False, 'This is a class file. Import its contents into another file.'
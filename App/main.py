@@ -8,7 +8,12 @@
 ################################################################################
 
 # imports
-from Engine.engine import Engine
+import time
+
+# everything after this line counts towards startup time
+STARTED = time.perf_counter()
+
+import argparse
 
 def main() -> None:
     '''
@@ -18,8 +23,77 @@ def main() -> None:
 
     Returns: None
     '''
+    parser = argparse.ArgumentParser(description='Almost Real Engine')
+    parser.add_argument('--headless', type=int, metavar='FRAMES',
+                        help='render FRAMES frames offscreen and exit')
+    parser.add_argument('--backend', choices=('egl', 'osmesa'), default='egl',
+                        help='offscreen GL backend for --headless')
+    parser.add_argument('--record', metavar='FILE',
+                        help='record the input stream to FILE')
+    parser.add_argument('--replay', metavar='FILE',
+                        help='play back the input stream in FILE')
+    parser.add_argument('--physics-process', action='store_true',
+                        help='simulate physics in a separate process')
+    parser.add_argument('--fps', type=float, default=60.0,
+                        help='target frame rate of the live window, 0 for '
+                             'no limit')
+    parser.add_argument('--vsync', action='store_true',
+                        help='ask for buffer swaps synced to the display')
+    parser.add_argument('--startup-time', action='store_true',
+                        help='render the first frame, print how long it took '
+                             'to get there and exit (run python with '
+                             '-X importtime for a per-module breakdown)')
+    args = parser.parse_args()
+
+    # Headless runs only read input from a replay, so without one there is
+    # nothing to record
+    if (args.record is not None and args.headless is not None
+            and args.replay is None):
+        parser.error('--record with --headless needs --replay: headless runs '
+                     'take no live input')
+
+    # The offscreen platform has to be chosen before OpenGL is imported
+    if args.headless is not None:
+        from Engine.headless import select_platform
+        select_platform(args.backend)
+
+    from Engine.engine import Engine
+    imported = time.perf_counter()
+
     # Create an instance of the Engine class
-    game = Engine()
-    game.run()
+    game = Engine(headless=args.headless is not None,
+                  physics_process=args.physics_process)
+    game.pacer.target_fps = args.fps
+    game.vsync = args.vsync
+    created = time.perf_counter()
+
+    if args.startup_time:
+        # Window, GL context and the first rendered frame
+        if args.headless is None:
+            game.run(frames=1)
+        else:
+            game.run_headless(1)
+        first_frame = time.perf_counter()
+
+        print(f"Startup: imports {imported - STARTED:.3f}s, "
+              f"engine {created - imported:.3f}s, "
+              f"first frame {first_frame - created:.3f}s, "
+              f"time to first frame {first_frame - STARTED:.3f}s")
+        game.close_game()
+
+    if args.record is not None:
+        game.start_recording(args.record)
+    if args.replay is not None:
+        game.load_replay(args.replay)
+
+    if args.headless is None:
+        game.run()
+        return
+
+    # a replay can run out before the requested number of frames
+    seconds, rendered = game.run_headless(args.headless)
+    game.stop_recording()
+    print(f"Rendered {rendered} frames in {seconds:.3f}s "
+          f"({rendered / seconds:.1f} fps)")
 
 if __name__ == "__main__": main()
@@ -0,0 +1,16 @@
+################################################################################
+# File: conftest.py
+# Date: 18 October 2026
+# Description:
+#
+# Test setup: puts the App directory on the import path so the tests can
+# import the Engine package the way main.py does, wherever pytest is run
+# from. The tests only cover array code and need no GL context.
+#
+################################################################################
+
+# imports
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
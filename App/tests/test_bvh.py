@@ -0,0 +1,172 @@
+################################################################################
+# File: test_bvh.py
+# Date: 18 October 2026
+# Description:
+#
+# Tests for the bounding volume hierarchy: raycasts must find the same
+# nearest box as testing every box, whether objects are in the tree or
+# waiting for the next build, and after moves refit the tree
+#
+################################################################################
+
+# imports
+import math
+import numpy as np
+
+from Engine.bvh import BVH, ray_boxes
+
+def random_boxes(rng, n: int):
+    '''
+    Makes random boxes
+
+    Parameters:
+        - rng: NumPy random generator
+        - n: integer number of boxes
+
+    Returns:
+        - a tuple of (n, 3) low and high corner arrays
+    '''
+    lows = rng.uniform(-30.0, 30.0, (n, 3))
+    return lows, lows + rng.uniform(0.2, 2.0, (n, 3))
+
+def brute_raycast(lows, highs, alive, origin, direction, max_distance):
+    '''
+    Brute force: the nearest box along a ray
+
+    Parameters:
+        - lows, highs: (n, 3) arrays of box corners
+        - alive: (n,) boolean array, False for removed boxes
+        - origin, direction: the ray
+        - max_distance: float, how far along the ray to look
+
+    Returns:
+        - a tuple of (index, distance), or None if nothing was hit
+    '''
+    direction = np.where(direction == 0.0, 1e-30, direction)
+    near = ray_boxes(lows, highs, origin, 1.0 / direction, max_distance)
+    near[~alive] = np.inf
+    best = int(np.argmin(near))
+    return None if near[best] == np.inf else (best, near[best])
+
+def check_rays(bvh, objects, lows, highs, alive, rng, rays: int=200):
+    '''
+    Casts random rays at the BVH and compares with brute force
+
+    Parameters:
+        - bvh: the BVH
+        - objects: the objects added to it, in the order of lows and highs
+        - lows, highs: their current boxes
+        - alive: boolean array, False for removed objects
+        - rng: NumPy random generator
+        - rays: integer number of rays
+
+    Returns: None
+    '''
+    for _ in range(rays):
+        origin = rng.uniform(-40.0, 40.0, 3)
+        direction = rng.normal(size=3)
+        max_distance = math.inf if rng.random() < 0.5 else 30.0
+        expected = brute_raycast(lows, highs, alive, origin, direction,
+                                 max_distance)
+        hit = bvh.raycast(origin, direction, max_distance)
+        if expected is None:
+            assert hit is None
+            continue
+        assert hit is not None
+        # boxes can tie, so compare distances rather than objects
+        assert math.isclose(hit[1], expected[1], rel_tol=1e-9, abs_tol=1e-9)
+        index = objects.index(hit[0])
+        assert alive[index]
+
+def test_raycast_matches_brute_force():
+    rng = np.random.default_rng(0)
+    n = 500
+    lows, highs = random_boxes(rng, n)
+    objects = [object() for _ in range(n)]
+    alive = np.ones(n, dtype=bool)
+
+    bvh = BVH()
+    bvh.insert_many(objects, lows, highs)
+    check_rays(bvh, objects, lows, highs, alive, rng)
+    assert bvh.built == n
+
+    # a few more objects wait outside the tree until the next build
+    extra = [object() for _ in range(5)]
+    extra_lows, extra_highs = random_boxes(rng, 5)
+    for obj, low, high in zip(extra, extra_lows, extra_highs):
+        bvh.insert(obj, low, high)
+    objects += extra
+    lows = np.concatenate((lows, extra_lows))
+    highs = np.concatenate((highs, extra_highs))
+    alive = np.concatenate((alive, np.ones(5, dtype=bool)))
+    check_rays(bvh, objects, lows, highs, alive, rng)
+    assert bvh.built == n
+
+def test_refit_after_moves():
+    rng = np.random.default_rng(1)
+    n = 400
+    lows, highs = random_boxes(rng, n)
+    objects = [object() for _ in range(n)]
+    alive = np.ones(n, dtype=bool)
+    bvh = BVH()
+    bvh.insert_many(objects, lows, highs)
+    bvh.build()
+
+    # small moves refit the existing tree instead of rebuilding it
+    moved = rng.choice(n, 100, replace=False)
+    offsets = rng.uniform(-0.5, 0.5, (100, 3))
+    lows[moved] += offsets
+    highs[moved] += offsets
+    bvh.move_many([objects[i] for i in moved], lows[moved], highs[moved])
+    assert bvh.dirty
+    order = bvh.order.copy()
+    check_rays(bvh, objects, lows, highs, alive, rng)
+    assert not bvh.dirty
+    np.testing.assert_array_equal(bvh.order, order)
+
+    # every node's box holds its objects' boxes
+    for node in range(len(bvh.node_left)):
+        slots = bvh.order[bvh.node_start[node]:bvh.node_end[node]]
+        assert np.all(bvh.node_low[node] <= bvh.lows[slots])
+        assert np.all(bvh.node_high[node] >= bvh.highs[slots])
+
+    # one object moving far away, on its own
+    lows[0] += 100.0
+    highs[0] += 100.0
+    bvh.move(objects[0], lows[0], highs[0])
+    check_rays(bvh, objects, lows, highs, alive, rng)
+    hit = bvh.raycast(lows[0] - (1.0, 0.0, 0.0), (1.0, 0.0, 0.0))
+    assert hit is not None and hit[0] is objects[0]
+
+def test_removed_objects_are_never_hit():
+    rng = np.random.default_rng(2)
+    n = 300
+    lows, highs = random_boxes(rng, n)
+    objects = [object() for _ in range(n)]
+    alive = np.ones(n, dtype=bool)
+    bvh = BVH()
+    bvh.insert_many(objects, lows, highs)
+    bvh.build()
+
+    for i in range(0, n, 3):
+        bvh.remove(objects[i])
+        alive[i] = False
+    check_rays(bvh, objects, lows, highs, alive, rng)
+    assert len(bvh) == alive.sum()
+
+def test_exact_test_decides_the_hit():
+    bvh = BVH()
+    near, far = object(), object()
+    bvh.insert_many([near, far], np.array([[1.0, -1.0, -1.0],
+                                           [5.0, -1.0, -1.0]]),
+                    np.array([[2.0, 1.0, 1.0], [6.0, 1.0, 1.0]]))
+
+    # the exact test says the nearer object's surface isn't on the ray
+    def test(obj, origin, direction, max_distance):
+        return None if obj is near else 5.5
+
+    assert bvh.raycast((0.0, 0.0, 0.0), (1.0, 0.0, 0.0)) == (near, 1.0)
+    assert bvh.raycast((0.0, 0.0, 0.0), (1.0, 0.0, 0.0),
+                       test=test) == (far, 5.5)
+    assert bvh.raycast((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), 3.0,
+                       test=test) is None
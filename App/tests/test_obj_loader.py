@@ -0,0 +1,102 @@
+################################################################################
+# File: test_obj_loader.py
+# Date: 18 October 2026
+# Description:
+#
+# Tests for the OBJ loader: face index forms, generated normals and the
+# binary cache stamped with the model's hash
+#
+################################################################################
+
+# imports
+import os
+import numpy as np
+import pytest
+
+from Engine.obj_loader import (CACHE_SUFFIX, NORMAL, POSITION, TEXCOORD,
+                               load_obj, parse_obj, read_cache)
+
+SQUARE = b'''
+v 0 0 0
+v 1 0 0
+v 1 1 0
+v 0 1 0
+vt 0 0
+vt 1 0
+vt 1 1
+vt 0 1
+vn 0 0 1
+'''
+
+def parse(text: bytes):
+    return parse_obj(text.splitlines(), 'test.obj')
+
+def test_quad_is_split_into_a_fan():
+    vertices, indices = parse(SQUARE + b'f 1/1/1 2/2/1 3/3/1 4/4/1\n')
+    assert vertices.shape == (4, 8)
+    np.testing.assert_array_equal(indices, [0, 1, 2, 0, 2, 3])
+    np.testing.assert_allclose(vertices[:, TEXCOORD],
+                               [(0, 0), (1, 0), (1, 1), (0, 1)])
+    np.testing.assert_allclose(vertices[:, NORMAL], [(0, 0, 1)] * 4)
+
+def test_negative_indices_match_positive():
+    positive = parse(SQUARE + b'f 1/1/1 2/2/1 3/3/1 4/4/1\n')
+    negative = parse(SQUARE + b'f -4/-4/-1 -3/-3/-1 -2/-2/-1 -1/-1/-1\n')
+    for a, b in zip(positive, negative):
+        np.testing.assert_array_equal(a, b)
+
+def test_shared_corners_are_reused():
+    vertices, indices = parse(SQUARE + b'f 1//1 2//1 3//1\nf 1//1 3//1 4//1\n')
+    assert len(vertices) == 4
+    np.testing.assert_array_equal(indices, [0, 1, 2, 0, 2, 3])
+
+def test_missing_normals_are_generated():
+    # a flat square facing +z and a triangle standing up facing -y
+    text = SQUARE + b'v 0 0 1\nf 1 2 3 4\nf 1 2 5\n'
+    vertices, indices = parse(text)
+    normals = vertices[:, NORMAL]
+    np.testing.assert_allclose(np.linalg.norm(normals, axis=1), 1.0,
+                               rtol=1e-6)
+    np.testing.assert_allclose(normals[2], (0, 0, 1), atol=1e-6)
+    np.testing.assert_allclose(normals[4], (0, -1, 0), atol=1e-6)
+
+    # a corner shared by both faces leans between them
+    assert normals[0][2] > 0 and normals[0][1] < 0
+
+def test_bad_faces_are_reported():
+    with pytest.raises(ValueError):
+        parse(SQUARE + b'f 1 2 9\n')
+    with pytest.raises(ValueError):
+        parse(SQUARE + b'f 1 2 -9\n')
+    with pytest.raises(ValueError):
+        parse(SQUARE + b'f 1 2 x\n')
+
+def test_cache_is_used_until_the_model_changes(tmp_path):
+    path = tmp_path / 'square.obj'
+    path.write_bytes(SQUARE + b'f 1 2 3 4\n')
+
+    first = load_obj(str(path))
+    cache_path = str(path) + CACHE_SUFFIX
+    assert os.path.exists(cache_path)
+    assert read_cache(cache_path, first.digest) is not None
+
+    # an unchanged model comes back from the cache with the same data
+    second = load_obj(str(path))
+    assert isinstance(second.vertices.base, np.memmap)
+    np.testing.assert_array_equal(second.vertices, first.vertices)
+    np.testing.assert_array_equal(second.indices, first.indices)
+
+    # changing the model changes its hash, so the old cache is ignored
+    path.write_bytes(SQUARE + b'v 5 5 5\nf 1 2 5\n')
+    third = load_obj(str(path))
+    assert third.digest != first.digest
+    assert read_cache(cache_path, first.digest) is None
+    np.testing.assert_array_equal(third.indices, [0, 1, 2])
+    np.testing.assert_allclose(third.vertices[2, POSITION], (5, 5, 5))
+    assert third.high == (5.0, 5.0, 5.0)
+
+def test_no_cache(tmp_path):
+    path = tmp_path / 'square.obj'
+    path.write_bytes(SQUARE + b'f 1 2 3\n')
+    load_obj(str(path), cache=False)
+    assert not os.path.exists(str(path) + CACHE_SUFFIX)
@@ -0,0 +1,115 @@
+################################################################################
+# File: test_scene_io.py
+# Date: 18 October 2026
+# Description:
+#
+# Tests for the binary scene format: packing a scene store into columns,
+# writing them and memory-mapping them back
+#
+################################################################################
+
+# imports
+import numpy as np
+import pytest
+
+from Engine.cube import Cube
+from Engine.scene_io import (FLAG_DYNAMIC, SHAPE_CLASSES, SceneData,
+                             save_scene, shape_columns)
+from Engine.scene_store import SceneStore
+
+def make_store(n: int=30, seed: int=0):
+    '''
+    Builds a store of random cubes, spheres and pyramids
+
+    Parameters:
+        - n: integer number of shapes
+        - seed: integer random seed
+
+    Returns:
+        - a tuple of the store, its shapes and the arrays they came from
+    '''
+    rng = np.random.default_rng(seed)
+    types = rng.integers(0, len(SHAPE_CLASSES), n).astype(np.uint8)
+    sizes = rng.uniform(0.2, 2.0, n)
+    colors = rng.random((n, 3))
+    positions = rng.uniform(-20.0, 20.0, (n, 3))
+
+    dimensions = np.zeros((n, 2))
+    for code, cls in enumerate(SHAPE_CLASSES):
+        mask = types == code
+        dimensions[mask] = cls.size_dimensions(sizes[mask])
+
+    store = SceneStore()
+    shapes = store.create(SHAPE_CLASSES, types, dimensions, colors,
+                          positions)
+    return store, shapes, (types, sizes, colors, positions)
+
+def test_round_trip(tmp_path):
+    store, shapes, (types, sizes, colors, positions) = make_store()
+    dynamic = shapes[::4]
+    path = str(tmp_path / 'scene.ares')
+    save_scene(path, (50, 10, 60), ((1.0, 2.0, 3.0), -90.0, 10.0),
+               *shape_columns(store, dynamic))
+
+    scene = SceneData(path)
+    assert len(scene) == len(shapes)
+    assert scene.room_size == (50, 10, 60)
+    assert scene.camera_position == (1.0, 2.0, 3.0)
+    assert (scene.yaw, scene.pitch) == (-90.0, 10.0)
+
+    np.testing.assert_array_equal(scene.types, types)
+    np.testing.assert_allclose(scene.sizes, sizes, rtol=1e-6)
+    np.testing.assert_allclose(scene.colors, colors, rtol=1e-6)
+    np.testing.assert_allclose(scene.positions, positions, rtol=1e-6)
+
+    expected = np.zeros(len(shapes), dtype=np.uint8)
+    expected[::4] = FLAG_DYNAMIC
+    np.testing.assert_array_equal(scene.flags, expected)
+
+    for original, loaded in zip(shapes, scene.shapes()):
+        assert type(loaded) is type(original)
+        assert loaded.scale() == pytest.approx(original.scale(), rel=1e-6)
+        np.testing.assert_allclose(loaded.position, original.position,
+                                   rtol=1e-6)
+
+def test_columns_follow_moved_shapes():
+    store, shapes, _ = make_store(5)
+    shapes[2].position = (7.0, 8.0, 9.0)
+    shapes[3].color = (0.25, 0.5, 0.75)
+    positions, colors, *_ = shape_columns(store)
+    np.testing.assert_allclose(positions[2], (7.0, 8.0, 9.0))
+    np.testing.assert_allclose(colors[3], (0.25, 0.5, 0.75))
+
+def test_empty_scene(tmp_path):
+    path = str(tmp_path / 'empty.ares')
+    save_scene(path, (50, 10, 50), ((0.0, 0.0, 0.0), 0.0, 0.0),
+               *shape_columns(SceneStore()))
+    scene = SceneData(path)
+    assert len(scene) == 0
+    assert list(scene.shapes()) == []
+
+def test_unsupported_class():
+    class Crate(Cube):
+        __slots__ = ()
+
+    store = SceneStore()
+    store.create((Crate,), np.zeros(1, dtype=np.uint8), np.ones((1, 2)),
+                 np.ones((1, 3)), np.zeros((1, 3)))
+    with pytest.raises(ValueError):
+        shape_columns(store)
+
+def test_truncated_and_foreign_files(tmp_path):
+    store, _, _ = make_store(10)
+    path = tmp_path / 'scene.ares'
+    save_scene(str(path), (50, 10, 50), ((0.0, 0.0, 0.0), 0.0, 0.0),
+               *shape_columns(store))
+
+    truncated = tmp_path / 'truncated.ares'
+    truncated.write_bytes(path.read_bytes()[:-5])
+    with pytest.raises(ValueError):
+        SceneData(str(truncated))
+
+    foreign = tmp_path / 'foreign.ares'
+    foreign.write_bytes(b'x' * 256)
+    with pytest.raises(ValueError):
+        SceneData(str(foreign))
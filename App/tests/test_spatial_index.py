@@ -0,0 +1,219 @@
+################################################################################
+# File: test_spatial_index.py
+# Date: 18 October 2026
+# Description:
+#
+# Tests for the spatial hash and the sweep-and-prune broadphase: bulk
+# inserts must give the same answers as one-at-a-time inserts, and both
+# must agree with a brute force search as objects move and go away
+#
+################################################################################
+
+# imports
+import numpy as np
+
+from Engine.broadphase import SweepAndPrune
+from Engine.scene_store import SceneStore, shape_boxes
+from Engine.scene_io import SHAPE_CLASSES
+from Engine.spatial_hash import SpatialHash, as_set
+
+def random_boxes(rng, n: int, spread: float=20.0):
+    '''
+    Makes random boxes, some spanning several cells
+
+    Parameters:
+        - rng: NumPy random generator
+        - n: integer number of boxes
+        - spread: float, how far from the origin the boxes can start
+
+    Returns:
+        - a tuple of (n, 3) low and high corner arrays
+    '''
+    lows = rng.uniform(-spread, spread, (n, 3))
+    return lows, lows + rng.uniform(0.0, 3.0, (n, 3))
+
+def overlapping(lows, highs, low, high):
+    '''
+    Brute force: indices of the boxes overlapping a box
+
+    Parameters:
+        - lows, highs: (n, 3) arrays of box corners
+        - low, high: corners of the query box
+
+    Returns:
+        - a set of integer indices
+    '''
+    hit = np.all((lows <= high) & (highs >= low), axis=1)
+    return set(np.flatnonzero(hit).tolist())
+
+def cells_by_object(index: SpatialHash) -> dict:
+    '''
+    The hash's cells with objects in place of slots, which differ between
+    bulk and incremental inserts
+
+    Parameters:
+        - index: the SpatialHash
+
+    Returns:
+        - a dict of cell key -> set of object ids
+    '''
+    objects = index.objects
+    return {key: {id(objects[slot]) for slot in as_set(members)}
+            for key, members in index.cells.items()}
+
+def test_spatial_hash_bulk_matches_incremental():
+    rng = np.random.default_rng(0)
+    n = 2000
+    lows, highs = random_boxes(rng, n)
+    objects = [object() for _ in range(n)]
+
+    bulk, single = SpatialHash(2.0), SpatialHash(2.0)
+    bulk.insert_many(objects, lows, highs)
+    for obj, low, high in zip(objects, lows, highs):
+        single.insert(obj, low, high)
+    assert cells_by_object(bulk) == cells_by_object(single)
+
+    # remove some, move others, and add a second batch that lands in cells
+    # the first one filled
+    alive = np.ones(n, dtype=bool)
+    for i in range(0, n, 7):
+        bulk.remove(objects[i])
+        single.remove(objects[i])
+        alive[i] = False
+    for i in range(1, n, 5):
+        if alive[i]:
+            offset = rng.uniform(-2.0, 2.0, 3)
+            lows[i] += offset
+            highs[i] += offset
+            bulk.move(objects[i], lows[i], highs[i])
+            single.move(objects[i], lows[i], highs[i])
+
+    more = [object() for _ in range(300)]
+    more_lows, more_highs = random_boxes(rng, 300)
+    bulk.insert_many(more, more_lows, more_highs)
+    for obj, low, high in zip(more, more_lows, more_highs):
+        single.insert(obj, low, high)
+    assert cells_by_object(bulk) == cells_by_object(single)
+    assert len(bulk) == len(single) == alive.sum() + len(more)
+
+    all_objects = [obj for obj, keep in zip(objects, alive) if keep] + more
+    all_lows = np.concatenate((lows[alive], more_lows))
+    all_highs = np.concatenate((highs[alive], more_highs))
+    ids = [id(obj) for obj in all_objects]
+    for _ in range(200):
+        low, high = random_boxes(rng, 1)
+        expected = {ids[i] for i in overlapping(all_lows, all_highs,
+                                                low[0], high[0])}
+        assert set(map(id, bulk.query_box(low[0], high[0]))) == expected
+        assert set(map(id, single.query_box(low[0], high[0]))) == expected
+
+def test_spatial_hash_sphere_and_capsule():
+    index = SpatialHash(2.0)
+    near, far = object(), object()
+    index.insert_many([near, far], np.array([[0.0, 0.0, 0.0],
+                                             [10.0, 0.0, 0.0]]),
+                      np.array([[1.0, 1.0, 1.0], [11.0, 1.0, 1.0]]))
+    assert index.query_sphere((0.5, 0.5, 0.5)) == [near]
+    assert index.query_sphere((5.0, 0.5, 0.5), 1.0) == []
+    assert index.query_capsule((-5.0, 0.5, 0.5), (5.0, 0.5, 0.5),
+                               0.1) == [near]
+    hits = index.query_capsule((-5.0, 0.5, 0.5), (15.0, 0.5, 0.5), 0.1)
+    assert set(map(id, hits)) == {id(near), id(far)}
+
+def brute_pairs(lows, highs):
+    '''
+    Brute force: every pair of overlapping boxes
+
+    Parameters:
+        - lows, highs: (n, 3) arrays of box corners
+
+    Returns:
+        - a set of (i, j) index pairs with i < j
+    '''
+    pairs = set()
+    for i in range(len(lows)):
+        for j in overlapping(lows[i + 1:], highs[i + 1:], lows[i], highs[i]):
+            pairs.add((i, i + 1 + j))
+    return pairs
+
+def found_pairs(broadphase: SweepAndPrune, objects: list) -> set:
+    '''
+    The broadphase's pairs as index pairs into objects
+
+    Parameters:
+        - broadphase: the SweepAndPrune
+        - objects: the objects added to it
+
+    Returns:
+        - a set of (i, j) index pairs with i < j
+    '''
+    index = {id(obj): i for i, obj in enumerate(objects)}
+    return {tuple(sorted((index[id(a)], index[id(b)])))
+            for a, b in broadphase.overlapping_pairs()}
+
+def test_sweep_and_prune_bulk_matches_incremental():
+    rng = np.random.default_rng(1)
+    n = 300
+    lows, highs = random_boxes(rng, n, spread=15.0)
+    objects = [object() for _ in range(n)]
+
+    bulk, single = SweepAndPrune(), SweepAndPrune()
+    bulk.insert_many(objects, lows, highs)
+    for obj, low, high in zip(objects, lows, highs):
+        single.insert(obj, low, high)
+    assert len(bulk) == len(single) == n
+
+    expected = brute_pairs(lows, highs)
+    assert found_pairs(bulk, objects) == expected
+    assert found_pairs(single, objects) == expected
+
+    # move everything a little, as a physics step would, and re-sort
+    offsets = rng.uniform(-1.0, 1.0, (n, 3))
+    lows += offsets
+    highs += offsets
+    bulk.move_many(objects, lows, highs)
+    for obj, low, high in zip(objects, lows, highs):
+        single.move(obj, low, high)
+    bulk.update()
+    single.update()
+    expected = brute_pairs(lows, highs)
+    assert found_pairs(bulk, objects) == expected
+    assert found_pairs(single, objects) == expected
+
+def test_sweep_and_prune_pending_batch():
+    # a batch that hasn't been sorted yet can still be moved and removed
+    rng = np.random.default_rng(2)
+    lows, highs = random_boxes(rng, 50, spread=5.0)
+    objects = [object() for _ in range(50)]
+    broadphase = SweepAndPrune()
+    broadphase.insert_many(objects, lows, highs)
+
+    lows[0] += 100.0
+    highs[0] += 100.0
+    broadphase.move(objects[0], lows[0], highs[0])
+    broadphase.remove(objects[1])
+    broadphase.update()
+
+    expected = {(i, j) for i, j in brute_pairs(lows, highs)
+                if 1 not in (i, j)}
+    assert found_pairs(broadphase, objects) == expected
+    assert len(broadphase) == 49
+
+def test_store_boxes_match_shapes():
+    rng = np.random.default_rng(3)
+    n = 60
+    types = rng.integers(0, len(SHAPE_CLASSES), n).astype(np.uint8)
+    dimensions = np.zeros((n, 2))
+    for code, cls in enumerate(SHAPE_CLASSES):
+        mask = types == code
+        dimensions[mask] = cls.size_dimensions(rng.uniform(0.2, 2.0,
+                                                           mask.sum()))
+    store = SceneStore()
+    shapes = store.create(SHAPE_CLASSES, types, dimensions, rng.random((n, 3)),
+                          rng.uniform(-10.0, 10.0, (n, 3)))
+
+    lows, highs = shape_boxes(shapes)
+    for shape, low, high in zip(shapes, lows, highs):
+        expected_low, expected_high = shape.aabb()
+        np.testing.assert_allclose(low, expected_low)
+        np.testing.assert_allclose(high, expected_high)